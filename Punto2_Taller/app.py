@@ -11,8 +11,15 @@ import streamlit as st
 import plotly.express as px
 import pandas as pd
 import hvplot.pandas  # habilita .hvplot en DataFrames de pandas
+import os
 
-from etl_polars import run_etl_excel
+from decimation import decimate
+from etl_cache import ETLCache
+from features import feature_table, raw_long_from_excel, read_features, write_features
+from etl_polars import (ETLProfile, dataset_partitions, footprint, run_etl_cached, run_etl_excel,
+                        scan_dataset, with_time, write_dataset)
+
+DATASET_DIR = "data/etl_dataset"
 
 st.set_page_config(page_title="Dashboard Sensores (Excel)", layout="wide")
 st.title("Dashboard | BD_SENSORES.xlsx — ETL + Visualización")
@@ -26,43 +33,144 @@ z = st.sidebar.slider("Umbral z-score (outliers)", 1.0, 6.0, 3.0, 0.5)
 win = st.sidebar.slider("Ventana de suavizado (rolling)", 3, 101, 5, 2)
 fs = st.sidebar.number_input("Frecuencia de muestreo (Hz)", min_value=0.01, max_value=10000.0, value=1.0, step=0.01)
 lib = st.sidebar.selectbox("Biblioteca de gráficos", ["Plotly", "hvPlot"])
+decim = st.sidebar.selectbox("Decimación para graficar", ["LTTB", "min-max", "ninguna"])
+budget = st.sidebar.number_input("Puntos por canal (≈ ancho en píxeles)", min_value=100,
+                                 max_value=20000, value=2000, step=100)
+compact = st.sidebar.checkbox("Esquema compacto (Enum + Float32)", value=False,
+                              help="Menos memoria y Parquet más chico; t_s se calcula al leer.")
+profile_etl = st.sidebar.checkbox("Perfilar etapas del ETL", value=False,
+                                  help="Tiempo, filas y tamaño por etapa y descartes del filtro z (sin caché).")
+dataset_dir = st.sidebar.text_input(
+    "Dataset Parquet particionado (vacío = correr ETL del Excel)",
+    DATASET_DIR if os.path.isdir(DATASET_DIR) else "",
+)
+
+@st.cache_resource
+def etl_cache():
+    # Misma caché en disco que el CLI: sobrevive reinicios y se comparte entre workers
+    return ETLCache("data/.etl_cache")
 
 @st.cache_data(show_spinner=False)
-def load_df(path, sheet, z, win, fs):
+def load_df(path, sheet, z, win, fs, mtime, compact=False):
+    # mtime solo invalida la copia en memoria si el Excel cambia; la caché en disco usa su hash
     sh = sheet if sheet.strip() else None
-    df = run_etl_excel(path, sheet=sh, z_thresh=z, smooth_window=win, fs=fs)
+    df = run_etl_cached(path, sheet=sh, z_thresh=z, smooth_window=win, fs=fs,
+                        cache=etl_cache(), compact=compact)
     return df
 
+@st.cache_data(show_spinner=False)
+def load_profile(path, sheet, z, win, fs, mtime):
+    # Corre las etapas por separado (sin caché en disco) para medirlas
+    sh = sheet if sheet.strip() else None
+    profile = ETLProfile()
+    run_etl_excel(path, sheet=sh, z_thresh=z, smooth_window=win, fs=fs, profile=profile)
+    return profile.stages_frame(), profile.z_dropped
+
+@st.cache_data(show_spinner=False)
+def load_features(path, sheet, z, win, fs, mtime):
+    # Tabla por hoja/canal, guardada en la misma caché en disco que el ETL
+    sh = sheet if sheet.strip() else None
+    def compute():
+        long = run_etl_cached(path, sheet=sh, z_thresh=z, smooth_window=win, fs=fs, cache=etl_cache())
+        return feature_table(long, fs=fs, raw_long=raw_long_from_excel(path, sh))
+    return etl_cache().get_or_compute(path, compute, kind="features", sheet=sh, z=z, win=win, fs=fs)
+
 # --- Cargar y transformar ---
+# Con un dataset particionado se lee de forma perezosa: los filtros de hoja y
+# canal llegan al lector y solo se abren los archivos de esas particiones.
 try:
-    df_pl = load_df(data_path, sheet, z, win, fs)
+    if dataset_dir:
+        lf = scan_dataset(dataset_dir)
+        partitions = dataset_partitions(dataset_dir)
+        st.sidebar.caption("z, ventana y fs se aplicaron al generar el dataset.")
+    else:
+        df_pl = load_df(data_path, sheet, z, win, fs, os.stat(data_path).st_mtime_ns, compact)
+        lf = df_pl.lazy()
+        partitions = {sh: None for sh in df_pl["__sheet__"].unique().to_list()}
+        mem = footprint(df_pl)
+        st.sidebar.caption(f"En memoria: {mem['memoria_bytes'] / 2**20:.1f} MB · "
+                           f"Parquet: {mem['parquet_bytes'] / 2**20:.1f} MB")
+    if "t_s" not in lf.collect_schema().names():
+        lf = with_time(lf, fs)  # esquema compacto: t_s no se guarda
 except Exception as e:
     st.error(f"Error al cargar/transformar datos: {e}")
     st.stop()
 
+if profile_etl and not dataset_dir:
+    with st.expander("Perfil del ETL por etapa", expanded=True):
+        stages, drops = load_profile(data_path, sheet, z, win, fs, os.stat(data_path).st_mtime_ns)
+        st.caption(f"Total: {stages['segundos'].sum():.3f} s")
+        st.dataframe(stages.with_columns((pl.col("bytes_out") / 2**20).round(2).alias("MB"))
+                     .drop("bytes_out").to_pandas())
+        st.bar_chart(stages.to_pandas(), x="etapa", y="segundos")
+        st.markdown("**Filas descartadas por el filtro z (hoja, canal)**")
+        st.dataframe(drops.filter(pl.col("z_descartadas") > 0)
+                     .sort("z_descartadas", descending=True).to_pandas())
+
 st.subheader("Datos transformados (muestra)")
-st.dataframe(df_pl.head(200).to_pandas())
+st.dataframe(lf.head(200).collect().to_pandas())
+
+# --- Resumen por canal: sale de la tabla de features, sin recorrer las muestras ---
+st.subheader("Resumen por hoja y canal")
+if dataset_dir:
+    features = read_features(dataset_dir)
+else:
+    features = load_features(data_path, sheet, z, win, fs, os.stat(data_path).st_mtime_ns)
+if features is None:
+    st.info("El dataset no tiene tabla de features; genérala con `etl_polars.py --dataset ... --features`.")
+else:
+    numeric = [c for c, t in features.schema.items() if t.is_numeric()]
+    fc1, fc2 = st.columns([3, 1])
+    with fc2:
+        feat = st.selectbox("Feature", numeric, index=numeric.index("std") if "std" in numeric else 0)
+        top_n = st.slider("Top del ranking", 5, 50, 15)
+    with fc1:
+        heat = (features.pivot(on="__sheet__", index="canal", values=feat)
+                .sort(pl.col("canal").cast(pl.Int64, strict=False), "canal"))
+        fig = px.imshow(heat.to_pandas().set_index("canal").T, aspect="auto",
+                        labels=dict(x="canal", y="hoja", color=feat), title=f"{feat} por hoja y canal")
+        st.plotly_chart(fig, use_container_width=True)
+    ranked = (features.drop_nulls(feat).sort(feat, descending=True).head(top_n)
+              .with_columns((pl.col("__sheet__") + " / " + pl.col("canal")).alias("grupo")))
+    fig = px.bar(ranked.to_pandas(), x=feat, y="grupo", orientation="h", title=f"Top {top_n} por {feat}")
+    fig.update_yaxes(autorange="reversed")
+    st.plotly_chart(fig, use_container_width=True)
 
 # --- Selecciones para graficar ---
-sheets = sorted(df_pl["__sheet__"].unique().to_list())
+sheets = sorted(partitions)
 if not sheets:
     st.warning("No se encontraron hojas procesadas. Revisa ruta/hoja.")
     st.stop()
 
 sel_sheet = st.selectbox("Hoja", sheets, index=0)
-df_sh = df_pl.filter(pl.col("__sheet__") == sel_sheet)
+lf_sh = lf.filter(pl.col("__sheet__") == sel_sheet)
 
-canales = sorted(df_sh["canal"].unique().to_list())
+canales = partitions[sel_sheet] or sorted(
+    lf_sh.select(pl.col("canal").unique()).collect()["canal"].to_list()
+)
 sel_canales = st.multiselect("Canales", canales, default=canales[:3])
 metric = st.selectbox("Métrica (eje Y)", ["valor", "valor_sm", "valor_mm"])
 
+# Zoom: el rango de t_s se filtra en la consulta (estadísticas de row group), así
+# que al acercarse se vuelve a leer a resolución completa solo ese tramo.
+t_min, t_max = lf_sh.select(pl.col("t_s").min().alias("lo"), pl.col("t_s").max().alias("hi")).collect().row(0)
+t_range = (t_min, t_max)
+if t_min is not None and t_max > t_min:
+    t_range = st.slider("Rango de t_s (zoom)", float(t_min), float(t_max), (float(t_min), float(t_max)))
+
 st.markdown("---")
 
 # --- Gráficas ---
 if not sel_canales:
     st.info("Selecciona al menos un canal.")
 else:
-    df_plot = df_sh.filter(pl.col("canal").is_in(sel_canales))[["t_s", "canal", metric]].to_pandas()
+    df_full = (lf_sh.filter(pl.col("canal").is_in(sel_canales) & pl.col("t_s").is_between(*t_range))
+               .select("t_s", "canal", metric).collect())
+    method = {"LTTB": "lttb", "min-max": "minmax", "ninguna": "none"}[decim]
+    df_dec = decimate(df_full, x="t_s", y=metric, by="canal", n_out=int(budget), method=method)
+    st.caption(f"Graficando {df_dec.height:,} de {df_full.height:,} puntos "
+               f"({df_full.height - df_dec.height:,} descartados por decimación {decim}).")
+    df_plot = df_dec.to_pandas()
     if lib == "Plotly":
         fig = px.line(df_plot, x="t_s", y=metric, color="canal", title=f"{metric} vs t_s — Hoja {sel_sheet}")
         st.plotly_chart(fig, use_container_width=True)
@@ -72,14 +180,23 @@ else:
 
 st.markdown("---")
 st.subheader("Descargas")
-c1, c2 = st.columns(2)
-with c1:
-    if st.button("Exportar Parquet"):
-        out = "data/etl_output.parquet"
-        df_pl.write_parquet(out)
-        st.success(f"Guardado {out}")
-with c2:
-    if st.button("Exportar CSV"):
-        out = "data/etl_output.csv"
-        df_pl.write_csv(out)
-        st.success(f"Guardado {out}")
+if dataset_dir:
+    st.caption(f"Leyendo el dataset particionado {dataset_dir}; las exportaciones parten del Excel.")
+else:
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        if st.button("Exportar Parquet"):
+            out = "data/etl_output.parquet"
+            df_pl.write_parquet(out)
+            fpath = write_features(features, out)
+            st.success(f"Guardado {out} (features: {fpath})")
+    with c2:
+        if st.button("Exportar CSV"):
+            out = "data/etl_output.csv"
+            df_pl.write_csv(out)
+            st.success(f"Guardado {out}")
+    with c3:
+        if st.button("Exportar dataset particionado"):
+            write_dataset(df_pl, DATASET_DIR)
+            write_features(features, DATASET_DIR)
+            st.success(f"Guardado {DATASET_DIR} (particionado por hoja/canal, con tabla de features)")
@@ -0,0 +1,80 @@
+# decimation.py
+"""
+Submuestreo en el servidor antes de graficar, por canal y con un presupuesto
+de puntos (≈ ancho en píxeles del gráfico):
+- LTTB (Largest-Triangle-Three-Buckets): conserva la forma visual de la
+  serie eligiendo en cada cubeta el punto de mayor área de triángulo.
+- min–max: en cada cubeta de x se quedan el mínimo y el máximo de y, así los
+  picos nunca desaparecen.
+"""
+import numpy as np
+import polars as pl
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Índices (ordenados) de los n_out puntos que elige LTTB sobre (x, y) ordenado por x."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    every = (n - 2) / (n_out - 2)
+    edges = (np.arange(n_out - 1) * every).astype(np.int64) + 1  # cubetas [edges[i], edges[i+1])
+    edges[-1] = n - 1
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[hi:nxt_hi].mean()
+        avg_y = y[hi:nxt_hi].mean()
+        # Doble del área del triángulo (a, candidato, promedio de la cubeta siguiente)
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(area.argmax())
+        idx[i + 1] = a
+    return idx
+
+
+def _lttb_frame(df: pl.DataFrame, x: str, y: str, by: str, n_out: int) -> pl.DataFrame:
+    parts = []
+    for part in df.partition_by(by, maintain_order=True):
+        keep = lttb_indices(part[x].to_numpy(), part[y].to_numpy(), n_out)
+        parts.append(part[keep])
+    return pl.concat(parts) if parts else df
+
+
+def _minmax_frame(df: pl.DataFrame, x: str, y: str, by: str, n_out: int) -> pl.DataFrame:
+    n_bins = max(n_out // 2, 1)
+    xc = pl.col(x)
+    span = xc.max().over(by) - xc.min().over(by)
+    b = ((xc - xc.min().over(by)) / span * n_bins).floor().fill_nan(0).clip(0, n_bins - 1)
+    df_i = df.with_row_index("__i__")
+    small = df_i.filter(pl.len().over(by) <= n_out)["__i__"]  # canales cortos quedan completos
+    picks = (df_i.filter(pl.len().over(by) > n_out)
+             .with_columns(b.cast(pl.Int64).alias("__bin__"))
+             .group_by(by, "__bin__")
+             .agg(pl.col("__i__").get(pl.col(y).arg_min()).alias("lo"),
+                  pl.col("__i__").get(pl.col(y).arg_max()).alias("hi"),
+                  pl.col("__i__").first().alias("first"),
+                  pl.col("__i__").last().alias("last")))
+    # min y max de cada cubeta, más los extremos de cada canal para no recortar el eje x
+    ends = picks.group_by(by).agg(pl.col("first").min(), pl.col("last").max())
+    keep = pl.concat([small, picks["lo"], picks["hi"], ends["first"], ends["last"]]).unique()
+    return df[keep.sort().to_numpy()]
+
+
+def decimate(df: pl.DataFrame, x: str = "t_s", y: str = "valor", by: str = "canal",
+             n_out: int = 2000, method: str = "lttb") -> pl.DataFrame:
+    """
+    Reduce cada canal a ~n_out puntos (los canales con menos puntos quedan
+    igual). Ordena por (by, x) y descarta filas con y nula (salvo con
+    method='none'). method: 'lttb', 'minmax' o 'none'.
+    """
+    df = df.sort(by, x)
+    if method == "none":
+        return df
+    df = df.drop_nulls(subset=[y])
+    if method == "lttb":
+        return _lttb_frame(df, x, y, by, n_out)
+    if method == "minmax":
+        return _minmax_frame(df, x, y, by, n_out)
+    raise ValueError(f"método desconocido: {method!r} (use 'lttb', 'minmax' o 'none')")
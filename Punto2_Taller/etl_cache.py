@@ -0,0 +1,124 @@
+# etl_cache.py
+"""
+Caché en disco de resultados del ETL, direccionada por contenido.
+
+La clave es el hash (blake2b) del archivo de origen + los parámetros del ETL,
+así que el mismo Excel con los mismos parámetros nunca se recalcula, aunque se
+reinicie el proceso o lo pida otro worker. Cada resultado es un Parquet en el
+directorio de la caché; al superar `max_bytes` se borran los menos usados (LRU
+por fecha de modificación, que se actualiza en cada acierto). La comparten el
+CLI (etl_polars.py) y el dashboard (app.py).
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+import polars as pl
+
+CACHE_VERSION = 1  # subir si cambia la transformación: invalida todo lo guardado
+
+_DIGESTS = {}  # (ruta, tamaño, mtime) -> hash, para no re-leer el archivo en el mismo proceso
+
+
+def file_digest(path: str, chunk=1 << 20) -> str:
+    """Hash del contenido del archivo (se memoriza por ruta, tamaño y mtime)."""
+    st = os.stat(path)
+    stamp = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    digest = _DIGESTS.get(stamp)
+    if digest is None:
+        h = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as fh:
+            while block := fh.read(chunk):
+                h.update(block)
+        digest = _DIGESTS[stamp] = h.hexdigest()
+    return digest
+
+
+def cache_key(path: str, **params) -> str:
+    """Clave = hash del archivo + parámetros (en JSON con claves ordenadas)."""
+    payload = json.dumps({"v": CACHE_VERSION, "src": file_digest(path), **params},
+                         sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+class ETLCache:
+    """Resultados del ETL en Parquet con desalojo LRU por tamaño total."""
+
+    def __init__(self, root="data/.etl_cache", max_bytes=512 * 2**20):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(root, exist_ok=True)
+
+    def _file(self, key):
+        return os.path.join(self.root, f"{key}.parquet")
+
+    def get(self, key) -> pl.DataFrame | None:
+        fname = self._file(key)
+        try:
+            df = pl.read_parquet(fname)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        os.utime(fname)  # marcar como usado recientemente
+        self.hits += 1
+        return df
+
+    def put(self, key, df: pl.DataFrame):
+        # Escritura atómica: otro proceso nunca ve un Parquet a medio escribir
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        os.close(fd)
+        try:
+            df.write_parquet(tmp)
+            os.replace(tmp, self._file(key))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self._evict(keep=key)
+
+    def get_or_compute(self, path, compute, **params) -> pl.DataFrame:
+        """Devuelve el resultado guardado para (archivo, params) o lo calcula y guarda."""
+        key = cache_key(path, **params)
+        df = self.get(key)
+        if df is None:
+            df = compute()
+            self.put(key, df)
+        return df
+
+    def entries(self):
+        """(mtime, bytes, ruta) de cada resultado, del menos al más reciente."""
+        out = []
+        for name in os.listdir(self.root):
+            if name.endswith(".parquet"):
+                fname = os.path.join(self.root, name)
+                try:
+                    st = os.stat(fname)
+                except FileNotFoundError:  # lo borró otro proceso
+                    continue
+                out.append((st.st_mtime_ns, st.st_size, fname))
+        return sorted(out)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def _evict(self, keep=None):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, fname in entries:
+            if total <= self.max_bytes:
+                break
+            if keep is not None and fname == self._file(keep):
+                continue  # nunca desalojar el resultado recién guardado
+            try:
+                os.unlink(fname)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        for _, _, fname in self.entries():
+            os.unlink(fname)
+        self.hits = self.misses = 0
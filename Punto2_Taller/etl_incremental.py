@@ -0,0 +1,273 @@
+# etl_incremental.py
+"""
+ETL incremental sobre Parquet particionado por hoja (estilo hive):
+
+    data/etl_output/__sheet__=SENP1/part.parquet
+    data/etl_output/__sheet__=EMG/part.parquet
+    data/etl_output/_state/...          (huellas, agregados y outliers por hoja)
+
+En cada corrida solo se reprocesa lo que cambió:
+- Hoja sin cambios: se detecta por el CRC de su XML dentro del .xlsx (sin
+  parsearla) o por la huella de su contenido; no se toca.
+- Filas agregadas al final (el prefijo ya procesado no cambió): media y
+  varianza por canal se actualizan con los agregados guardados (Welford/Chan),
+  se vuelve a evaluar el filtro z con esas estadísticas, la media móvil solo
+  se recalcula en la cola (las últimas `win` filas viejas + las nuevas) y el
+  min–max se rehace como operación columnar sobre la partición. El resultado
+  coincide con reprocesar la hoja (salvo redondeo ~1e-15 relativo de la suma
+  deslizante en valor_sm). Si con las nuevas estadísticas cambia qué filas
+  viejas son outliers, la hoja se reprocesa desde lo guardado.
+- Hoja nueva o modificada: se procesa completa (mismo clean_long que el ETL).
+
+'muestra' es el índice de fila DENTRO de la hoja (si fuera global, crecer una
+hoja obligaría a reescribir todas las siguientes); t_s = muestra / fs.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from urllib.parse import quote
+from xml.etree import ElementTree
+
+import polars as pl
+
+from etl_polars import (
+    _coerce_numeric_columns, _excel_to_polars, _sheet_names, clean_long, melt_wide, scan_dataset,
+)
+from online_stats import group_stats, keep_mask, merge_stats
+
+STATE_DIR = "_state"
+_GRP = "canal"
+
+
+def _partition_dir(out_dir, sheet):
+    return os.path.join(out_dir, f"__sheet__={quote(sheet, safe='')}")
+
+
+def _state_path(out_dir, sheet, kind):
+    return os.path.join(out_dir, STATE_DIR, f"{quote(sheet, safe='')}.{kind}.parquet")
+
+
+def read_partitioned(out_dir="data/etl_output") -> pl.LazyFrame:
+    """Dataset completo (todas las hojas) como LazyFrame, con '__sheet__' desde la ruta."""
+    return scan_dataset(out_dir)
+
+
+# --- Huellas ---
+
+def _sheet_crcs(path) -> dict:
+    """
+    Huella barata por hoja sin parsear el libro: CRC y tamaño del XML de cada
+    hoja dentro del .xlsx (más sharedStrings, donde viven los textos). Si el
+    archivo no es un zip (p. ej. .xls) devuelve {} y se usa la huella de datos.
+    """
+    try:
+        zf = zipfile.ZipFile(path)
+    except zipfile.BadZipFile:
+        return {}
+    with zf:
+        ns = {"m": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
+              "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships"}
+        rels = ElementTree.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+        targets = {r.get("Id"): r.get("Target").lstrip("/") for r in rels}
+        book = ElementTree.fromstring(zf.read("xl/workbook.xml"))
+        infos = {i.filename: i for i in zf.infolist()}
+        shared = infos.get("xl/sharedStrings.xml")
+        shared_tag = f"{shared.CRC}:{shared.file_size}" if shared else "-"
+        out = {}
+        for sh in book.iterfind("m:sheets/m:sheet", ns):
+            target = targets[sh.get(f"{{{ns['r']}}}id")]
+            info = infos.get(target if target.startswith("xl/") else f"xl/{target}")
+            if info is not None:
+                out[sh.get("name")] = f"{info.CRC}:{info.file_size}:{shared_tag}"
+        return out
+
+
+def _rows_digest(df: pl.DataFrame) -> str:
+    """Huella del contenido crudo (antes de parsear unidades) de unas filas."""
+    return hashlib.blake2b(df.write_csv().encode(), digest_size=16).hexdigest()
+
+
+def _with_minmax(part: pl.DataFrame) -> pl.DataFrame:
+    v = pl.col("valor")
+    vmin, vmax = v.min().over(_GRP), v.max().over(_GRP)
+    return part.with_columns(((v - vmin) / (vmax - vmin)).alias("valor_mm"))
+
+
+# --- Procesamiento de una hoja ---
+
+def _sheet_long(raw: pl.DataFrame) -> pl.DataFrame:
+    """Hoja cruda -> largo sin nulos, con 'muestra' local y sin '__sheet__'."""
+    long = melt_wide(_coerce_numeric_columns(raw), id_cols=("__sheet__", "Usuario"))
+    return (long.drop("__sheet__").drop_nulls(subset=["valor"])
+            .with_columns(pl.col("valor").cast(pl.Float64)))
+
+
+def _full(long: pl.DataFrame, z: float, win: int):
+    """Proceso completo de una hoja: (partición limpia, agregados, outliers)."""
+    kept = clean_long(long.with_columns(pl.lit("").alias("__sheet__")), z=z, smooth=win)
+    kept = kept.drop("__sheet__")
+    outliers = long.join(kept.select(_GRP, "muestra"), on=[_GRP, "muestra"], how="anti")
+    return kept, group_stats(long), outliers
+
+
+def _append(part, stats, outliers, new_long, z, win):
+    """
+    Filas nuevas al final de una hoja ya procesada. Si el filtro z (con las
+    estadísticas actualizadas) conserva exactamente las mismas filas viejas,
+    solo se recalcula la cola; si no, se reprocesa la hoja desde los valores
+    guardados (partición + outliers), sin volver a leer el Excel.
+    """
+    stats = merge_stats(stats, group_stats(new_long))
+    cols = new_long.columns
+    old = pl.concat([part.select(cols), outliers.select(cols)], how="vertical_relaxed")
+    old = keep_mask(old, stats, z)
+    # Las filas viejas deben conservar su estado fila por fila: las de la
+    # partición siguen dentro y los outliers siguen fuera (comparar solo
+    # cuántas quedan no basta: un canal puede perder una y otro ganar otra).
+    keep = old["__keep__"]
+    if not keep.head(part.height).all() or keep.tail(outliers.height).any():
+        return _full(pl.concat([old.drop("__keep__"), new_long], how="vertical_relaxed"), z, win)
+
+    new = keep_mask(new_long, stats, z)
+    new_kept = new.filter("__keep__").drop("__keep__")
+    outliers = pl.concat([outliers, new.filter(~pl.col("__keep__")).drop("__keep__")],
+                         how="vertical_relaxed")
+
+    # Media móvil: basta recalcular las últimas `win` filas viejas de cada canal
+    # (su ventana centrada puede alcanzar filas nuevas) con `win` filas más de contexto.
+    context = (part.select(cols).group_by(_GRP, maintain_order=True).tail(2 * win).select(cols)
+               .with_columns(pl.int_range(pl.len()).reverse().over(_GRP).alias("__from_end__")))
+    tail = (pl.concat([context, new_kept.with_columns(pl.lit(-1).alias("__from_end__"))],
+                      how="vertical_relaxed")
+            .sort([_GRP, "muestra"])
+            .with_columns(pl.col("valor").rolling_mean(window_size=win, center=True)
+                          .over(_GRP).alias("valor_sm"))
+            .filter(pl.col("__from_end__") < win)
+            .drop("__from_end__"))
+    kept = pl.concat([
+        part.drop("valor_mm").join(tail.select(_GRP, "muestra"), on=[_GRP, "muestra"], how="anti"),
+        tail,
+    ], how="vertical_relaxed").sort([_GRP, "muestra"])
+    return _with_minmax(kept), stats, outliers
+
+
+def _replace_with(path, write):
+    """
+    write(tmp) escribe en un temporal del mismo directorio que luego reemplaza
+    a `path` con os.replace: un corte nunca deja un archivo a medio escribir.
+    """
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _save_state(state_file, state):
+    def write(tmp):
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(state, fh, indent=1)
+    _replace_with(state_file, write)
+
+
+def _drop_sheet(out_dir, sheet):
+    """Borra la partición y el estado guardado de una hoja."""
+    shutil.rmtree(_partition_dir(out_dir, sheet), ignore_errors=True)
+    for kind in ("stats", "outliers"):
+        if os.path.exists(_state_path(out_dir, sheet, kind)):
+            os.unlink(_state_path(out_dir, sheet, kind))
+
+
+def run_etl_incremental(
+    path: str,
+    out_dir: str = "data/etl_output",
+    z_thresh: float = 3.0,
+    smooth_window: int = 5,
+    fs: float = 1.0,
+    engine: str = "auto",
+) -> dict:
+    """
+    Actualiza el dataset particionado `out_dir` a partir del Excel y devuelve
+    qué se hizo con cada hoja: 'unchanged', 'append', 'full' o 'removed'.
+    Si cambian los parámetros (z, win, fs) se reconstruye todo. Un `out_dir`
+    que no está vacío y no tiene el estado de este módulo no se toca:
+    FileExistsError.
+    El estado se guarda después de cada hoja, y una hoja sale del estado
+    mientras se reescriben sus archivos: si la corrida se corta, la siguiente
+    reprocesa esa hoja completa en vez de volver a agregar las mismas filas.
+    """
+    state_file = os.path.join(out_dir, STATE_DIR, "state.json")
+    params = {"z": z_thresh, "win": smooth_window, "fs": fs}
+    try:
+        with open(state_file, encoding="utf-8") as fh:
+            state = json.load(fh)
+    except FileNotFoundError:
+        state = None
+    if state is None and os.path.isdir(out_dir) and os.listdir(out_dir):
+        raise FileExistsError(f"{out_dir} no está vacío y no es un dataset incremental (falta {state_file})")
+    if state is not None and state.get("params") != params:
+        for sheet in state["sheets"]:  # solo lo que escribió este módulo
+            _drop_sheet(out_dir, sheet)
+        state = None
+    os.makedirs(os.path.join(out_dir, STATE_DIR), exist_ok=True)
+    if state is None:
+        state = {"params": params, "sheets": {}}
+        _save_state(state_file, state)
+
+    crcs = _sheet_crcs(path)
+    names = _sheet_names(path, engine)
+    report = {}
+    for sheet in names:
+        prev = state["sheets"].get(sheet)
+        if prev is not None and crcs.get(sheet) is not None and crcs[sheet] == prev["crc"]:
+            report[sheet] = "unchanged"
+            continue
+
+        raw = _excel_to_polars(path, sheet=sheet, engine=engine)
+        digest = _rows_digest(raw)
+        if prev is not None and digest == prev["digest"]:
+            action = "unchanged"
+        elif (prev is not None and raw.height > prev["rows"] and raw.columns == prev["columns"]
+              and _rows_digest(raw.head(prev["rows"])) == prev["digest"]):
+            action = "append"
+        else:
+            action = "full"
+
+        if action == "append":
+            part = pl.read_parquet(os.path.join(_partition_dir(out_dir, sheet), "part.parquet"))
+            new_long = _sheet_long(raw).filter(pl.col("muestra") >= prev["rows"])
+            kept, stats, outliers = _append(
+                part.drop("t_s"),
+                pl.read_parquet(_state_path(out_dir, sheet, "stats")),
+                pl.read_parquet(_state_path(out_dir, sheet, "outliers")),
+                new_long, z_thresh, smooth_window,
+            )
+        elif action == "full":
+            kept, stats, outliers = _full(_sheet_long(raw), z_thresh, smooth_window)
+
+        if action != "unchanged":
+            if state["sheets"].pop(sheet, None) is not None:
+                _save_state(state_file, state)
+            kept = kept.with_columns((pl.col("muestra").cast(pl.Float64) / fs).alias("t_s"))
+            os.makedirs(_partition_dir(out_dir, sheet), exist_ok=True)
+            for df, target in ((kept, os.path.join(_partition_dir(out_dir, sheet), "part.parquet")),
+                               (stats, _state_path(out_dir, sheet, "stats")),
+                               (outliers, _state_path(out_dir, sheet, "outliers"))):
+                _replace_with(target, df.write_parquet)
+        state["sheets"][sheet] = {"crc": crcs.get(sheet), "digest": digest,
+                                  "rows": raw.height, "columns": raw.columns}
+        _save_state(state_file, state)
+        report[sheet] = action
+
+    for sheet in set(state["sheets"]) - set(names):
+        _drop_sheet(out_dir, sheet)
+        del state["sheets"][sheet]
+        _save_state(state_file, state)
+        report[sheet] = "removed"
+    return report
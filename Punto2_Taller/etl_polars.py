@@ -1,24 +1,95 @@
 # etl_polars.py
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import accumulate
+import io
+import logging
+import multiprocessing as mp
+import os
+import shutil
+import tempfile
+import time
+from urllib.parse import quote, unquote
+
 import polars as pl
 import pandas as pd
 
-def _excel_to_polars(path: str, sheet: str | None = None) -> pl.DataFrame:
+from etl_cache import ETLCache
+
+try:  # lector calamine (Rust): abre el libro una vez y entrega Arrow
+    import fastexcel
+    # Columnas vacías (p. ej. 'Usuario'): fastexcel avisa por logging (desde Rust, no
+    # con warnings) que las lee como texto; _read_sheets_calamine ya las pasa a Float64.
+    logging.getLogger("fastexcel.types.dtype").addFilter(
+        lambda record: not record.getMessage().startswith("Could not determine dtype"))
+except ImportError:  # pragma: no cover - se usa el respaldo con pandas
+    fastexcel = None
+
+def _read_sheets_calamine(path, sheets, columns, n_rows, skip_rows) -> list[pl.DataFrame]:
+    """
+    Abre el libro UNA vez con fastexcel (motor calamine, en Rust) y lee cada
+    hoja directo a Arrow -> Polars, sin pasar por pandas. Columnas y filas se
+    seleccionan en el lector, así no se materializa lo que no se usa.
+    """
+    reader = fastexcel.read_excel(path)
+    names = reader.sheet_names if sheets is None else sheets
+    frames = []
+    for sh in names:
+        table = reader.load_sheet_by_name(
+            sh, use_columns=columns, n_rows=n_rows, skip_rows=skip_rows
+        ).to_arrow()
+        df = pl.from_arrow(table)
+        # Columnas vacías: calamine las deja como texto, pandas como float (NaN)
+        empty = [c for c in df.columns if df[c].null_count() == df.height]
+        frames.append(df.with_columns(pl.col(empty).cast(pl.Float64), pl.lit(sh).alias("__sheet__")))
+    return frames
+
+def _read_sheets_pandas(path, sheets, columns, n_rows, skip_rows) -> list[pl.DataFrame]:
+    """Respaldo sin fastexcel: un solo pd.ExcelFile (el zip se abre una vez)."""
+    xls = pd.ExcelFile(path)
+    names = xls.sheet_names if sheets is None else sheets
+    if columns is not None and not all(isinstance(c, int) for c in columns):
+        wanted = {str(c) for c in columns}  # pandas deja encabezados numéricos como int
+        columns = lambda name: str(name) in wanted
+    frames = []
+    for sh in names:
+        df = xls.parse(sh, header=0, usecols=columns, nrows=n_rows,
+                       skiprows=range(1, skip_rows + 1) if skip_rows else None)
+        df["__sheet__"] = sh
+        frames.append(pl.from_pandas(df))
+    return frames
+
+def _resolve_engine(engine: str) -> str:
+    if engine == "auto":
+        return "calamine" if fastexcel is not None else "pandas"
+    if engine == "calamine" and fastexcel is None:
+        raise ImportError("engine='calamine' requiere el paquete fastexcel")
+    return engine
+
+def _sheet_names(path: str, engine: str = "auto") -> list[str]:
+    """Nombres de hoja en el orden del libro."""
+    if _resolve_engine(engine) == "calamine":
+        return fastexcel.read_excel(path).sheet_names
+    return pd.ExcelFile(path).sheet_names
+
+def _excel_to_polars(
+    path: str,
+    sheet: str | None = None,
+    columns: list | None = None,
+    n_rows: int | None = None,
+    skip_rows: int = 0,
+    engine: str = "auto",
+) -> pl.DataFrame:
     """
     Lee Excel a Polars. Si no se da 'sheet', concatena todas las hojas
     y añade '__sheet__' para saber de dónde viene cada fila.
+    - columns: nombres o índices de columnas a leer (None = todas).
+    - n_rows / skip_rows: filas de datos a leer / a saltar tras el encabezado.
+    - engine: 'calamine' (fastexcel), 'pandas' u 'auto' (calamine si está instalado).
     """
-    if sheet is None:
-        xls = pd.ExcelFile(path)
-        frames = []
-        for sh in xls.sheet_names:
-            df = pd.read_excel(path, sheet_name=sh, header=0)
-            df["__sheet__"] = sh
-            frames.append(pl.from_pandas(df))
-        return pl.concat(frames, how="vertical_relaxed")
-    else:
-        df = pd.read_excel(path, sheet_name=sheet, header=0)
-        df["__sheet__"] = sheet
-        return pl.from_pandas(df)
+    engine = _resolve_engine(engine)
+    read = _read_sheets_calamine if engine == "calamine" else _read_sheets_pandas
+    frames = read(path, None if sheet is None else [sheet], columns, n_rows, skip_rows)
+    return frames[0] if len(frames) == 1 else pl.concat(frames, how="vertical_relaxed")
 
 def _unit_str_to_float_expr(col: str) -> pl.Expr:
     """
@@ -34,94 +105,371 @@ def _unit_str_to_float_expr(col: str) -> pl.Expr:
         .cast(pl.Float64, strict=False)
     )
 
-def _coerce_numeric_columns(df: pl.DataFrame, skip_cols=("__sheet__", "Usuario")) -> pl.DataFrame:
+def _coerce_numeric_columns(df, skip_cols=("__sheet__", "Usuario")):
     """
     Polars 1.7.1: sin is_numeric. Convertimos SOLO columnas de tipo texto (Utf8)
     que típicamente traen valores con unidades ('0.55 V') a float.
+    Una sola proyección para todas las columnas; sirve con DataFrame o LazyFrame.
     """
-    out = df
-    for c, t in zip(out.columns, out.dtypes):
-        if c in skip_cols:
-            continue
-        if t == pl.Utf8:  # solo intentamos parsear texto
-            out = out.with_columns(_unit_str_to_float_expr(c).alias(c))
-    return out
+    schema = df.collect_schema()
+    exprs = [
+        _unit_str_to_float_expr(c).alias(c)
+        for c, t in schema.items()
+        if c not in skip_cols and t == pl.Utf8  # solo intentamos parsear texto
+    ]
+    return df.with_columns(exprs) if exprs else df
 
-def melt_wide(df: pl.DataFrame, id_cols=("__sheet__", "Usuario")) -> pl.DataFrame:
+def melt_wide(df, id_cols=("__sheet__", "Usuario")):
     """
     Pasa de ancho a largo:
       - 'muestra' = índice de fila (0,1,2,...)
       - 'canal'   = nombre de la columna (1..60)
       - 'valor'   = lectura numérica
-    Mantiene '__sheet__' (y 'Usuario' si existe).
-    """
-    ids = [c for c in id_cols if c in df.columns]
-    df = df.with_row_count("muestra")
-    value_cols = [c for c in df.columns if c not in ids + ["muestra"]]
-    long = df.melt(
-        id_vars=["muestra"] + ids,
-        value_vars=value_cols,
+    Mantiene '__sheet__' (y 'Usuario' si existe). Acepta DataFrame o LazyFrame.
+    """
+    names = df.collect_schema().names()
+    ids = [c for c in id_cols if c in names]
+    value_cols = [c for c in names if c not in ids]
+    long = df.with_row_index("muestra").unpivot(
+        index=["muestra"] + ids,
+        on=value_cols,
         variable_name="canal",
         value_name="valor",
     ).with_columns(pl.col("canal").cast(pl.Utf8))
     return long
 
-def clean_long(long: pl.DataFrame, z: float = 3.0, smooth: int = 5) -> pl.DataFrame:
+def clean_long(long, z: float = 3.0, smooth: int = 5):
     """
     Limpieza y features por grupo (__sheet__, canal):
     - Quita nulos.
     - Filtra outliers por |z| <= z (z-score por grupo).
     - Aplica suavizado rolling centrado (media móvil).
     - Normaliza min–max por grupo.
+    Sobre un LazyFrame todo queda en un solo plan; las ventanas con la misma
+    partición se calculan una vez (min/max se comparten entre expresiones).
     """
+    grp = ["__sheet__", "canal"]
+    valor = pl.col("valor")
     out = long.drop_nulls(subset=["valor"])
 
-    # z-score por grupo
-    out = out.with_columns(
-        (
-            (pl.col("valor") - pl.col("valor").mean().over(["__sheet__", "canal"])) /
-            pl.col("valor").std().over(["__sheet__", "canal"])
-        ).alias("z")
-    )
-    out = out.filter((pl.col("z").abs() <= z) | pl.col("z").is_null()).drop("z")
+    # z-score por grupo (antes de filtrar)
+    zscore = (valor - valor.mean().over(grp)) / valor.std().over(grp)
+    out = out.filter((zscore.abs() <= z) | zscore.is_null())
 
-    # suavizado rolling por grupo
+    # suavizado rolling y min–max por grupo, en una misma proyección
+    vmin, vmax = valor.min().over(grp), valor.max().over(grp)
     out = out.sort(["__sheet__", "canal", "muestra"]).with_columns(
-        pl.col("valor").rolling_mean(window_size=smooth, center=True)
-        .over(["__sheet__", "canal"])
-        .alias("valor_sm")
-    )
-
-    # min–max por grupo
-    out = out.with_columns(
-        (
-            (pl.col("valor") - pl.min("valor").over(["__sheet__", "canal"])) /
-            (pl.max("valor").over(["__sheet__", "canal"]) - pl.min("valor").over(["__sheet__", "canal"]))
-        ).alias("valor_mm")
+        valor.rolling_mean(window_size=smooth, center=True).over(grp).alias("valor_sm"),
+        ((valor - vmin) / (vmax - vmin)).alias("valor_mm"),
     )
     return out
 
+def with_time(df, fs: float = 1.0):
+    """Agrega t_s = muestra / fs (DataFrame o LazyFrame)."""
+    return df.with_columns((pl.col("muestra").cast(pl.Float64) / fs).alias("t_s"))
+
+def compact_long(long: pl.DataFrame) -> pl.DataFrame:
+    """
+    Esquema compacto opcional del formato largo:
+    - '__sheet__' y 'canal' como Enum (categorías en orden alfabético, así el
+      orden coincide con el de texto),
+    - valor, valor_sm y valor_mm en Float32,
+    - sin t_s: se deriva al leer con with_time(df, fs).
+    """
+    casts = [
+        pl.col(c).cast(pl.Enum(sorted(long[c].drop_nulls().unique().to_list())))
+        for c in ("__sheet__", "canal") if c in long.columns
+    ]
+    casts += [pl.col(c).cast(pl.Float32) for c in ("valor", "valor_sm", "valor_mm") if c in long.columns]
+    return long.drop("t_s", strict=False).with_columns(casts)
+
+def footprint(df: pl.DataFrame) -> dict:
+    """Tamaño en memoria (estimado por Polars) y en Parquet zstd de un DataFrame."""
+    buf = io.BytesIO()
+    df.write_parquet(buf)
+    return {"memoria_bytes": df.estimated_size(), "parquet_bytes": buf.getbuffer().nbytes}
+
+def etl_plan(df, z_thresh: float = 3.0, smooth_window: int = 5, fs: float = 1.0) -> pl.LazyFrame:
+    """
+    Plan perezoso de la transformación completa (pasos 2–5 de run_etl_excel)
+    sobre un DataFrame ya leído. `etl_plan(df).explain()` muestra el plan optimizado.
+    """
+    lf = _coerce_numeric_columns(df.lazy())
+    long = melt_wide(lf, id_cols=("__sheet__", "Usuario"))
+    long = clean_long(long, z=z_thresh, smooth=smooth_window)
+    return with_time(long, fs)
+
+def _etl_sheet(task) -> tuple[pl.DataFrame, int]:
+    """
+    Trabajo de una hoja en el pool: leer, parsear, ancho -> largo y limpiar.
+    Devuelve también el alto de la hoja para desplazar 'muestra' después.
+    """
+    path, sheet, columns, n_rows, engine, z_thresh, smooth_window, streaming = task
+    df = _excel_to_polars(path, sheet=sheet, columns=columns, n_rows=n_rows, engine=engine)
+    long = etl_plan(df, z_thresh, smooth_window).drop("t_s").collect(streaming=streaming)
+    return long, df.height
+
+def _run_sheets_parallel(path, columns, n_rows, engine, z_thresh, smooth_window,
+                         workers, pool, streaming=False) -> pl.DataFrame:
+    """
+    Procesa cada hoja en un pool y concatena. Las ventanas over(["__sheet__",
+    "canal"]) ya están acotadas por hoja, así que el resultado coincide con el
+    camino serial si se reproduce su índice global: 'muestra' se desplaza por
+    el alto acumulado de las hojas anteriores (orden del libro) y las partes
+    se concatenan en el orden de clean_long (por nombre de hoja).
+    """
+    names = _sheet_names(path, engine)
+    tasks = [(path, sh, columns, n_rows, engine, z_thresh, smooth_window, streaming)
+             for sh in names]
+    if pool == "thread":
+        executor = ThreadPoolExecutor(max_workers=workers)
+    elif pool == "process":
+        # spawn: Polars no es seguro tras fork() con su pool de hilos ya iniciado
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn"))
+    else:
+        raise ValueError(f"pool desconocido: {pool!r} (use 'process' o 'thread')")
+    with executor:
+        results = list(executor.map(_etl_sheet, tasks))
+
+    offsets = [0, *accumulate(height for _, height in results)]
+    parts = {
+        sh: long.with_columns(pl.col("muestra") + offset)
+        for sh, (long, _), offset in zip(names, results, offsets)
+    }
+    return pl.concat([parts[sh] for sh in sorted(parts)], how="vertical_relaxed")
+
+# --- Instrumentación por etapa ---
+
+class ETLProfile:
+    """
+    Reporte por etapa del ETL: tiempo de pared, filas de entrada/salida y tamaño
+    estimado del DataFrame resultante, más las filas que el filtro z descartó
+    por (__sheet__, canal). Se pasa a run_etl_excel(..., profile=ETLProfile()).
+    hook(etapa, fn) envuelve cada etapa (debe llamar fn() y devolver su
+    resultado), p. ej. cprofile_hook() o un tracer externo.
+    """
+
+    def __init__(self, hook=None):
+        self.hook = hook
+        self.stages = []
+        self.z_dropped = None
+
+    def run(self, name: str, fn, *args, **kwargs):
+        rows_in = args[0].height if args and isinstance(args[0], pl.DataFrame) else None
+        call = lambda: fn(*args, **kwargs)
+        t0 = time.perf_counter()
+        out = self.hook(name, call) if self.hook is not None else call()
+        seconds = time.perf_counter() - t0
+        self.stages.append({"etapa": name, "segundos": seconds, "filas_in": rows_in,
+                            "filas_out": out.height, "bytes_out": out.estimated_size()})
+        return out
+
+    def stages_frame(self) -> pl.DataFrame:
+        return pl.DataFrame(self.stages, schema={"etapa": pl.Utf8, "segundos": pl.Float64,
+                                                 "filas_in": pl.Int64, "filas_out": pl.Int64,
+                                                 "bytes_out": pl.Int64})
+
+    def to_dict(self) -> dict:
+        return {
+            "total_s": sum(st["segundos"] for st in self.stages),
+            "etapas": self.stages,
+            "z_descartadas": [] if self.z_dropped is None else self.z_dropped.to_dicts(),
+        }
+
+    def __str__(self) -> str:
+        lines = [f"{'etapa':<10} {'segundos':>9} {'filas_in':>10} {'filas_out':>10} {'MB':>8}"]
+        for st in self.stages:
+            rows_in = "" if st["filas_in"] is None else st["filas_in"]
+            lines.append(f"{st['etapa']:<10} {st['segundos']:>9.4f} {rows_in:>10} "
+                         f"{st['filas_out']:>10} {st['bytes_out'] / 2**20:>8.2f}")
+        if self.z_dropped is not None:
+            top = self.z_dropped.filter(pl.col("z_descartadas") > 0).sort("z_descartadas", descending=True)
+            lines.append(f"filtro z: {top['z_descartadas'].sum()} filas descartadas en {top.height} grupos")
+            lines += [f"  {r['__sheet__']:<12} canal {r['canal']:<4} {r['z_descartadas']}"
+                      for r in top.head(10).iter_rows(named=True)]
+        return "\n".join(lines)
+
+def cprofile_hook(sort: str = "cumulative", limit: int = 15, stream=None):
+    """Hook para ETLProfile que corre cada etapa bajo cProfile e imprime sus funciones más costosas."""
+    import cProfile
+    import pstats
+
+    def hook(name, fn):
+        prof = cProfile.Profile()
+        out = prof.runcall(fn)
+        print(f"--- cProfile: {name} ---", file=stream)
+        pstats.Stats(prof, stream=stream).sort_stats(sort).print_stats(limit)
+        return out
+    return hook
+
+def z_filter_drops(long: pl.DataFrame, cleaned: pl.DataFrame) -> pl.DataFrame:
+    """Filas, nulos y descartes del filtro z por (__sheet__, canal), entre melt_wide y clean_long."""
+    grp = ["__sheet__", "canal"]
+    before = long.group_by(grp).agg(pl.len().alias("filas"), pl.col("valor").null_count().alias("nulos"))
+    after = cleaned.group_by(grp).agg(pl.len().alias("conservadas"))
+    return (before.join(after, on=grp, how="left")
+            .with_columns(pl.col("conservadas").fill_null(0))
+            .with_columns((pl.col("filas") - pl.col("nulos") - pl.col("conservadas")).alias("z_descartadas"))
+            .sort(grp))
+
+def _run_profiled(path, sheet, z_thresh, smooth_window, fs, columns, n_rows, engine,
+                  profile: ETLProfile) -> pl.DataFrame:
+    # Etapas materializadas una por una (en el plan perezoso quedarían fusionadas)
+    df = profile.run("leer", _excel_to_polars, path, sheet=sheet, columns=columns, n_rows=n_rows, engine=engine)
+    df = profile.run("unidades", _coerce_numeric_columns, df)
+    long = profile.run("largo", melt_wide, df, id_cols=("__sheet__", "Usuario"))
+    cleaned = profile.run("limpiar", clean_long, long, z=z_thresh, smooth=smooth_window)
+    profile.z_dropped = z_filter_drops(long, cleaned)
+    return profile.run("tiempo", with_time, cleaned, fs)
+
 def run_etl_excel(
     path: str,
     sheet: str | None = None,
     z_thresh: float = 3.0,
     smooth_window: int = 5,
     fs: float = 1.0,
+    columns: list | None = None,
+    n_rows: int | None = None,
+    engine: str = "auto",
+    workers: int | None = None,
+    pool: str = "process",
+    streaming: bool = False,
+    explain: bool = False,
+    compact: bool = False,
+    profile: ETLProfile | None = None,
+    layout: str = "long",
 ) -> pl.DataFrame:
     """
     Pipeline completo:
-      1) Leer Excel (una hoja o todas)
+      1) Leer Excel (una hoja o todas; columnas/filas opcionales, ver _excel_to_polars)
       2) Parsear unidades -> float (para columnas de texto)
       3) Ancho -> largo
       4) Limpieza + outliers + suavizado + min–max
       5) t_s = muestra / fs
+    Con workers > 1 (y todas las hojas) los pasos 1–4 corren por hoja en un
+    pool de procesos o hilos ('pool'); el resultado es idéntico al serial.
+    Los pasos 2–5 son un único LazyFrame (ver etl_plan) que se materializa al
+    final; streaming=True lo ejecuta con el motor de streaming y explain=True
+    imprime el plan optimizado. compact=True devuelve el esquema compacto
+    (ver compact_long; t_s se deriva al leer con with_time). Con un
+    ETLProfile las etapas se ejecutan y miden por separado (serial, sin plan
+    perezoso); el resultado es el mismo. layout='wide' calcula las features
+    por columna en NumPy sin melt (ver etl_wide) y pasa a largo al final.
     """
-    df = _excel_to_polars(path, sheet=sheet)
-    df = _coerce_numeric_columns(df)
-    long = melt_wide(df, id_cols=("__sheet__", "Usuario"))
-    long = clean_long(long, z=z_thresh, smooth=smooth_window)
-    long = long.with_columns((pl.col("muestra").cast(pl.Float64) / fs).alias("t_s"))
-    return long
+    if profile is not None:
+        long = _run_profiled(path, sheet, z_thresh, smooth_window, fs, columns, n_rows, engine, profile)
+    elif layout == "wide":
+        from etl_wide import run_etl_wide, wide_to_long
+        blocks = run_etl_wide(path, sheet, z_thresh, smooth_window, columns, n_rows, engine)
+        long = wide_to_long(blocks, fs)
+    elif sheet is None and workers is not None and workers > 1:
+        long = _run_sheets_parallel(path, columns, n_rows, engine, z_thresh, smooth_window,
+                                    workers, pool, streaming)
+        long = with_time(long, fs)
+    else:
+        df = _excel_to_polars(path, sheet=sheet, columns=columns, n_rows=n_rows, engine=engine)
+        plan = etl_plan(df, z_thresh=z_thresh, smooth_window=smooth_window, fs=fs)
+        if explain:
+            print(plan.explain(streaming=streaming))
+        long = plan.collect(streaming=streaming)
+    return compact_long(long) if compact else long
+
+def run_etl_cached(
+    path: str,
+    sheet: str | None = None,
+    z_thresh: float = 3.0,
+    smooth_window: int = 5,
+    fs: float = 1.0,
+    columns: list | None = None,
+    n_rows: int | None = None,
+    cache: ETLCache | None = None,
+    compact: bool = False,
+    **options,
+) -> pl.DataFrame:
+    """
+    run_etl_excel con caché persistente en Parquet (ver etl_cache.ETLCache),
+    indexada por el hash del Excel y los parámetros que afectan el resultado.
+    El lector (engine, ya resuelto: 'auto' es calamine o pandas) y layout
+    también van en la clave: calamine y pandas pueden inferir tipos distintos
+    y la ruta ancha difiere de la larga en ~1e-12. workers, pool y streaming
+    no cambian la salida y no forman parte de la clave.
+    """
+    cache = cache if cache is not None else ETLCache()
+    engine = _resolve_engine(options.pop("engine", "auto"))
+    params = dict(sheet=sheet, z=z_thresh, win=smooth_window, fs=fs, columns=columns, n_rows=n_rows,
+                  engine=engine)
+    if compact:
+        params["compact"] = True  # solo cuando aplica: no invalida lo ya guardado
+    if options.get("layout", "long") != "long":
+        params["layout"] = options["layout"]
+    return cache.get_or_compute(
+        path,
+        lambda: run_etl_excel(path, sheet, z_thresh, smooth_window, fs, columns, n_rows,
+                              engine=engine, compact=compact, **options),
+        **params,
+    )
+
+# --- Dataset Parquet particionado (hive) ---
+
+HIVE_SCHEMA = {"__sheet__": pl.Utf8, "canal": pl.Utf8}
+
+def write_dataset(
+    df: pl.DataFrame,
+    out_dir: str = "data/etl_dataset",
+    partition_by=("__sheet__", "canal"),
+    compression: str = "zstd",
+    row_group_size: int | None = None,
+):
+    """
+    Escribe el resultado como Parquet particionado estilo hive
+    (out_dir/__sheet__=X/canal=Y/*.parquet), comprimido y con estadísticas por
+    row group. Dentro de cada partición las filas quedan ordenadas por
+    'muestra', así los filtros por rango de tiempo también pueden saltar row groups.
+    Se escribe primero en un directorio hermano temporal y después se
+    reemplazan solo las particiones (carpetas `<clave>=*`) de out_dir: el resto
+    de su contenido (p. ej. el Excel o la caché en data/) no se toca.
+    """
+    prefix = f"{partition_by[0]}="
+    os.makedirs(out_dir, exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix=".dataset-", dir=os.path.dirname(os.path.abspath(out_dir)))
+    try:
+        df.sort([*partition_by, "muestra"]).write_parquet(
+            tmp,
+            partition_by=list(partition_by),
+            compression=compression,
+            statistics=True,
+            row_group_size=row_group_size,
+        )
+        for entry in os.listdir(out_dir):
+            if entry.startswith(prefix):
+                shutil.rmtree(os.path.join(out_dir, entry))
+        for entry in os.listdir(tmp):
+            os.replace(os.path.join(tmp, entry), os.path.join(out_dir, entry))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+def scan_dataset(out_dir: str = "data/etl_dataset") -> pl.LazyFrame:
+    """
+    LazyFrame sobre un dataset particionado (por hoja, o por hoja y canal).
+    Los filtros sobre '__sheet__'/'canal' descartan archivos completos antes
+    de leerlos y los de 'muestra'/'t_s' usan las estadísticas de row group.
+    """
+    return pl.scan_parquet(os.path.join(out_dir, "__sheet__=*", "**", "*.parquet"),
+                           hive_partitioning=True, hive_schema=HIVE_SCHEMA)
+
+def dataset_partitions(out_dir: str = "data/etl_dataset") -> dict[str, list[str] | None]:
+    """
+    Hojas (y canales, si también se particionó por canal) de un dataset,
+    leídos de los nombres de carpeta, sin abrir ningún Parquet.
+    """
+    out = {}
+    for entry in sorted(os.listdir(out_dir)):
+        if not entry.startswith("__sheet__="):
+            continue
+        sheet = unquote(entry.split("=", 1)[1])
+        subdirs = [d for d in os.listdir(os.path.join(out_dir, entry)) if d.startswith("canal=")]
+        out[sheet] = sorted(unquote(d.split("=", 1)[1]) for d in subdirs) or None
+    return out
 
 if __name__ == "__main__":
     import argparse
@@ -131,15 +479,124 @@ if __name__ == "__main__":
     ap.add_argument("--z", type=float, default=3.0, help="Umbral z-score para outliers")
     ap.add_argument("--win", type=int, default=5, help="Ventana de suavizado (rolling)")
     ap.add_argument("--fs", type=float, default=1.0, help="Frecuencia de muestreo (Hz) para t_s")
+    ap.add_argument("--columns", type=str, nargs="+", default=None,
+                    help="Columnas a leer (p. ej. Usuario 1 2 3); vacío = todas")
+    ap.add_argument("--n-rows", type=int, default=None, help="Filas de datos a leer por hoja")
+    ap.add_argument("--engine", choices=["auto", "calamine", "pandas"], default="auto",
+                    help="Lector de Excel: calamine (fastexcel) o pandas")
+    ap.add_argument("--workers", type=int, default=None,
+                    help="Procesar las hojas en paralelo con N workers (por defecto, serial)")
+    ap.add_argument("--pool", choices=["process", "thread"], default="process",
+                    help="Tipo de pool para --workers")
+    ap.add_argument("--streaming", action="store_true", help="Ejecutar el plan con el motor de streaming")
+    ap.add_argument("--explain", action="store_true", help="Imprimir el plan de consulta optimizado")
+    ap.add_argument("--cache-dir", type=str, default="data/.etl_cache",
+                    help="Directorio de la caché de resultados (compartida con app.py)")
+    ap.add_argument("--cache-mb", type=float, default=512, help="Tamaño máximo de la caché (MB)")
+    ap.add_argument("--no-cache", action="store_true", help="Recalcular sin usar la caché")
+    ap.add_argument("--incremental", action="store_true",
+                    help="Actualizar solo hojas nuevas/cambiadas en Parquet particionado (--out-dir)")
+    ap.add_argument("--out-dir", type=str, default=None,
+                    help="Directorio del dataset particionado por hoja (--incremental: data/etl_output, "
+                         "--stream: data/etl_stream)")
+    ap.add_argument("--stream", type=str, default=None,
+                    help="Directorio con lotes CSV/Parquet (uno por subcarpeta/hoja) a limpiar en streaming")
+    ap.add_argument("--follow", action="store_true", help="Con --stream, seguir esperando lotes nuevos")
+    ap.add_argument("--dataset", type=str, default=None,
+                    help="Escribir además un dataset Parquet particionado por hoja/canal (p. ej. data/etl_dataset)")
+    ap.add_argument("--compact", action="store_true",
+                    help="Esquema compacto: Enum para hoja/canal, Float32 y t_s derivado al leer")
+    ap.add_argument("--profile", action="store_true",
+                    help="Medir cada etapa (tiempo, filas, tamaño) y los descartes del filtro z; sin caché")
+    ap.add_argument("--profile-json", type=str, default=None, help="Guardar el reporte de --profile en JSON")
+    ap.add_argument("--cprofile", action="store_true", help="Con --profile, correr cada etapa bajo cProfile")
+    ap.add_argument("--layout", choices=["long", "wide"], default="long",
+                    help="Calcular las features en largo (Polars) o por columna en ancho (NumPy, sin melt)")
+    ap.add_argument("--check-wide", action="store_true",
+                    help="Verificar que la ruta ancha da el mismo resultado que la larga y salir")
+    ap.add_argument("--features", action="store_true",
+                    help="Guardar la tabla de features por hoja/canal (estadísticas + Welch) junto a --out "
+                         "(x.features.parquet) y al --dataset")
+    ap.add_argument("--nperseg", type=int, default=256, help="Largo de segmento de Welch para --features")
     ap.add_argument("--out", type=str, default="data/etl_output.parquet", help="Salida Parquet")
     args = ap.parse_args()
 
-    out_df = run_etl_excel(
-        args.path,
+    if args.stream:
+        from etl_stream import stream_etl
+        out_dir = args.out_dir or "data/etl_stream"
+        for k, batch in enumerate(stream_etl(args.stream, z=args.z, smooth=args.win, fs=args.fs,
+                                             follow=args.follow)):
+            for (sh,), part in batch.partition_by("__sheet__", as_dict=True).items():
+                d = os.path.join(out_dir, f"__sheet__={quote(sh, safe='')}")
+                os.makedirs(d, exist_ok=True)
+                part.drop("__sheet__").write_parquet(os.path.join(d, f"batch-{k:08d}.parquet"))
+            print(f"  lote {k}: {batch.height} filas")
+        print(f"[OK] Lotes limpios en: {out_dir}")
+        raise SystemExit(0)
+
+    if args.incremental:
+        from etl_incremental import run_etl_incremental
+        out_dir = args.out_dir or "data/etl_output"
+        report = run_etl_incremental(args.path, out_dir, z_thresh=args.z,
+                                     smooth_window=args.win, fs=args.fs, engine=args.engine)
+        for sh, action in report.items():
+            print(f"  {sh:<12} {action}")
+        print(f"[OK] Dataset particionado: {out_dir}")
+        raise SystemExit(0)
+
+    if args.check_wide:
+        from etl_wide import check_wide_equivalence
+        report = check_wide_equivalence(args.path, args.sheet or None, args.z, args.win, args.fs,
+                                        columns=args.columns, n_rows=args.n_rows, engine=args.engine)
+        print(f"[OK] Ruta ancha equivalente: {report['filas']} filas, error relativo máx. {report['error_max']}")
+        raise SystemExit(0)
+
+    options = dict(
         sheet=(args.sheet or None),
         z_thresh=args.z,
         smooth_window=args.win,
         fs=args.fs,
+        columns=args.columns,
+        n_rows=args.n_rows,
+        engine=args.engine,
+        workers=args.workers,
+        pool=args.pool,
+        streaming=args.streaming,
+        compact=args.compact,
+        layout=args.layout,
     )
+    profile = None
+    if args.profile or args.profile_json or args.cprofile:
+        profile = ETLProfile(hook=cprofile_hook() if args.cprofile else None)
+        out_df = run_etl_excel(args.path, profile=profile, **options)
+        print(profile)
+        if args.profile_json:
+            import json
+            with open(args.profile_json, "w", encoding="utf-8") as fh:
+                json.dump(profile.to_dict(), fh, indent=2)
+            print(f"[OK] Perfil: {args.profile_json}")
+    elif args.no_cache or args.explain:
+        out_df = run_etl_excel(args.path, explain=args.explain, **options)
+    else:
+        cache = ETLCache(args.cache_dir, max_bytes=int(args.cache_mb * 2**20))
+        out_df = run_etl_cached(args.path, cache=cache, **options)
+        print(f"[cache] {'acierto' if cache.hits else 'calculado'} ({args.cache_dir})")
     out_df.write_parquet(args.out)
     print(f"[OK] Guardado: {args.out}")
+    if args.compact:
+        wide = with_time(out_df.with_columns(
+            pl.col("__sheet__", "canal").cast(pl.Utf8), pl.col("valor", "valor_sm", "valor_mm").cast(pl.Float64)
+        ), args.fs)
+        before, after = footprint(wide), footprint(out_df)
+        for k in before:
+            print(f"  {k:<14} {before[k] / 2**20:8.2f} MB -> {after[k] / 2**20:8.2f} MB "
+                  f"({after[k] / before[k]:.0%})")
+    if args.dataset:
+        write_dataset(out_df, args.dataset)
+        print(f"[OK] Dataset particionado: {args.dataset}")
+    if args.features:
+        from features import feature_table, raw_long_from_excel, write_features
+        raw = raw_long_from_excel(args.path, args.sheet or None, args.columns, args.n_rows, args.engine)
+        table = feature_table(out_df, fs=args.fs, raw_long=raw, nperseg=args.nperseg)
+        for target in filter(None, (args.out, args.dataset)):
+            print(f"[OK] Features ({table.height} grupos): {write_features(table, target)}")
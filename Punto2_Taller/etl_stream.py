@@ -0,0 +1,185 @@
+# etl_stream.py
+"""
+Ingesta en streaming de lotes CSV/Parquet de sensores con limpieza por ventanas.
+
+Cada lote (ancho como las hojas del Excel, o ya largo con 'canal'/'valor') pasa
+por el mismo parseo de unidades y se limpia con estado en línea por
+(__sheet__, canal), de tamaño acotado sin importar cuán largo sea el flujo:
+- z-score: media/varianza acumuladas (Welford/Chan, combinadas por lote);
+  cada lote se filtra con las estadísticas vistas hasta él (causal).
+- valor_sm: media móvil centrada con un búfer de las últimas `win - 1` filas
+  por canal; una fila se emite cuando ya llegaron sus (win - 1) // 2 vecinas
+  futuras, así que la salida va con ese retraso. flush() emite las pendientes
+  (con valor_sm nulo, como los bordes en el ETL por lotes).
+- valor_mm: min–max con el mínimo y máximo acumulados al momento de emitir.
+
+Como las estadísticas son causales, el resultado no es idéntico al ETL por
+lotes (que ve toda la hoja antes de filtrar); converge a él cuando el flujo
+es estacionario.
+"""
+import os
+import time
+
+import polars as pl
+
+from etl_polars import _coerce_numeric_columns, melt_wide
+from online_stats import group_stats, keep_mask, merge_stats
+
+_BY = ("__sheet__", "canal")
+_COLUMNS = ["__sheet__", "canal", "muestra", "valor", "valor_sm", "valor_mm", "t_s"]
+
+
+class StreamETL:
+    """Limpieza en línea de lotes; process() devuelve las filas listas de cada lote."""
+
+    def __init__(self, z: float = 3.0, smooth: int = 5, fs: float = 1.0):
+        self.z = z
+        self.smooth = smooth
+        self.fs = fs
+        self.ahead = (smooth - 1) // 2  # vecinas futuras en rolling_mean(center=True)
+        self.stats = None               # n, mean, m2 por (__sheet__, canal)
+        self.extremes = None            # min/max acumulados de las filas conservadas
+        self.buffer = None              # últimas smooth - 1 filas por canal (emitidas o no)
+        self.rows = {}                  # filas recibidas por hoja -> siguiente 'muestra' (ancho)
+        self.channel_rows = {}          # (hoja, canal) -> siguiente 'muestra' (largo sin índice)
+
+    def _to_long(self, chunk: pl.DataFrame, sheet: str) -> pl.DataFrame:
+        if "__sheet__" not in chunk.columns:
+            chunk = chunk.with_columns(pl.lit(sheet).alias("__sheet__"))
+        if {"canal", "valor"} <= set(chunk.columns):
+            long = (_coerce_numeric_columns(chunk, skip_cols=[c for c in chunk.columns if c != "valor"])
+                    .with_columns(pl.col("canal").cast(pl.Utf8)))
+            if "muestra" not in long.columns:  # si el lote ya trae su índice se respeta
+                long = self._number_by_channel(long, sheet)
+        else:
+            offset = self.rows.get(sheet, 0)
+            long = (melt_wide(_coerce_numeric_columns(chunk), id_cols=("__sheet__", "Usuario"))
+                    .with_columns(pl.col("muestra").cast(pl.Int64) + offset))
+            self.rows[sheet] = offset + chunk.height
+        return (long.drop_nulls(subset=["valor"])
+                .select("__sheet__", "canal", pl.col("muestra").cast(pl.Int64),
+                        pl.col("valor").cast(pl.Float64)))
+
+    def _number_by_channel(self, long: pl.DataFrame, sheet: str) -> pl.DataFrame:
+        """
+        En un lote largo los canales vienen intercalados: 'muestra' es la posición
+        de la fila dentro de su canal, continuando desde los lotes anteriores de la hoja.
+        """
+        counts = long.group_by("canal", maintain_order=True).len()
+        offsets = [self.channel_rows.get((sheet, c), 0) for c in counts["canal"]]
+        for c, n, off in zip(counts["canal"], counts["len"], offsets):
+            self.channel_rows[(sheet, c)] = off + n
+        offsets = counts.select("canal", pl.Series("__offset__", offsets, dtype=pl.Int64))
+        return (long.with_columns(pl.int_range(pl.len(), dtype=pl.Int64).over("canal").alias("muestra"))
+                .join(offsets, on="canal", how="left", join_nulls=True)
+                .with_columns(pl.col("muestra") + pl.col("__offset__"))
+                .drop("__offset__"))
+
+    def _process_sheet(self, chunk: pl.DataFrame, sheet: str) -> pl.DataFrame:
+        long = self._to_long(chunk, sheet)
+        stats = group_stats(long, by=_BY)
+        self.stats = stats if self.stats is None else merge_stats(self.stats, stats, by=_BY)
+        kept = keep_mask(long, self.stats, self.z, by=_BY).filter("__keep__").drop("__keep__")
+
+        v = pl.col("valor")
+        ext = kept.group_by(list(_BY)).agg(v.min().alias("vmin"), v.max().alias("vmax"))
+        if self.extremes is not None:
+            ext = (pl.concat([self.extremes, ext]).group_by(list(_BY))
+                   .agg(pl.col("vmin").min(), pl.col("vmax").max()))
+        self.extremes = ext
+
+        pending = kept.with_columns(pl.lit(False).alias("__emitted__"))
+        if self.buffer is not None:
+            pending = pl.concat([self.buffer, pending])
+        window = (pending.sort([*_BY, "muestra"])
+                  .with_columns(
+                      v.rolling_mean(window_size=self.smooth, center=True).over(_BY).alias("valor_sm"),
+                      pl.int_range(pl.len()).reverse().over(_BY).alias("__from_end__"),
+                  ))
+        ready = window.filter(~pl.col("__emitted__") & (pl.col("__from_end__") >= self.ahead))
+        self.buffer = (window.filter(pl.col("__from_end__") < self.smooth - 1)
+                       .with_columns((pl.col("__emitted__") | (pl.col("__from_end__") >= self.ahead))
+                                     .alias("__emitted__"))
+                       .select("__sheet__", "canal", "muestra", "valor", "__emitted__"))
+        return self._finish(ready)
+
+    def _finish(self, ready: pl.DataFrame) -> pl.DataFrame:
+        v = pl.col("valor")
+        return (ready.join(self.extremes, on=list(_BY), how="left")
+                .with_columns(((v - pl.col("vmin")) / (pl.col("vmax") - pl.col("vmin"))).alias("valor_mm"),
+                              (pl.col("muestra").cast(pl.Float64) / self.fs).alias("t_s"))
+                .select(_COLUMNS))
+
+    def process(self, chunk: pl.DataFrame, sheet: str = "stream") -> pl.DataFrame:
+        """
+        Limpia un lote y devuelve las filas que ya se pueden emitir. Si el lote
+        trae '__sheet__' con varias hojas, cada una se procesa por separado.
+        """
+        if "__sheet__" in chunk.columns:
+            parts = chunk.partition_by("__sheet__", as_dict=True, maintain_order=True)
+            out = [self._process_sheet(df, key[0]) for key, df in parts.items()]
+        else:
+            out = [self._process_sheet(chunk, sheet)]
+        return pl.concat(out) if out else self._empty()
+
+    def flush(self) -> pl.DataFrame:
+        """Emite las filas que esperaban vecinas futuras (fin del flujo)."""
+        if self.buffer is None:
+            return self._empty()
+        ready = (self.buffer.filter(~pl.col("__emitted__"))
+                 .with_columns(pl.lit(None, dtype=pl.Float64).alias("valor_sm")))
+        self.buffer = self.buffer.with_columns(pl.lit(True).alias("__emitted__"))
+        return self._finish(ready)
+
+    def _empty(self) -> pl.DataFrame:
+        return pl.DataFrame(schema={"__sheet__": pl.Utf8, "canal": pl.Utf8, "muestra": pl.Int64,
+                                    "valor": pl.Float64, "valor_sm": pl.Float64,
+                                    "valor_mm": pl.Float64, "t_s": pl.Float64})
+
+
+def _read_chunk(path: str) -> pl.DataFrame:
+    return pl.read_parquet(path) if path.endswith(".parquet") else pl.read_csv(path)
+
+
+def iter_chunks(root: str, follow: bool = False, poll: float = 1.0):
+    """
+    Recorre lotes .csv/.parquet de un directorio en orden de nombre (p. ej.
+    con marca de tiempo) y produce (hoja, DataFrame). La hoja es la
+    subcarpeta del lote (root/EMG/0001.csv -> 'EMG') o el nombre de root si
+    están sueltos. Con follow=True sigue esperando archivos nuevos; solo
+    recuerda el último nombre procesado por carpeta.
+    """
+    last = {}
+    while True:
+        found = False
+        for dirpath, dirnames, files in os.walk(root):
+            dirnames.sort()
+            sheet = os.path.basename(os.path.normpath(dirpath))
+            for name in sorted(files):
+                if not name.endswith((".csv", ".parquet")) or name <= last.get(dirpath, ""):
+                    continue
+                last[dirpath] = name
+                found = True
+                yield sheet, _read_chunk(os.path.join(dirpath, name))
+        if not follow:
+            return
+        if not found:
+            time.sleep(poll)
+
+
+def stream_etl(source, z: float = 3.0, smooth: int = 5, fs: float = 1.0, **kwargs):
+    """
+    Generador de lotes limpios. source: directorio (ver iter_chunks; kwargs
+    pasa follow/poll) o un iterable de DataFrames o pares (hoja, DataFrame).
+    Al agotarse el origen emite también las filas pendientes.
+    """
+    etl = StreamETL(z=z, smooth=smooth, fs=fs)
+    chunks = iter_chunks(source, **kwargs) if isinstance(source, (str, os.PathLike)) else source
+    for item in chunks:
+        sheet, chunk = item if isinstance(item, tuple) else ("stream", item)
+        batch = etl.process(chunk, sheet)
+        if batch.height:
+            yield batch
+    tail = etl.flush()
+    if tail.height:
+        yield tail
@@ -0,0 +1,161 @@
+# etl_wide.py
+"""
+Ruta rápida en formato ancho: las mismas features que clean_long, calculadas
+por columna sobre un bloque 2-D de NumPy (filas × canales) de cada hoja, sin
+pasar por melt_wide (que multiplica las filas por la cantidad de canales) ni
+por ventanas `over(["__sheet__", "canal"])` con claves repetidas.
+
+Por canal, igual que en el formato largo:
+- z-score con media y desviación (ddof=1) de los valores no nulos; se
+  conservan |z| <= z (o todos si hay menos de 2 valores),
+- valor_sm: media móvil centrada sobre las filas conservadas (las filas
+  descartadas no cuentan como vecinas); nula en los bordes,
+- valor_mm: min–max sobre las filas conservadas.
+
+NaN marca nulo o descartado dentro de los bloques. Solo se pasa a formato
+largo al final (wide_to_long) si quien consume lo necesita; el resultado es
+el mismo que run_etl_excel (ver check_wide_equivalence).
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import polars as pl
+from numpy.lib.stride_tricks import sliding_window_view
+
+from etl_polars import _coerce_numeric_columns, _excel_to_polars, run_etl_excel
+
+
+@dataclass
+class WideBlock:
+    """Features de una hoja en formato ancho: arreglos (filas × canales), NaN = sin dato."""
+    sheet: str
+    muestra: np.ndarray           # índice de fila global (como with_row_index en melt_wide)
+    usuario: pl.Series | None     # columna 'Usuario' tal cual, si existe
+    canales: list[str]
+    valor: np.ndarray
+    valor_sm: np.ndarray
+    valor_mm: np.ndarray
+
+    def frame(self, feature: str = "valor_sm") -> pl.DataFrame:
+        """Una feature en ancho: 'muestra' + una columna por canal (nulo = sin dato)."""
+        data = getattr(self, feature)
+        cols = [pl.Series(c, data[:, j], nan_to_null=True) for j, c in enumerate(self.canales)]
+        return pl.DataFrame([pl.Series("muestra", self.muestra, dtype=pl.UInt32), *cols])
+
+
+def clean_wide(x: np.ndarray, z: float = 3.0, smooth: int = 5):
+    """
+    Filtro z, media móvil centrada y min–max por columna de x (filas × canales,
+    NaN = nulo). Devuelve (valor, valor_sm, valor_mm) con NaN en las filas
+    descartadas.
+    """
+    present = ~np.isnan(x)
+    n = present.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(present, x, 0.0).sum(axis=0) / n
+        dev = np.where(present, x - mean, 0.0)
+        std = np.sqrt((dev * dev).sum(axis=0) / (n - 1))
+        zscore = (x - mean) / std
+    # std 0 da z NaN (se descarta, como en Polars); con < 2 valores no hay z
+    keep = present & ((np.abs(zscore) <= z) | (n < 2))
+    valor = np.where(keep, x, np.nan)
+
+    # Media móvil sobre las filas conservadas: se compactan al inicio de cada
+    # columna (orden estable) y la cola queda en NaN, así las ventanas que la
+    # tocan dan NaN igual que los bordes en Polars.
+    order = np.argsort(~keep, axis=0, kind="stable")
+    packed = np.take_along_axis(valor, order, axis=0)
+    sm_packed = np.full_like(packed, np.nan)
+    if len(packed) >= smooth:
+        left = smooth // 2
+        windows = sliding_window_view(packed, smooth, axis=0).mean(axis=-1)
+        sm_packed[left:left + len(windows)] = windows
+    valor_sm = np.empty_like(sm_packed)
+    np.put_along_axis(valor_sm, order, sm_packed, axis=0)
+
+    vmin = np.min(valor, axis=0, initial=np.inf, where=keep)
+    vmax = np.max(valor, axis=0, initial=-np.inf, where=keep)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        valor_mm = np.where(keep, (x - vmin) / (vmax - vmin), np.nan)
+    return valor, valor_sm, valor_mm
+
+
+def run_etl_wide(
+    path: str,
+    sheet: str | None = None,
+    z_thresh: float = 3.0,
+    smooth_window: int = 5,
+    columns: list | None = None,
+    n_rows: int | None = None,
+    engine: str = "auto",
+) -> list[WideBlock]:
+    """Lee el Excel y calcula las features en ancho, un bloque por hoja (en orden alfabético)."""
+    df = _coerce_numeric_columns(_excel_to_polars(path, sheet=sheet, columns=columns,
+                                                  n_rows=n_rows, engine=engine))
+    df = df.with_row_index("muestra")
+    ids = {"muestra", "__sheet__", "Usuario"}
+    # Canales en el orden de texto del formato largo ('1', '10', '11', ...)
+    canales = sorted(c for c in df.columns if c not in ids)
+    blocks = []
+    for (sh,), part in sorted(df.partition_by("__sheet__", as_dict=True, maintain_order=True).items()):
+        x = part.select(pl.col(canales).cast(pl.Float64)).to_numpy()
+        valor, valor_sm, valor_mm = clean_wide(x, z=z_thresh, smooth=smooth_window)
+        blocks.append(WideBlock(
+            sheet=sh,
+            muestra=part["muestra"].to_numpy(),
+            usuario=part["Usuario"] if "Usuario" in part.columns else None,
+            canales=canales,
+            valor=valor,
+            valor_sm=valor_sm,
+            valor_mm=valor_mm,
+        ))
+    return blocks
+
+
+def wide_to_long(blocks: list[WideBlock], fs: float = 1.0) -> pl.DataFrame:
+    """
+    Formato largo de run_etl_excel (mismas columnas, tipos y orden de filas)
+    a partir de los bloques: solo se emiten las filas conservadas.
+    """
+    frames = []
+    for b in blocks:
+        keep = ~np.isnan(b.valor.T)        # canal-mayor: ordenado por (canal, muestra)
+        ch, row = np.nonzero(keep)
+        cols = [
+            pl.Series("muestra", b.muestra[row], dtype=pl.UInt32),
+            pl.Series("__sheet__", [b.sheet], dtype=pl.Utf8).gather(np.zeros(len(row), dtype=np.int64)),
+        ]
+        if b.usuario is not None:
+            cols.append(b.usuario.gather(row))
+        cols += [
+            pl.Series("canal", b.canales, dtype=pl.Utf8).gather(ch),
+            pl.Series("valor", b.valor.T[keep]),
+            pl.Series("valor_sm", b.valor_sm.T[keep], nan_to_null=True),  # bordes: nulo como en Polars
+            pl.Series("valor_mm", b.valor_mm.T[keep]),                    # NaN si max == min, igual que Polars
+        ]
+        frames.append(pl.DataFrame(cols))
+    long = pl.concat(frames, how="vertical_relaxed")
+    return long.with_columns((pl.col("muestra").cast(pl.Float64) / fs).alias("t_s"))
+
+
+def check_wide_equivalence(path: str, sheet: str | None = None, z_thresh: float = 3.0,
+                           smooth_window: int = 5, fs: float = 1.0, rtol: float = 1e-9, **read) -> dict:
+    """
+    Compara la ruta ancha contra run_etl_excel: mismas filas en el mismo orden
+    y features iguales salvo redondeo (rtol). Lanza AssertionError si no.
+    """
+    long = run_etl_excel(path, sheet, z_thresh, smooth_window, fs, **read)
+    wide = wide_to_long(run_etl_wide(path, sheet, z_thresh, smooth_window, **read), fs)
+    assert wide.columns == long.columns, (wide.columns, long.columns)
+    assert wide.dtypes == long.dtypes, (wide.dtypes, long.dtypes)
+    keys = ["muestra", "__sheet__", "canal", "t_s"]
+    assert wide.select(keys).equals(long.select(keys)), "filas conservadas u orden distintos"
+    worst = {}
+    for c in ("valor", "valor_sm", "valor_mm"):
+        a, b = wide[c].to_numpy(), long[c].to_numpy()
+        assert np.array_equal(np.isnan(a), np.isnan(b)), f"{c}: nulos/NaN distintos"
+        ok = ~np.isnan(a)
+        err = np.abs(a[ok] - b[ok]) / np.maximum(np.abs(b[ok]), 1.0)
+        worst[c] = float(err.max()) if err.size else 0.0
+        assert worst[c] <= rtol, f"{c}: error relativo {worst[c]:.2e} > {rtol:.0e}"
+    return {"filas": long.height, "error_max": worst}
@@ -0,0 +1,148 @@
+# features.py
+"""
+Tabla de features por (__sheet__, canal), calculada una vez después del ETL y
+guardada junto al Parquet de salida, para que el dashboard muestre resúmenes
+(mapas de calor, rankings) sin recorrer las muestras:
+- estadísticas: n, media, desviación, min/max y percentiles; con el formato
+  largo previo a la limpieza, también nulos y filas descartadas por el filtro z,
+- espectro: PSD de Welch (ventana Hann, 50 % de solape, sin tendencia
+  constante) con el `fs` del ETL, de la que salen potencia total, frecuencia
+  pico, centroide espectral y potencia por banda.
+
+Las filas conservadas de cada canal se tratan como muestreadas de forma
+uniforme a fs (los outliers quitados no dejan hueco). El espectro se calcula
+en lotes: los segmentos de TODOS los grupos se apilan en una matriz y se les
+aplica una sola FFT por lote (sin SciPy).
+"""
+import os
+
+import numpy as np
+import polars as pl
+
+from etl_polars import (_coerce_numeric_columns, _excel_to_polars, melt_wide, z_filter_drops)
+
+_GRP = ["__sheet__", "canal"]
+
+
+def channel_summary(long: pl.DataFrame, raw_long: pl.DataFrame | None = None) -> pl.DataFrame:
+    """Estadísticas por grupo; con raw_long (salida de melt_wide) agrega nulos y descartes z."""
+    v = pl.col("valor")
+    stats = long.group_by(_GRP).agg(
+        pl.len().alias("n"),
+        v.mean().alias("media"),
+        v.std().alias("std"),
+        v.min().alias("min"),
+        *[v.quantile(q, "linear").alias(f"p{int(q * 100):02d}") for q in (0.05, 0.25, 0.5, 0.75, 0.95)],
+        v.max().alias("max"),
+    )
+    if raw_long is not None:
+        drops = z_filter_drops(raw_long, long).select(*_GRP, "nulos", "z_descartadas")
+        stats = stats.join(drops, on=_GRP, how="left")
+    return stats.sort(_GRP)
+
+
+def default_bands(fs: float, n: int = 4) -> dict:
+    """n bandas de igual ancho entre 0 y Nyquist (fs / 2)."""
+    edges = np.linspace(0, fs / 2, n + 1)
+    return {f"banda_{lo:g}_{hi:g}Hz": (lo, hi) for lo, hi in zip(edges[:-1], edges[1:])}
+
+
+def _segment_starts(lengths: np.ndarray, offsets: np.ndarray, nperseg: int):
+    """Inicio (índice global) y grupo de cada segmento de Welch, con solape de nperseg // 2."""
+    step = nperseg - nperseg // 2
+    counts = np.where(lengths >= nperseg, (lengths - nperseg) // step + 1, 0)
+    group = np.repeat(np.arange(len(lengths)), counts)
+    first = np.repeat(np.cumsum(counts) - counts, counts)
+    starts = offsets[group] + (np.arange(counts.sum()) - first) * step
+    return starts, group, counts
+
+
+def welch_batch(values: np.ndarray, lengths: np.ndarray, fs: float, nperseg: int,
+                batch: int = 4096) -> tuple[np.ndarray, np.ndarray]:
+    """
+    PSD de Welch (densidad, una cara) de varias series concatenadas en `values`
+    (lengths[i] muestras cada una, todas >= nperseg). Devuelve (freqs, psd) con
+    psd de forma (grupos, nperseg // 2 + 1). Los segmentos se procesan de a
+    `batch` para acotar la memoria.
+    """
+    offsets = np.cumsum(lengths) - lengths
+    starts, group, counts = _segment_starts(lengths, offsets, nperseg)
+    window = np.hanning(nperseg + 1)[:-1]  # Hann periódica, como scipy.signal.welch
+    scale = 1.0 / (fs * (window * window).sum())
+    psd = np.zeros((len(lengths), nperseg // 2 + 1))
+    idx = np.arange(nperseg)
+    for lo in range(0, len(starts), batch):
+        seg = values[starts[lo:lo + batch, None] + idx]
+        seg = (seg - seg.mean(axis=1, keepdims=True)) * window
+        power = np.abs(np.fft.rfft(seg, axis=1)) ** 2 * scale
+        np.add.at(psd, group[lo:lo + batch], power)
+    psd /= np.maximum(counts, 1)[:, None]
+    # Una cara: se duplica todo salvo DC (y Nyquist si nperseg es par)
+    psd[:, 1:(None if nperseg % 2 else -1)] *= 2
+    return np.fft.rfftfreq(nperseg, 1.0 / fs), psd
+
+
+def spectral_features(long: pl.DataFrame, fs: float = 1.0, nperseg: int = 256, bands: dict | None = None,
+                      batch: int = 4096) -> pl.DataFrame:
+    """
+    Potencia total, frecuencia pico (sin DC), centroide y potencia por banda de
+    cada grupo. Canales con menos de nperseg filas usan un solo segmento de su
+    largo (como scipy); con menos de 8 quedan nulos.
+    """
+    bands = bands or default_bands(fs)
+    data = long.select(*_GRP, "muestra", "valor").sort([*_GRP, "muestra"])
+    groups = data.group_by(_GRP, maintain_order=True).agg(pl.len().alias("n"))
+    values = data["valor"].to_numpy()
+    lengths = groups["n"].to_numpy().astype(np.int64)
+    offsets = np.cumsum(lengths) - lengths
+
+    out = {k: np.full(len(lengths), np.nan) for k in ("potencia_total", "f_pico", "f_centroide", *bands)}
+    seg_len = np.minimum(lengths, nperseg)
+    for m in np.unique(seg_len[seg_len >= 8]):
+        sel = np.flatnonzero(seg_len == m)
+        # Solo los tramos de estos grupos, contiguos, para un lote de la misma longitud de segmento
+        take = np.concatenate([np.arange(o, o + n) for o, n in zip(offsets[sel], lengths[sel])])
+        freqs, psd = welch_batch(values[take], lengths[sel], fs, int(m), batch)
+        df = freqs[1] - freqs[0]
+        total = psd.sum(axis=1) * df
+        out["potencia_total"][sel] = total
+        out["f_pico"][sel] = freqs[1:][psd[:, 1:].argmax(axis=1)] if len(freqs) > 1 else np.nan
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out["f_centroide"][sel] = (psd * freqs).sum(axis=1) / psd.sum(axis=1)
+        for name, (lo, hi) in bands.items():
+            in_band = (freqs >= lo) & ((freqs < hi) | (hi >= fs / 2))  # la última incluye Nyquist
+            out[name][sel] = psd[:, in_band].sum(axis=1) * df
+    return groups.select(_GRP).with_columns(pl.Series(k, v, nan_to_null=True) for k, v in out.items())
+
+
+def feature_table(long: pl.DataFrame, fs: float = 1.0, raw_long: pl.DataFrame | None = None,
+                  nperseg: int = 256, bands: dict | None = None) -> pl.DataFrame:
+    """Estadísticas + espectro por (__sheet__, canal), una fila por grupo."""
+    long = long.with_columns(pl.col(_GRP).cast(pl.Utf8), pl.col("valor").cast(pl.Float64))  # admite esquema compacto
+    spec = spectral_features(long, fs=fs, nperseg=nperseg, bands=bands)
+    return channel_summary(long, raw_long).join(spec, on=_GRP, how="left").sort(_GRP)
+
+
+def raw_long_from_excel(path: str, sheet: str | None = None, columns: list | None = None,
+                        n_rows: int | None = None, engine: str = "auto") -> pl.DataFrame:
+    """Formato largo antes de limpiar (para contar nulos y descartes del filtro z)."""
+    df = _coerce_numeric_columns(_excel_to_polars(path, sheet=sheet, columns=columns, n_rows=n_rows, engine=engine))
+    return melt_wide(df, id_cols=("__sheet__", "Usuario"))
+
+
+def features_path(out: str) -> str:
+    """Ubicación de la tabla junto a la salida: x.parquet -> x.features.parquet; en un directorio, _features.parquet."""
+    if os.path.isdir(out) or not out.endswith(".parquet"):
+        return os.path.join(out, "_features.parquet")
+    return out[: -len(".parquet")] + ".features.parquet"
+
+
+def write_features(table: pl.DataFrame, out: str) -> str:
+    fname = features_path(out)
+    table.write_parquet(fname)
+    return fname
+
+
+def read_features(out: str) -> pl.DataFrame | None:
+    fname = features_path(out)
+    return pl.read_parquet(fname) if os.path.exists(fname) else None
@@ -0,0 +1,43 @@
+# online_stats.py
+"""
+Agregados por grupo combinables entre bloques (Welford / Chan), compartidos
+por el ETL incremental (etl_incremental) y el de streaming (etl_stream):
+- group_stats: n, media y M2 de 'valor' por grupo de un bloque,
+- merge_stats: combina los agregados de dos bloques sin volver a verlos,
+- keep_mask: marca '__keep__' (|z| <= z) con media/desviación de los agregados.
+"""
+import polars as pl
+
+
+def group_stats(long: pl.DataFrame, by=("canal",)) -> pl.DataFrame:
+    """n, media y M2 (suma de cuadrados de desviaciones) de 'valor' por grupo."""
+    v = pl.col("valor")
+    return long.group_by(list(by)).agg(
+        pl.len().cast(pl.Int64).alias("n"),
+        v.mean().alias("mean"),
+        ((v - v.mean()) ** 2).sum().alias("m2"),
+    )
+
+
+def merge_stats(a: pl.DataFrame, b: pl.DataFrame, by=("canal",)) -> pl.DataFrame:
+    """Combina agregados de dos bloques (fórmula de Chan para la varianza)."""
+    j = a.join(b, on=list(by), how="full", coalesce=True, suffix="_b").with_columns(
+        pl.col("n", "n_b").fill_null(0), pl.col("mean", "mean_b", "m2", "m2_b").fill_null(0.0)
+    )
+    n = pl.col("n") + pl.col("n_b")
+    delta = pl.col("mean_b") - pl.col("mean")
+    return j.select(
+        *by,
+        n.alias("n"),
+        (pl.col("mean") + delta * pl.col("n_b") / n).alias("mean"),
+        (pl.col("m2") + pl.col("m2_b") + delta**2 * pl.col("n") * pl.col("n_b") / n).alias("m2"),
+    )
+
+
+def keep_mask(long: pl.DataFrame, stats: pl.DataFrame, z: float, by=("canal",)) -> pl.DataFrame:
+    """Agrega '__keep__' = |z| <= z con media/desviación (ddof=1) tomadas de los agregados."""
+    std = pl.when(pl.col("n") > 1).then((pl.col("m2") / (pl.col("n") - 1)).sqrt())
+    zscore = (pl.col("valor") - pl.col("mean")) / std
+    return (long.join(stats.select(*by, "n", "mean", "m2"), on=list(by), how="left")
+            .with_columns(((zscore.abs() <= z) | zscore.is_null()).alias("__keep__"))
+            .drop("n", "mean", "m2"))
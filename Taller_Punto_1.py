@@ -1,8 +1,11 @@
 import matplotlib.pyplot as plt
 import networkx as nx
-from collections import deque
-import heapq
-import random
+
+from graph_csr import CSRGraph
+from search_core import (SearchObserver, SearchResult, astar, bfs, bidirectional_bfs,
+                         bidirectional_dijkstra, dfs, min_edge_heuristic, ucs)
+from search_render import (GraphRenderer, TraceRecorder, frontier_view, goal_title, render_trace,
+                           step_title)
 
 tree_with_costs = {
     'S': [('A', 3), ('B', 2), ('D', 4), ('E', 1)],
@@ -75,282 +78,304 @@ def hierarchy_pos(G, root, width=8.0, vert_gap=0.3):
     
     return _hierarchy_pos(G, root, width, vert_gap, 0, 0.5)
 
-def bfs_with_goal(tree, start, goal):
-    """BFS con objetivo y visualización"""
-    visited = []
-    queue = deque([start])
-    parent = {start: None}
-    step = 0
-    
-    G = create_graph()
-    pos = hierarchy_pos(G, start)
-    
-    plt.ion()
-    fig, ax = plt.subplots(figsize=(20, 14))
-    
-    while queue:
-        current_node = queue.popleft()
-        
-        if current_node not in visited:
-            visited.append(current_node)
-            
-            if current_node == goal:
-                path = []
-                node = current_node
-                while node is not None:
-                    path.append(node)
-                    node = parent[node]
-                path.reverse()
-                
-                plt.clf()
-                nx.draw(G, pos, with_labels=True, node_color="lightblue", 
-                       node_size=1000, font_size=7, font_weight="bold")
-                nx.draw_networkx_nodes(G, pos, nodelist=path, node_color="green", node_size=1000)
-                nx.draw_networkx_nodes(G, pos, nodelist=[goal], node_color="purple", node_size=1200)
-                
-                plt.title(f"BFS - ¡OBJETIVO 'W' ENCONTRADO!\n"
-                         f"Camino: {' → '.join(path)}\nLongitud: {len(path)-1} pasos\n"
-                         f"Nodos visitados: {len(visited)}", fontsize=13, pad=20)
-                plt.tight_layout()
-                plt.pause(3)
-                plt.ioff()
-                
-                return path, visited
-            
-            for child in tree[current_node]:
-                if child not in visited and child not in queue:
-                    queue.append(child)
-                    parent[child] = current_node
-            
-            plt.clf()
-            nx.draw(G, pos, with_labels=True, node_color="lightblue", 
-                   node_size=1000, font_size=7, font_weight="bold")
-            nx.draw_networkx_nodes(G, pos, nodelist=visited, node_color="red", node_size=1000)
-            nx.draw_networkx_nodes(G, pos, nodelist=[current_node], node_color="orange", node_size=1000)
-            if queue:
-                nx.draw_networkx_nodes(G, pos, nodelist=list(queue), node_color="yellow", node_size=1000)
-            nx.draw_networkx_nodes(G, pos, nodelist=[goal], node_color="purple", node_size=1200)
-            
-            plt.title(f"BFS - Paso {step}\nVisitando: '{current_node}'\n"
-                     f"Visitados: {len(visited)}, En cola: {len(queue)}", fontsize=11, pad=20)
-            plt.tight_layout()
-            plt.pause(0.8)
-            step += 1
-    
-    plt.ioff()
-    return None, visited
-
-def dfs_with_goal(tree, start, goal):
-    """DFS con objetivo y visualización"""
-    visited = []
-    stack = [start]
-    parent = {start: None}
-    step = 0
-    
-    G = create_graph()
-    pos = hierarchy_pos(G, start)
-    
-    plt.ion()
-    fig, ax = plt.subplots(figsize=(20, 14))
-    
-    while stack:
-        current_node = stack.pop()
-        
-        if current_node not in visited:
-            visited.append(current_node)
-            
-            if current_node == goal:
-                path = []
-                node = current_node
-                while node is not None:
-                    path.append(node)
-                    node = parent[node]
-                path.reverse()
-                
-                plt.clf()
-                nx.draw(G, pos, with_labels=True, node_color="lightblue", 
-                       node_size=1000, font_size=7, font_weight="bold")
-                nx.draw_networkx_nodes(G, pos, nodelist=path, node_color="green", node_size=1000)
-                nx.draw_networkx_nodes(G, pos, nodelist=[goal], node_color="purple", node_size=1200)
-                
-                plt.title(f"DFS - ¡OBJETIVO 'W' ENCONTRADO!\n"
-                         f"Camino: {' → '.join(path)}\nLongitud: {len(path)-1} pasos\n"
-                         f"Nodos visitados: {len(visited)}", fontsize=13, pad=20)
-                plt.tight_layout()
-                plt.pause(3)
-                plt.ioff()
-                
-                return path, visited
-            
-            for child in reversed(tree[current_node]):
-                if child not in visited and child not in stack:
-                    stack.append(child)
-                    parent[child] = current_node
-            
-            plt.clf()
-            nx.draw(G, pos, with_labels=True, node_color="lightblue", 
-                   node_size=1000, font_size=7, font_weight="bold")
-            nx.draw_networkx_nodes(G, pos, nodelist=visited, node_color="red", node_size=1000)
-            nx.draw_networkx_nodes(G, pos, nodelist=[current_node], node_color="orange", node_size=1000)
-            if stack:
-                nx.draw_networkx_nodes(G, pos, nodelist=stack, node_color="yellow", node_size=1000)
-            nx.draw_networkx_nodes(G, pos, nodelist=[goal], node_color="purple", node_size=1200)
-            
-            plt.title(f"DFS - Paso {step}\nVisitando: '{current_node}'\n"
-                     f"Visitados: {len(visited)}, En pila: {len(stack)}", fontsize=11, pad=20)
-            plt.tight_layout()
-            plt.pause(0.8)
-            step += 1
-    
-    plt.ioff()
-    return None, visited
-
-def ucs_with_goal(tree_with_costs, start, goal):
-    """UCS con objetivo y visualización"""
-    visited = set()
-    priority_queue = [(0, start, [start])]  
-    parent = {start: None}
-    step = 0
-    
-    G = create_graph()
-    pos = hierarchy_pos(G, start)
-    edge_labels = nx.get_edge_attributes(G, 'weight')
-    
-    plt.ion()
-    fig, ax = plt.subplots(figsize=(20, 14))
-    
-    while priority_queue:
-        current_cost, current_node, current_path = heapq.heappop(priority_queue)
-        
-        if current_node not in visited:
-            visited.add(current_node)
-            
-            if current_node == goal:
-                plt.clf()
-                nx.draw(G, pos, with_labels=True, node_color="lightblue", 
-                       node_size=1000, font_size=7, font_weight="bold")
-                nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, font_size=6)
-                nx.draw_networkx_nodes(G, pos, nodelist=current_path, node_color="green", node_size=1000)
-                nx.draw_networkx_nodes(G, pos, nodelist=[goal], node_color="purple", node_size=1200)
-                
-                plt.title(f"UCS - ¡OBJETIVO 'W' ENCONTRADO!\n"
-                         f"Camino: {' → '.join(current_path)}\n"
-                         f"Costo total: {current_cost}\nLongitud: {len(current_path)-1} pasos\n"
-                         f"Nodos visitados: {len(visited)}", fontsize=13, pad=20)
-                plt.tight_layout()
-                plt.pause(4)
-                plt.ioff()
-                
-                return current_path, list(visited), current_cost
-            
-            for child, cost in tree_with_costs.get(current_node, []):
-                if child not in visited:
-                    new_cost = current_cost + cost
-                    new_path = current_path + [child]
-                    heapq.heappush(priority_queue, (new_cost, child, new_path))
-                    parent[child] = current_node
-            
-            plt.clf()
-            nx.draw(G, pos, with_labels=True, node_color="lightblue", 
-                   node_size=1000, font_size=7, font_weight="bold")
-            nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, font_size=6)
-            nx.draw_networkx_nodes(G, pos, nodelist=list(visited), node_color="red", node_size=1000)
-            nx.draw_networkx_nodes(G, pos, nodelist=[current_node], node_color="orange", node_size=1000)
-            
-            next_nodes = [node for _, node, _ in priority_queue[:5]]
-            if next_nodes:
-                nx.draw_networkx_nodes(G, pos, nodelist=next_nodes, node_color="yellow", node_size=1000)
-            
-            nx.draw_networkx_nodes(G, pos, nodelist=[goal], node_color="purple", node_size=1200)
-            
-            queue_info = []
-            for cost, node, path in priority_queue[:3]:
-                queue_info.append(f"{node}({cost})")
-            
-            plt.title(f"UCS - Paso {step}\nVisitando: '{current_node}' (Costo: {current_cost})\n"
-                     f"Visitados: {len(visited)}, En cola prioridad: {len(priority_queue)}\n"
-                     f"Próximos: {', '.join(queue_info)}", fontsize=11, pad=20)
-            plt.tight_layout()
-            plt.pause(1.0)
-            step += 1
-    
-    plt.ioff()
-    return None, list(visited), float('inf')
-
-print("=" * 60)
-print("BÚSQUEDA POR AMPLITUD (BFS)")
-print("=" * 60)
-bfs_path, bfs_visited = bfs_with_goal(tree, 'S', 'W')
-
-print("\n" + "=" * 60)
-print("BÚSQUEDA POR PROFUNDIDAD (DFS)")
-print("=" * 60)
-dfs_path, dfs_visited = dfs_with_goal(tree, 'S', 'W')
-
-print("\n" + "=" * 60)
-print("BÚSQUEDA DE COSTO UNIFORME (UCS)")
-print("=" * 60)
-ucs_path, ucs_visited, ucs_cost = ucs_with_goal(tree_with_costs, 'S', 'W')
-
-print("\n" + "=" * 80)
-print("RESULTADOS COMPARATIVOS - BFS vs DFS vs UCS")
-print("=" * 80)
-
-if bfs_path:
-    print(f"BFS  - Camino: {' → '.join(bfs_path)}")
-    print(f"     - Longitud: {len(bfs_path)-1} pasos, Nodos visitados: {len(bfs_visited)}")
-else:
-    print("BFS - No se encontró el camino")
-
-if dfs_path:
-    print(f"DFS  - Camino: {' → '.join(dfs_path)}")
-    print(f"     - Longitud: {len(dfs_path)-1} pasos, Nodos visitados: {len(dfs_visited)}")
-else:
-    print("DFS - No se encontró el camino")
-
-if ucs_path:
-    print(f"UCS  - Camino: {' → '.join(ucs_path)}")
-    print(f"     - Costo total: {ucs_cost}, Longitud: {len(ucs_path)-1} pasos")
-    print(f"     - Nodos visitados: {len(ucs_visited)}")
-else:
-    print("UCS - No se encontró el camino")
-
-# COMPARACIÓN DETALLADA
-print("\n" + "=" * 80)
-print("ANÁLISIS COMPARATIVO")
-print("=" * 80)
-
-if bfs_path and dfs_path and ucs_path:
-    print("✓ Los tres algoritmos encontraron el objetivo 'W'")
-    print(f"\n📊 COMPARACIÓN DE CAMINOS:")
-    print(f"   BFS:  {len(bfs_path)-1} pasos - {' → '.join(bfs_path)}")
-    print(f"   DFS:  {len(dfs_path)-1} pasos - {' → '.join(dfs_path)}")
-    print(f"   UCS:  {ucs_cost} unidades de costo - {' → '.join(ucs_path)}")
-    
-    print(f"\n📊 EFICIENCIA EN NODOS VISITADOS:")
-    print(f"   BFS visitó: {len(bfs_visited)} nodos")
-    print(f"   DFS visitó: {len(dfs_visited)} nodos")
-    print(f"   UCS visitó: {len(ucs_visited)} nodos")
-    
-    if ucs_cost < len(bfs_path) - 1:  # Comparar costo UCS vs pasos BFS
-        print(f"\n🎯 UCS encontró un camino MÁS ECONÓMICO que BFS")
-        print(f"   (Costo UCS: {ucs_cost} vs Pasos BFS: {len(bfs_path)-1})")
-    elif ucs_cost == len(bfs_path) - 1:
-        print(f"\n🎯 UCS y BFS encontraron caminos igual de eficientes")
+class GraphAnimator(SearchObserver):
+    """
+    Observador que anima cada paso de la búsqueda. El grafo se dibuja una sola
+    vez (search_render.GraphRenderer); cada paso solo recolorea los nodos y
+    actualiza el título con blitting, en lugar de plt.clf() + nx.draw.
+    """
+    def __init__(self, name, start, goal, frontier_label, show_costs=False):
+        self.name = name
+        self.goal = goal
+        self.frontier_label = frontier_label
+        self.show_costs = show_costs
+        self.G = create_graph()
+        self.pos = hierarchy_pos(self.G, start)
+
+        plt.ion()
+        self.fig, self.ax = plt.subplots(figsize=(20, 14))
+        self.view = GraphRenderer(self.G, self.pos, goal, show_costs=show_costs, ax=self.ax,
+                                  labels=True, arrows=True)
+        plt.tight_layout()
+        plt.show(block=False)
+
+    def _show(self, seconds):
+        self.view.draw()
+        # start_event_loop espera sin redibujar todo (plt.pause haría un draw completo)
+        self.fig.canvas.start_event_loop(seconds)
+
+    def on_step(self, step, current, visited, frontier, cost=None):
+        next_nodes, preview = frontier_view(frontier)
+        title = step_title(self.name, step, current, len(visited), self.frontier_label, len(frontier),
+                           preview, cost, self.show_costs)
+        self.view.update(current=current, visited=visited, frontier=next_nodes, title=title)
+        self._show(1.0 if self.show_costs else 0.8)
+
+    def on_goal(self, path, visited, cost):
+        title = goal_title(self.name, self.goal, path, cost, len(visited), self.show_costs)
+        self.view.update(path=path, visited=visited, title=title)
+        self.view.title.set_fontsize(13)
+        self._show(4 if self.show_costs else 3)
+
+class _Tee(SearchObserver):
+    """Reenvía cada evento a varios observadores (p. ej. animación + grabación)"""
+    def __init__(self, *observers):
+        self.observers = [o for o in observers if o is not None]
+
+    def on_step(self, step, current, visited, frontier, cost=None):
+        for o in self.observers:
+            o.on_step(step, current, visited, frontier, cost)
+
+    def on_goal(self, path, visited, cost):
+        for o in self.observers:
+            o.on_goal(path, visited, cost)
+
+class _NamedFrontier:
+    """Frontera vista con nombres: solo se traducen las entradas que se recorren"""
+    def __init__(self, frontier, name):
+        self.frontier = frontier
+        self.name = name
+
+    def __len__(self):
+        return len(self.frontier)
+
+    def __iter__(self):
+        for entry in self.frontier:
+            yield (entry[0], self.name(entry[1])) if isinstance(entry, tuple) else self.name(entry)
+
+class _NamedObserver(SearchObserver):
+    """
+    Traduce los ids de un CSRGraph a nombres antes de pasarlos al observador real.
+    La lista de visitados solo crece: se traducen los nuevos de cada paso y el
+    observador recibe siempre la misma lista de nombres.
+    """
+    def __init__(self, inner, graph):
+        self.inner = inner
+        self.names = graph.names
+        self.visited = []
+
+    def _name(self, node):
+        return self.names[node].item() if self.names is not None else node
+
+    def _named_visited(self, visited):
+        self.visited.extend(self._name(n) for n in visited[len(self.visited):])
+        return self.visited
+
+    def on_step(self, step, current, visited, frontier, cost=None):
+        self.inner.on_step(step, self._name(current), self._named_visited(visited),
+                           _NamedFrontier(frontier, self._name), cost)
+
+    def on_goal(self, path, visited, cost):
+        self.inner.on_goal([self._name(n) for n in path], self._named_visited(visited), cost)
+
+def _run(search, graph, start, goal, observer, trace=None):
+    """
+    Ejecuta la búsqueda; con un CSRGraph traduce nombres <-> ids. trace
+    (search_render.TraceRecorder) graba los pasos para exportarlos después.
+    """
+    if trace is not None:
+        observer = _Tee(observer, trace) if observer is not None else trace
+    if not isinstance(graph, CSRGraph):
+        return search(graph, start, goal, observer=observer)
+    observer = _NamedObserver(observer, graph) if observer is not None else None
+    result = search(graph, graph.id_of(start), graph.id_of(goal), observer=observer)
+    return SearchResult(graph.to_names(result.path), result.cost, graph.to_names(result.visited))
+
+def bfs_with_goal(tree, start, goal, visualize=True, trace=None):
+    """BFS con objetivo, visualización y grabación (trace) opcionales (tree: dict o CSRGraph)"""
+    observer = GraphAnimator("BFS", start, goal, "En cola") if visualize else None
+    result = _run(bfs, tree, start, goal, observer, trace)
+    if visualize:
+        plt.ioff()
+    return result.path, result.visited
+
+def dfs_with_goal(tree, start, goal, visualize=True, trace=None):
+    """DFS con objetivo, visualización y grabación (trace) opcionales (tree: dict o CSRGraph)"""
+    observer = GraphAnimator("DFS", start, goal, "En pila") if visualize else None
+    result = _run(dfs, tree, start, goal, observer, trace)
+    if visualize:
+        plt.ioff()
+    return result.path, result.visited
+
+def ucs_with_goal(tree_with_costs, start, goal, visualize=True, trace=None):
+    """UCS con objetivo, visualización y grabación (trace) opcionales (tree_with_costs: dict o CSRGraph)"""
+    observer = GraphAnimator("UCS", start, goal, "En cola prioridad", show_costs=True) if visualize else None
+    result = _run(ucs, tree_with_costs, start, goal, observer, trace)
+    if visualize:
+        plt.ioff()
+    return result.path, result.visited, result.cost
+
+def astar_with_goal(tree_with_costs, start, goal, heuristic=None, visualize=True):
+    """
+    A* con objetivo y visualización opcional. `heuristic(graph, goal)` construye
+    h(nodo); por defecto min_edge_heuristic (admisible con costos >= 0)
+    """
+    make_h = heuristic or min_edge_heuristic
+    search = lambda g, s, t, observer: astar(g, s, t, heuristic=make_h(g, t), observer=observer)
+    observer = GraphAnimator("A*", start, goal, "En cola prioridad", show_costs=True) if visualize else None
+    result = _run(search, tree_with_costs, start, goal, observer)
+    if visualize:
+        plt.ioff()
+    return result.path, result.visited, result.cost
+
+def bidirectional_bfs_with_goal(tree, start, goal, visualize=True):
+    """BFS bidireccional con objetivo y visualización opcional"""
+    observer = GraphAnimator("BFS bidireccional", start, goal, "Siguiente nivel") if visualize else None
+    result = _run(bidirectional_bfs, tree, start, goal, observer)
+    if visualize:
+        plt.ioff()
+    return result.path, result.visited
+
+def bidirectional_dijkstra_with_goal(tree_with_costs, start, goal, visualize=True):
+    """Dijkstra bidireccional con objetivo y visualización opcional"""
+    observer = GraphAnimator("Dijkstra bidireccional", start, goal, "En cola prioridad",
+                             show_costs=True) if visualize else None
+    result = _run(bidirectional_dijkstra, tree_with_costs, start, goal, observer)
+    if visualize:
+        plt.ioff()
+    return result.path, result.visited, result.cost
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Búsquedas BFS/DFS/UCS/A*/bidireccionales sobre tree_with_costs")
+    ap.add_argument("--headless", action="store_true", help="Sin animación (solo cálculo y reporte)")
+    ap.add_argument("--csr", action="store_true", help="Buscar sobre la representación CSR compacta")
+    ap.add_argument("--export", type=str, default=None,
+                    help="Grabar BFS/DFS/UCS y exportar la animación a este directorio (sin ventana con --headless)")
+    ap.add_argument("--format", choices=["gif", "mp4", "png"], default="gif",
+                    help="Formato de --export: GIF, MP4 (requiere ffmpeg) o secuencia de PNG")
+    ap.add_argument("--fps", type=int, default=2, help="Cuadros por segundo de --export")
+    args = ap.parse_args()
+    visualize = not args.headless
+    traces = {name: TraceRecorder() if args.export else None for name in ("bfs", "dfs", "ucs")}
+
+    tree_graph, cost_graph = tree, tree_with_costs
+    if args.csr:
+        # Ambas vistas (con y sin costos) comparten el mismo CSR
+        tree_graph = cost_graph = CSRGraph.from_adjacency(tree_with_costs)
+
+    print("=" * 60)
+    print("BÚSQUEDA POR AMPLITUD (BFS)")
+    print("=" * 60)
+    bfs_path, bfs_visited = bfs_with_goal(tree_graph, 'S', 'W', visualize=visualize, trace=traces["bfs"])
+
+    print("\n" + "=" * 60)
+    print("BÚSQUEDA POR PROFUNDIDAD (DFS)")
+    print("=" * 60)
+    dfs_path, dfs_visited = dfs_with_goal(tree_graph, 'S', 'W', visualize=visualize, trace=traces["dfs"])
+
+    print("\n" + "=" * 60)
+    print("BÚSQUEDA DE COSTO UNIFORME (UCS)")
+    print("=" * 60)
+    ucs_path, ucs_visited, ucs_cost = ucs_with_goal(cost_graph, 'S', 'W', visualize=visualize,
+                                                    trace=traces["ucs"])
+
+    print("\n" + "=" * 60)
+    print("A* (HEURÍSTICA DE ARISTA MÍNIMA)")
+    print("=" * 60)
+    astar_path, astar_visited, astar_cost = astar_with_goal(cost_graph, 'S', 'W', visualize=visualize)
+
+    print("\n" + "=" * 60)
+    print("BFS BIDIRECCIONAL")
+    print("=" * 60)
+    bibfs_path, bibfs_visited = bidirectional_bfs_with_goal(tree_graph, 'S', 'W', visualize=visualize)
+
+    print("\n" + "=" * 60)
+    print("DIJKSTRA BIDIRECCIONAL")
+    print("=" * 60)
+    bidij_path, bidij_visited, bidij_cost = bidirectional_dijkstra_with_goal(cost_graph, 'S', 'W',
+                                                                             visualize=visualize)
+
+    print("\n" + "=" * 80)
+    print("RESULTADOS COMPARATIVOS - BFS vs DFS vs UCS")
+    print("=" * 80)
+
+    if bfs_path:
+        print(f"BFS  - Camino: {' → '.join(bfs_path)}")
+        print(f"     - Longitud: {len(bfs_path)-1} pasos, Nodos visitados: {len(bfs_visited)}")
     else:
-        print(f"\n🎯 BFS encontró un camino más corto en pasos")
-        print(f"   (Pasos BFS: {len(bfs_path)-1} vs Costo UCS: {ucs_cost})")
-    
-    print(f"\n💡 OBSERVACIONES:")
-    print("- BFS garantiza el camino más corto en número de pasos")
-    print("- UCS garantiza el camino de menor costo acumulado")
-    print("- DFS puede encontrar caminos más largos pero a veces más rápido")
-    print("- UCS considera los costos de las aristas en la búsqueda")
-
-print("\n" + "=" * 80)
-print("COSTOS DEL ÁRBOL")
-print("=" * 80)
-for node, children in tree_with_costs.items():
-    if children:
-        costs_str = ", ".join([f"{child}({cost})" for child, cost in children])
-        print(f"{node} → [{costs_str}]")
\ No newline at end of file
+        print("BFS - No se encontró el camino")
+
+    if dfs_path:
+        print(f"DFS  - Camino: {' → '.join(dfs_path)}")
+        print(f"     - Longitud: {len(dfs_path)-1} pasos, Nodos visitados: {len(dfs_visited)}")
+    else:
+        print("DFS - No se encontró el camino")
+
+    if ucs_path:
+        print(f"UCS  - Camino: {' → '.join(ucs_path)}")
+        print(f"     - Costo total: {ucs_cost}, Longitud: {len(ucs_path)-1} pasos")
+        print(f"     - Nodos visitados: {len(ucs_visited)}")
+    else:
+        print("UCS - No se encontró el camino")
+
+    # COMPARACIÓN DETALLADA
+    print("\n" + "=" * 80)
+    print("ANÁLISIS COMPARATIVO")
+    print("=" * 80)
+
+    if bfs_path and dfs_path and ucs_path:
+        print("✓ Los tres algoritmos encontraron el objetivo 'W'")
+        print(f"\n📊 COMPARACIÓN DE CAMINOS:")
+        print(f"   BFS:  {len(bfs_path)-1} pasos - {' → '.join(bfs_path)}")
+        print(f"   DFS:  {len(dfs_path)-1} pasos - {' → '.join(dfs_path)}")
+        print(f"   UCS:  {ucs_cost} unidades de costo - {' → '.join(ucs_path)}")
+
+        print(f"\n📊 EFICIENCIA EN NODOS VISITADOS:")
+        print(f"   BFS visitó: {len(bfs_visited)} nodos")
+        print(f"   DFS visitó: {len(dfs_visited)} nodos")
+        print(f"   UCS visitó: {len(ucs_visited)} nodos")
+
+        if ucs_cost < len(bfs_path) - 1:  # Comparar costo UCS vs pasos BFS
+            print(f"\n🎯 UCS encontró un camino MÁS ECONÓMICO que BFS")
+            print(f"   (Costo UCS: {ucs_cost} vs Pasos BFS: {len(bfs_path)-1})")
+        elif ucs_cost == len(bfs_path) - 1:
+            print(f"\n🎯 UCS y BFS encontraron caminos igual de eficientes")
+        else:
+            print(f"\n🎯 BFS encontró un camino más corto en pasos")
+            print(f"   (Pasos BFS: {len(bfs_path)-1} vs Costo UCS: {ucs_cost})")
+
+        print(f"\n💡 OBSERVACIONES:")
+        print("- BFS garantiza el camino más corto en número de pasos")
+        print("- UCS garantiza el camino de menor costo acumulado")
+        print("- DFS puede encontrar caminos más largos pero a veces más rápido")
+        print("- UCS considera los costos de las aristas en la búsqueda")
+
+    print("\n" + "=" * 80)
+    print("A* Y BÚSQUEDAS BIDIRECCIONALES - NODOS EXPANDIDOS")
+    print("=" * 80)
+    informed = [
+        ("A*", astar_path, astar_visited, astar_cost, ucs_visited, "UCS"),
+        ("BFS bidir.", bibfs_path, bibfs_visited, len(bibfs_path) - 1 if bibfs_path else None, bfs_visited, "BFS"),
+        ("Dijkstra bidir.", bidij_path, bidij_visited, bidij_cost, ucs_visited, "UCS"),
+    ]
+    for name, path, visited, cost, base_visited, base_name in informed:
+        if not path:
+            print(f"{name} - No se encontró el camino")
+            continue
+        reduction = 100.0 * (1 - len(visited) / len(base_visited)) if base_visited else 0.0
+        print(f"{name:<16} - Camino: {' → '.join(path)} (costo/pasos: {cost})")
+        print(f"{'':<16}   Expandidos: {len(visited)} vs {base_name}: {len(base_visited)} "
+              f"({reduction:.1f}% menos)")
+
+    print("\n" + "=" * 80)
+    print("COSTOS DEL ÁRBOL")
+    print("=" * 80)
+    for node, children in tree_with_costs.items():
+        if children:
+            costs_str = ", ".join([f"{child}({cost})" for child, cost in children])
+            print(f"{node} → [{costs_str}]")
+
+    if args.export:
+        import os
+        os.makedirs(args.export, exist_ok=True)
+        G = create_graph()
+        pos = hierarchy_pos(G, 'S')
+        labels = {"bfs": ("BFS", "En cola", False), "dfs": ("DFS", "En pila", False),
+                  "ucs": ("UCS", "En cola prioridad", True)}
+        for key, trace in traces.items():
+            name, frontier_label, show_costs = labels[key]
+            out = os.path.join(args.export, key if args.format == "png" else f"{key}.{args.format}")
+            render_trace(trace, G, 'W', out, pos=pos, name=name, frontier_label=frontier_label,
+                         show_costs=show_costs, fps=args.fps)
+            print(f"[OK] Animación {name}: {out} ({len(trace.steps)} pasos)")
@@ -2,10 +2,36 @@ import matplotlib.pyplot as plt
 import numpy as np
 from collections import deque
 
+from grid_engine import bfs_grid, load_maze, search_grid
+from packed_maze import PackedMaze, bfs_packed
+
 def invert_maze(maze):
+    """Copia con 0 y 1 intercambiados. solve_maze/plot_maze ya no la necesitan (ver passable/invert)."""
     return [[1 if cell == 0 else 0 for cell in row] for row in maze]
 
-def solve_maze(maze, start, goal):
+def solve_maze(maze, start, goal, engine="python", passable=1, algorithm="bfs",
+               diagonal=False, costs=None):
+    """
+    BFS en el laberinto. passable = valor de celda transitable: 1 para el
+    laberinto invertido, 0 para leer el original directamente sin copiarlo.
+    engine: 'python' (listas y dict de tuplas), o el motor NumPy de grid_engine:
+    'queue' (cola int32) o 'frontier' (un nivel de BFS por operación vectorizada).
+    Los tres devuelven el mismo camino. El motor NumPy acepta arreglos y
+    np.memmap (ver load_maze) sin materializarlos como objetos de Python.
+    Un PackedMaze (1 bit por celda) siempre se resuelve con bfs_packed.
+    algorithm: 'astar' (costos por celda opcionales) o 'jps' (Jump Point
+    Search) usan grid_engine.search_grid; diagonal=True permite 8 vecinos.
+    """
+    if isinstance(maze, PackedMaze):
+        if algorithm != "bfs" or diagonal or costs is not None:
+            raise ValueError("un PackedMaze solo se resuelve con BFS 4-conexo")
+        return bfs_packed(maze, start, goal, passable=passable).path
+    if algorithm != "bfs" or diagonal or costs is not None:
+        return search_grid(maze, start, goal, algorithm, passable=passable, diagonal=diagonal,
+                           costs=costs).path
+    if engine != "python":
+        return bfs_grid(maze, start, goal, method=engine, passable=passable).path
+
     rows, cols = len(maze), len(maze[0])
     directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
     
@@ -24,16 +50,30 @@ def solve_maze(maze, start, goal):
         
         for dr, dc in directions:
             r, c = current[0] + dr, current[1] + dc
-            if 0 <= r < rows and 0 <= c < cols and maze[r][c] == 1 and (r, c) not in visited:
+            if 0 <= r < rows and 0 <= c < cols and maze[r][c] == passable and (r, c) not in visited:
                 queue.append((r, c))
                 visited[(r, c)] = current
     
     return None
 
-def plot_maze(maze, path, title, start, goal):
-    maze_array = np.array(maze)
+def plot_maze(maze, path, title, start, goal, invert=False):
+    """
+    Dibuja el laberinto (1 = negro). invert=True lo muestra invertido
+    cambiando solo el mapa de colores, sin copiar la grilla.
+    Un PackedMaze se submuestrea al vuelo (solo se desempaquetan las filas
+    dibujadas); el camino y los marcadores quedan en coordenadas originales.
+    """
+    if isinstance(maze, PackedMaze):
+        maze_array, step = maze.downsample()
+    else:
+        maze_array, step = np.asarray(maze), 1
+    # Cada píxel es la celda muestreada i * step y cubre las celdas i * step ..
+    # i * step + step - 1: el alto/ancho dibujado es ceil(n / step) * step
+    # (mayor que n si n no es múltiplo de step).
+    rows, cols = (n * step for n in maze_array.shape)
     plt.figure(figsize=(12, 6))
-    plt.imshow(maze_array, cmap='binary', interpolation='nearest')
+    plt.imshow(maze_array, cmap='binary_r' if invert else 'binary', interpolation='nearest',
+               extent=(-0.5, cols - 0.5, rows - 0.5, -0.5))
     
     if path:
         path_y, path_x = zip(*path)
@@ -48,39 +88,65 @@ def plot_maze(maze, path, title, start, goal):
     plt.grid(False)
     plt.show()
 
-start = (12, 0)
-goal = (0, 29)
-maze = [
- [0,0,0,0,0,0,0,0,0,0,1,1,1,1,1,1,1,1,1,1,0,0,0,0,0,0,0,0,0,0],
- [0,0,0,0,0,0,0,0,0,0,1,1,1,1,1,1,1,1,1,1,0,0,1,1,1,0,0,0,0,0],
- [0,0,0,1,1,1,1,1,0,0,0,0,0,0,0,0,0,0,1,1,0,0,1,1,1,0,0,0,0,0],
- [0,0,0,1,1,1,1,1,0,0,1,1,0,0,0,0,0,0,1,1,0,0,1,1,1,0,0,0,0,0],
- [0,0,0,0,0,0,1,1,0,0,1,1,1,1,0,0,0,0,1,1,0,0,0,0,0,1,1,0,0,0],
- [0,0,0,0,0,0,1,1,0,0,0,0,1,1,0,0,1,1,1,1,0,0,0,0,0,1,1,0,0,0],
- [0,0,0,0,0,0,1,1,0,0,0,0,0,0,0,0,1,1,1,1,0,0,1,1,0,0,0,0,0,0],
- [0,0,0,1,1,1,1,1,1,1,1,1,1,0,0,0,0,0,0,1,0,0,1,1,0,0,0,0,0,0],
- [0,0,0,1,1,1,1,1,1,1,1,1,1,0,0,0,0,0,0,1,0,0,1,1,1,1,1,1,1,1],
- [0,0,0,0,0,0,1,1,0,0,0,1,1,0,0,1,1,1,1,1,0,0,1,1,1,1,1,1,1,1],
- [0,0,0,0,0,0,1,1,0,0,0,1,1,0,0,1,1,1,1,1,0,0,1,0,0,0,0,0,0,0],
- [0,0,0,0,0,0,1,1,0,0,0,1,1,0,0,0,0,0,0,0,0,1,1,0,0,0,0,0,0,0],
- [0,0,0,0,0,0,1,1,0,0,0,1,1,0,0,1,1,0,0,0,0,1,1,0,0,0,0,0,0,0],
- [0,0,0,0,0,0,0,0,0,0,0,1,1,0,0,1,1,0,0,0,0,0,0,0,0,0,0,0,0,0]
-]
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Resolución de laberinto con BFS")
+    ap.add_argument("--engine", choices=["python", "queue", "frontier"], default="python",
+                    help="Implementación de BFS (python o motor NumPy)")
+    ap.add_argument("--maze", type=str, default=None,
+                    help="Laberinto en disco (.npy o empaquetado .pmaze, se abre con mmap; "
+                         "0=camino, 1=obstáculo)")
+    ap.add_argument("--algorithm", choices=["bfs", "astar", "jps"], default="bfs",
+                    help="bfs, A* (heurística manhattan/octile) o Jump Point Search")
+    ap.add_argument("--diagonal", action="store_true",
+                    help="Permitir movimientos diagonales (8 vecinos, sin cortar esquinas)")
+    ap.add_argument("--start", type=int, nargs=2, default=(12, 0), help="Inicio: fila col")
+    ap.add_argument("--goal", type=int, nargs=2, default=(0, 29), help="Meta: fila col")
+    args = ap.parse_args()
+
+    start = tuple(args.start)
+    goal = tuple(args.goal)
+    maze = [
+     [0,0,0,0,0,0,0,0,0,0,1,1,1,1,1,1,1,1,1,1,0,0,0,0,0,0,0,0,0,0],
+     [0,0,0,0,0,0,0,0,0,0,1,1,1,1,1,1,1,1,1,1,0,0,1,1,1,0,0,0,0,0],
+     [0,0,0,1,1,1,1,1,0,0,0,0,0,0,0,0,0,0,1,1,0,0,1,1,1,0,0,0,0,0],
+     [0,0,0,1,1,1,1,1,0,0,1,1,0,0,0,0,0,0,1,1,0,0,1,1,1,0,0,0,0,0],
+     [0,0,0,0,0,0,1,1,0,0,1,1,1,1,0,0,0,0,1,1,0,0,0,0,0,1,1,0,0,0],
+     [0,0,0,0,0,0,1,1,0,0,0,0,1,1,0,0,1,1,1,1,0,0,0,0,0,1,1,0,0,0],
+     [0,0,0,0,0,0,1,1,0,0,0,0,0,0,0,0,1,1,1,1,0,0,1,1,0,0,0,0,0,0],
+     [0,0,0,1,1,1,1,1,1,1,1,1,1,0,0,0,0,0,0,1,0,0,1,1,0,0,0,0,0,0],
+     [0,0,0,1,1,1,1,1,1,1,1,1,1,0,0,0,0,0,0,1,0,0,1,1,1,1,1,1,1,1],
+     [0,0,0,0,0,0,1,1,0,0,0,1,1,0,0,1,1,1,1,1,0,0,1,1,1,1,1,1,1,1],
+     [0,0,0,0,0,0,1,1,0,0,0,1,1,0,0,1,1,1,1,1,0,0,1,0,0,0,0,0,0,0],
+     [0,0,0,0,0,0,1,1,0,0,0,1,1,0,0,0,0,0,0,0,0,1,1,0,0,0,0,0,0,0],
+     [0,0,0,0,0,0,1,1,0,0,0,1,1,0,0,1,1,0,0,0,0,1,1,0,0,0,0,0,0,0],
+     [0,0,0,0,0,0,0,0,0,0,0,1,1,0,0,1,1,0,0,0,0,0,0,0,0,0,0,0,0,0]
+    ]
 
-inverted_maze = invert_maze(maze)
+    if args.maze:
+        maze = PackedMaze.load(args.maze) if args.maze.endswith(".pmaze") else load_maze(args.maze)
 
-path = solve_maze(inverted_maze, start, goal)
+    # passable=0: se resuelve sobre el laberinto original, sin invert_maze
+    path = solve_maze(maze, start, goal, engine=args.engine, passable=0,
+                      algorithm=args.algorithm, diagonal=args.diagonal)
 
-print("Laberinto Original (0=camino, 1=obstáculo)")
-plot_maze(maze, None, "Laberinto Original", start, goal)
+    if not isinstance(maze, PackedMaze):
+        print("Celdas expandidas por algoritmo:")
+        for name in ("bfs", "astar", "jps"):
+            res = search_grid(maze, start, goal, name, passable=0,
+                              diagonal=args.diagonal and name != "bfs")
+            print(f"  {name:<6} expandidos={res.expanded:<8} costo={res.cost}")
 
-print("Laberinto Invertido (1=camino, 0=obstáculo)")
-plot_maze(inverted_maze, None, "Laberinto Invertido", start, goal)
+    print("Laberinto Original (0=camino, 1=obstáculo)")
+    plot_maze(maze, None, "Laberinto Original", start, goal)
 
-if path:
-    print(f"Se encontró un camino de {len(path)} pasos")
-    print("Camino encontrado:", path[:5], "...", path[-5:])
-    print("\nLaberinto Invertido con Camino")
-    plot_maze(inverted_maze, path, "Laberinto Invertido con Camino", start, goal)
-else:
-    print("No se encontró un camino válido")
\ No newline at end of file
+    print("Laberinto Invertido (1=camino, 0=obstáculo)")
+    plot_maze(maze, None, "Laberinto Invertido", start, goal, invert=True)
+
+    if path:
+        print(f"Se encontró un camino de {len(path)} pasos")
+        print("Camino encontrado:", path[:5], "...", path[-5:])
+        print("\nLaberinto Invertido con Camino")
+        plot_maze(maze, path, "Laberinto Invertido con Camino", start, goal, invert=True)
+    else:
+        print("No se encontró un camino válido")
@@ -0,0 +1,117 @@
+# generators.py
+"""
+Generadores sintéticos y escalables para los benchmarks (deterministas por semilla):
+- Grafos en el formato de Taller_Punto_1 ({nodo: [(hijo, costo), ...]}):
+  árboles aleatorios y DAGs.
+- Laberintos como Taller_Punto_3 (uint8, 0 = camino, 1 = obstáculo):
+  perfectos (un único camino entre dos celdas) y abiertos (obstáculos al azar).
+- Libros Excel de sensores como BD_SENSORES.xlsx: varias hojas con
+  'Usuario' + canales 1..N, parte de ellos como texto con unidades ('0.55 V',
+  '1,23 mV') y algunos vacíos y picos.
+"""
+import numpy as np
+
+
+def random_tree(n: int, max_cost: int = 5, seed: int = 0) -> dict:
+    """Árbol de n nodos ('N0' es la raíz): el padre de cada nodo es uno anterior al azar."""
+    rng = np.random.default_rng(seed)
+    parents = [int(rng.integers(0, i)) for i in range(1, n)]
+    costs = rng.integers(1, max_cost + 1, size=n - 1)
+    tree = {f"N{i}": [] for i in range(n)}
+    for child, (parent, cost) in enumerate(zip(parents, costs), start=1):
+        tree[f"N{parent}"].append((f"N{child}", int(cost)))
+    return tree
+
+
+def random_dag(n: int, out_degree: int = 3, window: int = 50, max_cost: int = 5, seed: int = 0) -> dict:
+    """
+    DAG de n nodos: cada nodo apunta a hasta out_degree nodos posteriores dentro
+    de una ventana (así hay caminos largos y nodos con varios padres).
+    """
+    rng = np.random.default_rng(seed)
+    dag = {}
+    for i in range(n):
+        hi = min(n, i + 1 + window)
+        k = min(out_degree, hi - i - 1)
+        targets = rng.choice(np.arange(i + 1, hi), size=k, replace=False) if k else []
+        dag[f"N{i}"] = [(f"N{j}", int(c)) for j, c in zip(sorted(targets), rng.integers(1, max_cost + 1, size=k))]
+    return dag
+
+
+def unweighted(graph: dict) -> dict:
+    """Misma estructura sin costos (como `tree` en Taller_Punto_1)."""
+    return {node: [child for child, _ in children] for node, children in graph.items()}
+
+
+def perfect_maze(rows: int, cols: int, seed: int = 0) -> np.ndarray:
+    """
+    Laberinto perfecto por backtracking iterativo: las celdas en posiciones
+    pares son pasillos y entre dos hay un muro que se abre al conectarlas.
+    (0, 0) y (rows-1, cols-1) quedan conectadas si ambas dimensiones son impares.
+    """
+    rng = np.random.default_rng(seed)
+    grid = np.ones((rows, cols), dtype=np.uint8)
+    grid[0, 0] = 0
+    stack = [(0, 0)]
+    steps = ((0, 2), (2, 0), (0, -2), (-2, 0))
+    while stack:
+        r, c = stack[-1]
+        options = [(r + dr, c + dc) for dr, dc in steps
+                   if 0 <= r + dr < rows and 0 <= c + dc < cols and grid[r + dr, c + dc]]
+        if not options:
+            stack.pop()
+            continue
+        nr, nc = options[int(rng.integers(len(options)))]
+        grid[(r + nr) // 2, (c + nc) // 2] = 0
+        grid[nr, nc] = 0
+        stack.append((nr, nc))
+    return grid
+
+
+def open_maze(rows: int, cols: int, density: float = 0.25, seed: int = 0) -> np.ndarray:
+    """Obstáculos independientes con probabilidad `density`; esquinas libres."""
+    rng = np.random.default_rng(seed)
+    grid = (rng.random((rows, cols)) < density).astype(np.uint8)
+    grid[0, 0] = grid[-1, -1] = 0
+    return grid
+
+
+def write_sensor_workbook(path: str, sheets: int = 4, channels: int = 16, samples: int = 1000,
+                          unit_frac: float = 0.3, null_frac: float = 0.01, spike_frac: float = 0.002,
+                          seed: int = 0) -> str:
+    """
+    Escribe un .xlsx con `sheets` hojas de `samples` filas × ('Usuario' + `channels`).
+    Cada canal es una senoidal con ruido; una fracción `unit_frac` de canales se
+    guarda como texto con unidad (coma decimal en la mitad de ellos), con
+    celdas vacías (`null_frac`) y picos (`spike_frac`) para el filtro z.
+    """
+    from openpyxl import Workbook  # solo hace falta para generar libros
+
+    rng = np.random.default_rng(seed)
+    wb = Workbook(write_only=True)
+    t = np.arange(samples)
+    for s in range(sheets):
+        ws = wb.create_sheet(f"SEN_{s + 1}")
+        ws.append(["Usuario"] + list(range(1, channels + 1)))
+        freq = rng.uniform(0.001, 0.05, size=channels)
+        amp = rng.uniform(0.1, 5000.0, size=channels)
+        values = amp * (1 + 0.5 * np.sin(np.outer(t, freq) * 2 * np.pi)) + rng.normal(0, 0.05, (samples, channels)) * amp
+        spikes = rng.random((samples, channels)) < spike_frac
+        values[spikes] *= 20
+        values = np.round(values, 2)
+        holes = rng.random((samples, channels)) < null_frac
+        unit_cols = rng.random(channels) < unit_frac
+        comma = rng.random(channels) < 0.5
+        for i in range(samples):
+            row = [None]
+            for j in range(channels):
+                if holes[i, j]:
+                    row.append(None)
+                elif unit_cols[j]:
+                    txt = f"{values[i, j]:.2f}"
+                    row.append((txt.replace(".", ",") + " mV") if comma[j] else (txt + " V"))
+                else:
+                    row.append(float(values[i, j]))
+            ws.append(row)
+    wb.save(path)
+    return path
@@ -0,0 +1,267 @@
+# run_benchmarks.py
+"""
+Benchmarks de las búsquedas en grafos, del solucionador de laberintos y de
+cada etapa del ETL, sobre entradas sintéticas de varios tamaños (generators.py).
+
+Cada caso corre en un proceso nuevo (spawn), así el pico de memoria de uno no
+contamina al siguiente. Por caso se guarda:
+- tiempos de `--repeat` corridas (min y mediana),
+- pico de memoria de Python (tracemalloc, en una corrida extra aparte),
+- pico de RSS del proceso (ru_maxrss; incluye memoria nativa de NumPy/Polars)
+  y cuánto creció respecto a después de generar la entrada.
+
+Uso:
+    python benchmarks/run_benchmarks.py --sizes small medium --out benchmarks/results.json
+    python benchmarks/run_benchmarks.py --suite etl --baseline benchmarks/results.json
+
+Con --baseline se compara contra un JSON anterior y se marcan los casos más
+lentos que `--tolerance` (regresiones); el código de salida es 1 si hay alguna.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import json
+import multiprocessing as mp
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path[:0] = [HERE, ROOT, os.path.join(ROOT, "Punto2_Taller")]
+
+# Tamaños por suite: nodos del grafo, lado del laberinto (impar para el
+# laberinto perfecto) y (hojas, canales, muestras) del libro de sensores.
+SIZES = {
+    "small": {"graph": 1_000, "maze": 63, "etl": (2, 8, 500)},
+    "medium": {"graph": 20_000, "maze": 255, "etl": (4, 16, 5_000)},
+    "large": {"graph": 200_000, "maze": 1023, "etl": (8, 32, 20_000)},
+}
+
+
+def _rss_mb() -> float:
+    # ru_maxrss está en KiB en Linux y en bytes en macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 2**20 if sys.platform == "darwin" else rss / 2**10
+
+
+def _measure(fn, repeat: int) -> dict:
+    """Tiempos de `repeat` llamadas a fn() y picos de memoria."""
+    rss_before = _rss_mb()
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    _, peak_py = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss = _rss_mb()
+    return {
+        "times_s": times,
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "peak_py_mb": peak_py / 2**20,
+        "peak_rss_mb": rss,
+        "rss_growth_mb": rss - rss_before,
+    }
+
+
+# --- Casos: cada uno arma su entrada y devuelve {nombre: función sin argumentos} ---
+
+def _graph_cases(kind: str, n: int, seed: int) -> dict:
+    from generators import random_dag, random_tree, unweighted
+    from Taller_Punto_1 import bfs_with_goal, dfs_with_goal, ucs_with_goal
+
+    weighted = random_tree(n, seed=seed) if kind == "tree" else random_dag(n, seed=seed)
+    plain = unweighted(weighted)
+    goal = f"N{n - 1}"
+    return {
+        "bfs_with_goal": lambda: bfs_with_goal(plain, "N0", goal, visualize=False),
+        "dfs_with_goal": lambda: dfs_with_goal(plain, "N0", goal, visualize=False),
+        "ucs_with_goal": lambda: ucs_with_goal(weighted, "N0", goal, visualize=False),
+    }
+
+
+def _maze_cases(kind: str, side: int, seed: int) -> dict:
+    from generators import open_maze, perfect_maze
+    from Taller_Punto_3 import solve_maze
+
+    grid = perfect_maze(side, side, seed=seed) if kind == "perfect" else open_maze(side, side, seed=seed)
+    as_lists = grid.tolist()
+    start, goal = (0, 0), (side - 1, side - 1)
+    return {
+        "solve_maze[python]": lambda: solve_maze(as_lists, start, goal, engine="python", passable=0),
+        "solve_maze[queue]": lambda: solve_maze(grid, start, goal, engine="queue", passable=0),
+        "solve_maze[frontier]": lambda: solve_maze(grid, start, goal, engine="frontier", passable=0),
+        "solve_maze[astar]": lambda: solve_maze(grid, start, goal, passable=0, algorithm="astar"),
+        "solve_maze[jps]": lambda: solve_maze(grid, start, goal, passable=0, algorithm="jps"),
+    }
+
+
+def _etl_cases(path: str) -> dict:
+    from etl_polars import (_coerce_numeric_columns, _excel_to_polars, clean_long, melt_wide,
+                            run_etl_excel, with_time)
+
+    # Entradas ya materializadas de cada etapa, para medirlas por separado
+    wide = _excel_to_polars(path)
+    coerced = _coerce_numeric_columns(wide)
+    long = melt_wide(coerced)
+    cleaned = clean_long(long)
+    return {
+        "etl[read]": lambda: _excel_to_polars(path),
+        "etl[coerce]": lambda: _coerce_numeric_columns(wide),
+        "etl[melt]": lambda: melt_wide(coerced),
+        "etl[clean]": lambda: clean_long(long),
+        "etl[time]": lambda: with_time(cleaned, 1.0),
+        "run_etl_excel": lambda: run_etl_excel(path),
+        "run_etl_excel[wide]": lambda: run_etl_excel(path, layout="wide"),
+    }
+
+
+def _run_case(spec: dict) -> dict:
+    """Corre en un proceso hijo: arma la entrada y mide una sola función."""
+    t0 = time.perf_counter()
+    if spec["suite"] == "graph":
+        cases = _graph_cases(spec["input"], spec["size"], spec["seed"])
+    elif spec["suite"] == "maze":
+        cases = _maze_cases(spec["input"], spec["size"], spec["seed"])
+    else:
+        cases = _etl_cases(spec["path"])
+    setup_s = time.perf_counter() - t0
+    return {**{k: v for k, v in spec.items() if k != "path"}, "setup_s": setup_s,
+            **_measure(cases[spec["case"]], spec["repeat"])}
+
+
+def _case_names(suite: str) -> list:
+    if suite == "graph":
+        return ["bfs_with_goal", "dfs_with_goal", "ucs_with_goal"]
+    if suite == "maze":
+        return ["solve_maze[python]", "solve_maze[queue]", "solve_maze[frontier]",
+                "solve_maze[astar]", "solve_maze[jps]"]
+    return ["etl[read]", "etl[coerce]", "etl[melt]", "etl[clean]", "etl[time]", "run_etl_excel",
+            "run_etl_excel[wide]"]
+
+
+def build_specs(suites, sizes, repeat: int, seed: int, workdir: str) -> list:
+    """Lista de casos a correr; genera los libros Excel una vez por tamaño."""
+    from generators import write_sensor_workbook
+
+    specs = []
+    for size in sizes:
+        for suite in suites:
+            value = SIZES[size][suite]
+            base = {"suite": suite, "size_name": size, "repeat": repeat, "seed": seed}
+            if suite == "etl":
+                sheets, channels, samples = value
+                path = os.path.join(workdir, f"sensores_{size}.xlsx")
+                if not os.path.exists(path):
+                    write_sensor_workbook(path, sheets, channels, samples, seed=seed)
+                inputs = [("workbook", {"size": {"sheets": sheets, "channels": channels, "samples": samples},
+                                        "path": path})]
+            else:
+                kinds = ("tree", "dag") if suite == "graph" else ("perfect", "open")
+                inputs = [(kind, {"size": value}) for kind in kinds]
+            for kind, extra in inputs:
+                for case in _case_names(suite):
+                    specs.append({**base, "input": kind, "case": case, **extra})
+    return specs
+
+
+def run(specs, isolate: bool = True) -> list:
+    """Corre cada caso en un proceso nuevo (isolate=True) o en este mismo."""
+    if not isolate:
+        return [_run_case(spec) for spec in specs]
+    results = []
+    for spec in specs:
+        # max_tasks_per_child=1: un intérprete limpio por caso (RSS independiente)
+        with ProcessPoolExecutor(1, mp_context=mp.get_context("spawn"), max_tasks_per_child=1) as pool:
+            results.append(pool.submit(_run_case, spec).result())
+    return results
+
+
+def _metadata() -> dict:
+    import numpy as np
+    import polars as pl
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "polars": pl.__version__,
+    }
+
+
+def _key(r: dict) -> tuple:
+    return r["suite"], r["size_name"], r["input"], r["case"]
+
+
+def compare(results: list, baseline: dict, tolerance: float) -> list:
+    """Casos cuya mediana supera la del baseline en más de `tolerance` (fracción)."""
+    old = {_key(r): r for r in baseline["results"]}
+    slower = []
+    for r in results:
+        prev = old.get(_key(r))
+        if prev and r["median_s"] > prev["median_s"] * (1 + tolerance):
+            slower.append((r, r["median_s"] / prev["median_s"]))
+    return slower
+
+
+def _report(results: list):
+    print(f"{'suite':<6} {'tamaño':<7} {'entrada':<9} {'caso':<26} {'mediana':>10} {'py MB':>8} {'RSS MB':>8}")
+    for r in results:
+        print(f"{r['suite']:<6} {r['size_name']:<7} {r['input']:<9} {r['case']:<26} "
+              f"{r['median_s'] * 1e3:>8.2f}ms {r['peak_py_mb']:>8.1f} {r['peak_rss_mb']:>8.1f}")
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Benchmarks de búsquedas, laberintos y ETL")
+    ap.add_argument("--suite", nargs="+", choices=["graph", "maze", "etl"], default=["graph", "maze", "etl"])
+    ap.add_argument("--sizes", nargs="+", choices=list(SIZES), default=["small", "medium"])
+    ap.add_argument("--repeat", type=int, default=5, help="Corridas medidas por caso")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workdir", default=None,
+                    help="Dónde guardar los libros Excel generados (por defecto un directorio temporal)")
+    ap.add_argument("--no-isolate", action="store_true",
+                    help="Correr todo en este proceso (más rápido; el RSS pasa a ser acumulado)")
+    ap.add_argument("--out", default=os.path.join(HERE, "results.json"), help="JSON de salida")
+    ap.add_argument("--baseline", default=None, help="JSON anterior contra el cual comparar")
+    ap.add_argument("--tolerance", type=float, default=0.2,
+                    help="Fracción de enlentecimiento que cuenta como regresión")
+    args = ap.parse_args()
+
+    baseline = None
+    if args.baseline:  # se lee antes: --out puede ser el mismo archivo
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = args.workdir or tmp
+        os.makedirs(workdir, exist_ok=True)
+        specs = build_specs(args.suite, args.sizes, args.repeat, args.seed, workdir)
+        results = run(specs, isolate=not args.no_isolate)
+
+    _report(results)
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as fh:
+        json.dump({"meta": _metadata(), "sizes": SIZES, "results": results}, fh, indent=2)
+    print(f"[OK] Resultados: {args.out}")
+
+    if baseline is not None:
+        slower = compare(results, baseline, args.tolerance)
+        for r, ratio in slower:
+            print(f"[REGRESIÓN] {r['suite']}/{r['size_name']}/{r['input']}/{r['case']}: {ratio:.2f}x más lento")
+        sys.exit(1 if slower else 0)
@@ -0,0 +1,160 @@
+# graph_csr.py
+"""
+Grafo dirigido compacto en formato CSR (Compressed Sparse Row) con NumPy.
+
+- Los nombres de nodo se internan a enteros 0..n-1 (orden lexicográfico,
+  así los desempates por id coinciden con los desempates por nombre).
+- Adyacencia en tres arreglos: offsets (n+1), targets (m) y weights (m).
+  El orden de los hijos de cada nodo se conserva tal cual en la entrada.
+- Las búsquedas de search_core (bfs, dfs, ucs) corren directamente sobre
+  esta estructura usando ids enteros; `id_of` / `to_names` traducen.
+"""
+import numpy as np
+
+
+class CSRGraph:
+    """Grafo dirigido con pesos en arreglos CSR (unos pocos bytes por nodo/arista)."""
+
+    def __init__(self, offsets, targets, weights, names=None):
+        self.offsets = np.ascontiguousarray(offsets, dtype=np.int64)
+        self.targets = np.ascontiguousarray(targets, dtype=np.int32)
+        self.weights = np.ascontiguousarray(weights)
+        self.names = names  # None => los ids son los nombres
+        # memoryviews: indexar/rebanar devuelve ints de Python sin pasar por escalares NumPy
+        self._off = memoryview(self.offsets)
+        self._tgt = memoryview(self.targets)
+        self._w = memoryview(self.weights)
+        self._reverse = None
+
+    # --- construcción ---
+
+    @classmethod
+    def from_edges(cls, src, dst, weights=None, num_nodes=None, names=None):
+        """Construye desde arreglos de aristas (ids enteros); ordenamiento estable por origen."""
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int32)
+        if weights is None:
+            weights = np.ones(len(src), dtype=np.int32)
+        weights = _compact_weights(np.asarray(weights))
+        n = int(num_nodes if num_nodes is not None else
+                (max(src.max(initial=-1), dst.max(initial=-1)) + 1))
+        order = np.argsort(src, kind="stable")
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=offsets[1:])
+        return cls(offsets, dst[order], weights[order], names=names)
+
+    @classmethod
+    def from_adjacency(cls, adjacency):
+        """
+        Desde un dict estilo tree_with_costs {nodo: [(hijo, costo), ...]}
+        o estilo tree {nodo: [hijo, ...]} (costo 1).
+        """
+        src_names, dst_names, costs = [], [], []
+        for parent, children in adjacency.items():
+            for child in children:
+                if isinstance(child, tuple):
+                    child, cost = child
+                else:
+                    cost = 1
+                src_names.append(parent)
+                dst_names.append(child)
+                costs.append(cost)
+        all_names = np.array(list(adjacency.keys()) + dst_names)
+        names, inverse = np.unique(all_names, return_inverse=True)
+        k = len(adjacency)
+        dst = inverse[k:]
+        src = np.searchsorted(names, np.array(src_names)) if src_names else np.empty(0, np.int64)
+        return cls.from_edges(src, dst, np.array(costs), num_nodes=len(names), names=names)
+
+    @classmethod
+    def from_edge_list(cls, path, weighted=True, integer_ids=True):
+        """
+        Carga un archivo de aristas 'origen destino [costo]' separado por espacios.
+        Con integer_ids=True el parseo es íntegramente en C (np.loadtxt);
+        si los nodos son nombres, se internan con np.unique.
+        """
+        ncols = 3 if weighted else 2
+        if integer_ids:
+            data = np.loadtxt(path, dtype=np.float64, comments="#", usecols=range(ncols), ndmin=2)
+            weights = data[:, 2] if weighted else None
+            return cls.from_edges(data[:, 0].astype(np.int64), data[:, 1].astype(np.int32), weights)
+
+        with open(path, encoding="utf-8") as fh:
+            rows = [line.split() for line in fh if line.strip() and not line.startswith("#")]
+        labels = np.array([r[0] for r in rows] + [r[1] for r in rows])
+        names, inverse = np.unique(labels, return_inverse=True)
+        m = len(rows)
+        weights = np.array([float(r[2]) for r in rows]) if weighted else None
+        return cls.from_edges(inverse[:m], inverse[m:], weights, num_nodes=len(names), names=names)
+
+    # --- acceso (protocolo usado por search_core) ---
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    def successors(self, i):
+        """Hijos del nodo i (lista de ids)."""
+        off = self._off
+        return self._tgt[off[i]:off[i + 1]].tolist()
+
+    def edges(self, i):
+        """Aristas salientes del nodo i: [(hijo, costo), ...]."""
+        off = self._off
+        lo, hi = off[i], off[i + 1]
+        return list(zip(self._tgt[lo:hi].tolist(), self._w[lo:hi].tolist()))
+
+    def reverse(self) -> "CSRGraph":
+        """Grafo con las aristas invertidas (se construye una vez y queda cacheado)."""
+        if self._reverse is None:
+            src = np.repeat(np.arange(self.num_nodes, dtype=np.int64), np.diff(self.offsets))
+            self._reverse = CSRGraph.from_edges(self.targets, src, self.weights,
+                                                num_nodes=self.num_nodes, names=self.names)
+            self._reverse._reverse = self
+        return self._reverse
+
+    # --- nombres ---
+
+    def id_of(self, name) -> int:
+        """Id entero de un nodo por nombre (búsqueda binaria, sin dict por nodo)."""
+        if self.names is None:
+            return int(name)
+        i = int(np.searchsorted(self.names, name))
+        if i >= len(self.names) or self.names[i] != name:
+            raise KeyError(name)
+        return i
+
+    def to_names(self, ids):
+        """Traduce una secuencia de ids a los nombres originales (p. ej., un camino)."""
+        if ids is None:
+            return None
+        if self.names is None:
+            return list(ids)
+        # tolist() devuelve objetos de Python del tipo de las claves (str, int, ...)
+        return self.names[np.asarray(ids, dtype=np.intp)].tolist()
+
+    def nbytes(self) -> int:
+        """Memoria de los arreglos (sin contar nombres)."""
+        return self.offsets.nbytes + self.targets.nbytes + self.weights.nbytes
+
+
+def _compact_weights(weights):
+    """
+    Usa int32 solo si todos los costos son enteros exactos que caben; si no,
+    conserva la precisión (int64 o float64). Con float32, 0.1 y 0.2 ya no
+    suman 0.3 y cambian los costos y los desempates respecto del dict.
+    """
+    if weights.size == 0:
+        return weights.astype(np.int32)
+    integer = np.issubdtype(weights.dtype, np.integer)
+    if integer or np.all(np.mod(weights, 1) == 0):
+        if np.abs(weights).max() < 2**31:
+            return weights.astype(np.int32)
+    return weights.astype(np.int64 if integer else np.float64)
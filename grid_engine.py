@@ -0,0 +1,544 @@
+# grid_engine.py
+"""
+Motor de búsqueda en laberintos sobre arreglos NumPy.
+
+- La grilla es un arreglo contiguo uint8 (1 byte por celda); las celdas se
+  identifican con un índice plano int32 (fila * cols + col).
+- Predecesores en un arreglo int32 (-1 = sin visitar), sin dicts de tuplas.
+- BFS en dos variantes con el MISMO resultado que solve_maze:
+    * "queue": cola FIFO en un arreglo int32 preasignado.
+    * "frontier": expande un nivel completo de BFS con operaciones vectorizadas.
+- Campo de distancias completo (bfs_field) y caché LRU (FieldCache) para
+  muchas consultas de objetivo desde el mismo inicio.
+- A* con costos por celda y Jump Point Search, con conectividad 4 u 8, bajo
+  un mismo punto de entrada (search_grid).
+"""
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import heapq
+
+import numpy as np
+
+# Mismo orden que solve_maze: derecha, abajo, izquierda, arriba
+DIRECTIONS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+
+
+@dataclass
+class GridResult:
+    """Resultado de una búsqueda en grilla: camino (lista de (fila, col)), costo y celdas expandidas."""
+    path: list | None
+    cost: float
+    expanded: int
+
+    @property
+    def found(self) -> bool:
+        return self.path is not None
+
+
+def as_grid(maze) -> np.ndarray:
+    """
+    Vista uint8 contigua 2-D del laberinto. Si ya es un arreglo uint8/bool
+    contiguo (incluido un np.memmap) NO se copia: se lee el buffer original.
+    Las listas de listas sí se convierten (1 byte por celda).
+    """
+    if isinstance(maze, np.ndarray) and maze.dtype == np.bool_ and maze.flags.c_contiguous:
+        grid = maze.view(np.uint8)
+    else:
+        grid = np.ascontiguousarray(maze, dtype=np.uint8)
+    if grid.ndim != 2:
+        raise ValueError("el laberinto debe ser 2-D")
+    return grid
+
+
+def _path_from_pred(pred, goal_idx, cols):
+    """Reconstruye el camino inicio -> objetivo desde el arreglo de predecesores."""
+    path = []
+    i = int(goal_idx)
+    while i >= 0:
+        path.append(divmod(i, cols))
+        i = int(pred[i])
+    path.reverse()
+    return path
+
+
+def bfs_queue(grid, start, goal, passable=1) -> GridResult:
+    """
+    BFS con cola en arreglo int32 (celdas == passable son transitables).
+    Réplica exacta de solve_maze.
+    Los arreglos se recorren vía memoryview/bytearray para evitar escalares NumPy.
+    """
+    rows, cols = grid.shape
+    n = rows * cols
+    s = start[0] * cols + start[1]
+    g = goal[0] * cols + goal[1]
+    pred = np.full(n, -1, dtype=np.int32)
+    queue = np.empty(n, dtype=np.int32)
+    flat = memoryview(grid.reshape(-1))
+    predv, queuev = memoryview(pred), memoryview(queue)
+    seen = bytearray(n)
+    queuev[0] = s
+    seen[s] = 1
+    head, tail = 0, 1
+
+    while head < tail:
+        cur = queuev[head]
+        head += 1
+        if cur == g:
+            path = _path_from_pred(pred, g, cols)
+            return GridResult(path, len(path) - 1, head)
+        r, c = divmod(cur, cols)
+        for dr, dc in DIRECTIONS:
+            rr, cc = r + dr, c + dc
+            if 0 <= rr < rows and 0 <= cc < cols:
+                nxt = rr * cols + cc
+                if flat[nxt] == passable and not seen[nxt]:
+                    seen[nxt] = 1
+                    predv[nxt] = cur
+                    queuev[tail] = nxt
+                    tail += 1
+
+    return GridResult(None, float('inf'), head)
+
+
+def _expand_layer(flat, frontier, rows, cols, seen, pred, passable=1):
+    """
+    Expande un nivel completo de BFS. Los 4 vecinos de toda la frontera se
+    generan en orden (posición en la cola, dirección); el primer descubridor
+    de cada celda es su padre y los nuevos nodos quedan en el orden en que
+    una cola FIFO los habría encolado. Devuelve la nueva frontera (int32).
+    """
+    r, c = np.divmod(frontier, cols)
+    cand = np.empty((frontier.size, 4), dtype=np.int64)
+    valid = np.empty((frontier.size, 4), dtype=np.bool_)
+    for k, (dr, dc) in enumerate(DIRECTIONS):
+        rr, cc = r + dr, c + dc
+        valid[:, k] = (rr >= 0) & (rr < rows) & (cc >= 0) & (cc < cols)
+        cand[:, k] = rr * cols + cc
+    cand = cand.reshape(-1)
+    parents = np.repeat(frontier, 4)
+    idx = np.flatnonzero(valid.reshape(-1))
+    keep = (flat[cand[idx]] == passable) & ~seen[cand[idx]]
+    idx = idx[keep]
+    cand, parents = cand[idx], parents[idx]
+    _, first = np.unique(cand, return_index=True)
+    first.sort()
+    new = cand[first].astype(np.int32)
+    pred[new] = parents[first]
+    seen[new] = True
+    return new
+
+
+def bfs_frontier(grid, start, goal, passable=1) -> GridResult:
+    """
+    BFS nivel por nivel con NumPy (ver _expand_layer). El camino es idéntico
+    al de la versión con cola.
+    """
+    rows, cols = grid.shape
+    flat = grid.reshape(-1)
+    n = rows * cols
+    s = start[0] * cols + start[1]
+    g = goal[0] * cols + goal[1]
+    pred = np.full(n, -1, dtype=np.int32)
+    seen = np.zeros(n, dtype=np.bool_)
+    seen[s] = True
+    frontier = np.array([s], dtype=np.int32)
+    expanded = 0
+
+    while frontier.size and not seen[g]:
+        expanded += frontier.size
+        frontier = _expand_layer(flat, frontier, rows, cols, seen, pred, passable)
+
+    if not seen[g]:
+        return GridResult(None, float('inf'), expanded)
+    path = _path_from_pred(pred, g, cols)
+    return GridResult(path, len(path) - 1, expanded)
+
+
+def bfs_grid(maze, start, goal, method="frontier", passable=1) -> GridResult:
+    """
+    Punto de entrada del motor BFS: method = 'queue' o 'frontier'.
+    passable: valor de celda transitable (1 en el laberinto invertido, 0 en
+    el original); así no hace falta invertir/copiar la grilla.
+    """
+    grid = as_grid(maze)
+    if method == "queue":
+        return bfs_queue(grid, start, goal, passable)
+    if method == "frontier":
+        return bfs_frontier(grid, start, goal, passable)
+    raise ValueError(f"método desconocido: {method!r} (use 'queue' o 'frontier')")
+
+
+def load_maze(path, shape=None, dtype=np.uint8, offset=0) -> np.ndarray:
+    """
+    Abre un laberinto en disco SIN cargarlo a memoria (mapeo de memoria):
+    - '.npy': np.load(mmap_mode='r').
+    - binario crudo (1 celda por elemento de `dtype`): requiere shape=(filas, cols).
+    Los motores leen el buffer directamente; el SO trae solo las páginas tocadas.
+    """
+    if str(path).endswith(".npy"):
+        return np.load(path, mmap_mode="r")
+    if shape is None:
+        raise ValueError("un bitmap crudo necesita shape=(filas, cols)")
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=tuple(shape))
+
+
+# --- Campo de distancias completo + caché ---
+
+@dataclass
+class DistanceField:
+    """
+    BFS completo desde un inicio: distancia (int32, -1 = inalcanzable) y
+    predecesor (int32) de cada celda. Cualquier camino se extrae en
+    O(longitud del camino) y coincide con el de solve_maze.
+    """
+    shape: tuple
+    start: tuple
+    dist: np.ndarray
+    pred: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        return self.dist.nbytes + self.pred.nbytes
+
+    def distance(self, goal):
+        d = int(self.dist[goal[0] * self.shape[1] + goal[1]])
+        return d if d >= 0 else None
+
+    def path_to(self, goal):
+        g = goal[0] * self.shape[1] + goal[1]
+        if self.dist[g] < 0:
+            return None
+        return _path_from_pred(self.pred, g, self.shape[1])
+
+
+def bfs_field(maze, start, passable=1) -> DistanceField:
+    """Calcula el campo BFS completo desde `start` (expansión vectorizada por niveles)."""
+    grid = as_grid(maze)
+    rows, cols = grid.shape
+    flat = grid.reshape(-1)
+    n = rows * cols
+    s = start[0] * cols + start[1]
+    pred = np.full(n, -1, dtype=np.int32)
+    dist = np.full(n, -1, dtype=np.int32)
+    seen = np.zeros(n, dtype=np.bool_)
+    seen[s] = True
+    dist[s] = 0
+    frontier = np.array([s], dtype=np.int32)
+    depth = 0
+    while frontier.size:
+        frontier = _expand_layer(flat, frontier, rows, cols, seen, pred, passable)
+        depth += 1
+        dist[frontier] = depth
+    return DistanceField((rows, cols), tuple(start), dist, pred)
+
+
+def maze_key(maze) -> str:
+    """Hash del contenido del laberinto (forma + bytes). Precalcular para laberintos grandes."""
+    grid = as_grid(maze)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr(grid.shape).encode())
+    h.update(grid.data)
+    return h.hexdigest()
+
+
+class FieldCache:
+    """
+    Caché LRU de campos de distancia, indexada por (hash del laberinto, inicio)
+    y acotada por memoria (max_bytes). Pensada para muchas consultas de
+    objetivo sobre el mismo inicio.
+    """
+    def __init__(self, max_bytes=256 * 2**20):
+        self.max_bytes = max_bytes
+        self._fields = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._fields)
+
+    def field(self, maze, start, key=None, passable=1) -> DistanceField:
+        """Campo desde `start`; se calcula solo si no está en caché."""
+        k = (key or maze_key(maze), tuple(start), passable)
+        cached = self._fields.get(k)
+        if cached is not None:
+            self._fields.move_to_end(k)
+            self.hits += 1
+            return cached
+        self.misses += 1
+        field = bfs_field(maze, start, passable)
+        if field.nbytes <= self.max_bytes:
+            self._fields[k] = field
+            self.nbytes += field.nbytes
+            while self.nbytes > self.max_bytes:
+                _, old = self._fields.popitem(last=False)
+                self.nbytes -= old.nbytes
+        return field
+
+    def path(self, maze, start, goal, key=None, passable=1):
+        """Camino más corto start -> goal (mismo resultado que solve_maze)."""
+        return self.field(maze, start, key=key, passable=passable).path_to(goal)
+
+    def clear(self):
+        self._fields.clear()
+        self.nbytes = 0
+
+
+# --- A* con costos por celda y Jump Point Search ---
+
+DIAGONALS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+SQRT2 = 2 ** 0.5
+
+
+def _cell(p):
+    """(fila, col) como ints de Python (np.argwhere entrega np.int64, que no admite bool - bool)."""
+    return int(p[0]), int(p[1])
+
+
+def _grid_heuristic(name, goal, diagonal, scale):
+    """h(fila, col) admisible: manhattan (4-conexo) u octile (8-conexo), escalada por el costo mínimo."""
+    gr, gc = goal
+    if callable(name):
+        return name
+    if name is None:
+        name = "octile" if diagonal else "manhattan"
+    if name == "zero":
+        return lambda r, c: 0.0
+    if name == "manhattan":
+        return lambda r, c: scale * (abs(r - gr) + abs(c - gc))
+    if name == "octile":
+        def octile(r, c):
+            dr, dc = abs(r - gr), abs(c - gc)
+            return scale * (max(dr, dc) + (SQRT2 - 1) * min(dr, dc))
+        return octile
+    raise ValueError(f"heurística desconocida: {name!r} (use 'manhattan', 'octile' o 'zero')")
+
+
+def astar_grid(maze, start, goal, passable=1, diagonal=False, costs=None, heuristic=None) -> GridResult:
+    """
+    A* en grilla con conectividad 4 u 8 (diagonal=True, sin cortar esquinas).
+    costs: arreglo opcional (misma forma) con el costo de ENTRAR a cada celda
+    (> 0); los pasos diagonales cuestan costo * sqrt(2). La heurística se
+    escala por el costo mínimo para seguir siendo admisible.
+    """
+    grid = as_grid(maze)
+    rows, cols = grid.shape
+    n = rows * cols
+    flat = memoryview(grid.reshape(-1))
+    if costs is not None:
+        costs = np.ascontiguousarray(costs, dtype=np.float64)
+        if costs.shape != grid.shape:
+            raise ValueError("costs debe tener la misma forma que el laberinto")
+        cell_cost = memoryview(costs.reshape(-1))
+        scale = max(float(costs.min()), 0.0)
+    else:
+        cell_cost, scale = None, 1.0
+    h = _grid_heuristic(heuristic, goal, diagonal, scale)
+    moves = [(dr, dc, 1.0) for dr, dc in DIRECTIONS]
+    if diagonal:
+        moves += [(dr, dc, SQRT2) for dr, dc in DIAGONALS]
+
+    s = start[0] * cols + start[1]
+    g = goal[0] * cols + goal[1]
+    best = array('d', [float('inf')]) * n
+    closed = bytearray(n)
+    pred = np.full(n, -1, dtype=np.int32)
+    predv = memoryview(pred)
+    best[s] = 0.0
+    h0 = h(*start)
+    heap = [(h0, h0, s)]
+    expanded = 0
+
+    while heap:
+        _, _, cur = heapq.heappop(heap)
+        if closed[cur]:
+            continue  # entrada obsoleta
+        closed[cur] = 1
+        expanded += 1
+        if cur == g:
+            return GridResult(_path_from_pred(pred, g, cols), best[g], expanded)
+        r, c = divmod(cur, cols)
+        g_cur = best[cur]
+        for dr, dc, length in moves:
+            rr, cc = r + dr, c + dc
+            if not (0 <= rr < rows and 0 <= cc < cols):
+                continue
+            nxt = rr * cols + cc
+            if flat[nxt] != passable or closed[nxt]:
+                continue
+            if dr and dc and (flat[r * cols + cc] != passable or flat[rr * cols + c] != passable):
+                continue  # no cortar esquinas
+            step = length * (cell_cost[nxt] if cell_cost is not None else 1.0)
+            new_g = g_cur + step
+            if new_g < best[nxt]:
+                best[nxt] = new_g
+                predv[nxt] = cur
+                hn = h(rr, cc)
+                heapq.heappush(heap, (new_g + hn, hn, nxt))
+
+    return GridResult(None, float('inf'), expanded)
+
+
+def jps_grid(maze, start, goal, passable=1, diagonal=False, heuristic=None) -> GridResult:
+    """
+    Jump Point Search para grillas de costo uniforme (4-conexo, o 8-conexo sin
+    cortar esquinas). Solo entran al heap los puntos de salto: en zonas
+    abiertas se expanden muchísimas menos celdas que con BFS/A*. El costo es
+    igual al óptimo de A*; `expanded` cuenta puntos de salto cerrados.
+    """
+    grid = as_grid(maze)
+    rows, cols = grid.shape
+    flat = memoryview(grid.reshape(-1))
+    start, goal = _cell(start), _cell(goal)
+    gr, gc = goal
+
+    def ok(r, c):
+        return 0 <= r < rows and 0 <= c < cols and flat[r * cols + c] == passable
+
+    def jump_straight(r, c, dr, dc):
+        """Avanza en línea recta desde (r, c) y devuelve el siguiente punto de salto."""
+        while True:
+            if not ok(r, c):
+                return None
+            if r == gr and c == gc:
+                return r, c
+            if dc:
+                if (ok(r - 1, c) and not ok(r - 1, c - dc)) or (ok(r + 1, c) and not ok(r + 1, c - dc)):
+                    return r, c
+            else:
+                if (ok(r, c - 1) and not ok(r - dr, c - 1)) or (ok(r, c + 1) and not ok(r - dr, c + 1)):
+                    return r, c
+                if not diagonal and (jump_straight(r, c + 1, 0, 1) or jump_straight(r, c - 1, 0, -1)):
+                    return r, c  # en 4-conexo, un avance vertical se detiene si hay salto horizontal
+            r, c = r + dr, c + dc
+
+    def jump(r, c, dr, dc):
+        if not (dr and dc):
+            return jump_straight(r, c, dr, dc)
+        while True:
+            if not ok(r, c):
+                return None
+            if r == gr and c == gc:
+                return r, c
+            if jump_straight(r, c + dc, 0, dc) or jump_straight(r + dr, c, dr, 0):
+                return r, c
+            if not (ok(r, c + dc) and ok(r + dr, c)):
+                return None  # no cortar esquinas
+            r, c = r + dr, c + dc
+
+    def neighbors(r, c, parent):
+        """Direcciones podadas según la dirección de llegada."""
+        if parent is None:
+            dirs = list(DIRECTIONS) + (list(DIAGONALS) if diagonal else [])
+            return [(dr, dc) for dr, dc in dirs
+                    if ok(r + dr, c + dc) and (not (dr and dc) or (ok(r + dr, c) and ok(r, c + dc)))]
+        pr, pc = parent
+        dr = (r > pr) - (r < pr)
+        dc = (c > pc) - (c < pc)
+        out = []
+        if dr and dc:
+            if ok(r + dr, c):
+                out.append((dr, 0))
+            if ok(r, c + dc):
+                out.append((0, dc))
+            if ok(r + dr, c) and ok(r, c + dc):
+                out.append((dr, dc))
+        elif dc:
+            up, down = ok(r - 1, c), ok(r + 1, c)
+            if ok(r, c + dc):
+                out.append((0, dc))
+                if diagonal and up:
+                    out.append((-1, dc))
+                if diagonal and down:
+                    out.append((1, dc))
+            if up:
+                out.append((-1, 0))
+            if down:
+                out.append((1, 0))
+        else:
+            left, right = ok(r, c - 1), ok(r, c + 1)
+            if ok(r + dr, c):
+                out.append((dr, 0))
+                if diagonal and right:
+                    out.append((dr, 1))
+                if diagonal and left:
+                    out.append((dr, -1))
+            if right:
+                out.append((0, 1))
+            if left:
+                out.append((0, -1))
+        return out
+
+    h = _grid_heuristic(heuristic, goal, diagonal, 1.0)
+    best = {start: 0.0}
+    parent = {start: None}
+    closed = set()
+    heap = [(h(*start), 0.0, start)]
+    expanded = 0
+
+    while heap:
+        _, _, node = heapq.heappop(heap)
+        if node in closed:
+            continue
+        closed.add(node)
+        expanded += 1
+        if node == (gr, gc):
+            return GridResult(_expand_jumps(parent, node), best[node], expanded)
+        r, c = node
+        g_cur = best[node]
+        for dr, dc in neighbors(r, c, parent[node]):
+            jp = jump(r + dr, c + dc, dr, dc)
+            if jp is None or jp in closed:
+                continue
+            d_r, d_c = abs(jp[0] - r), abs(jp[1] - c)
+            new_g = g_cur + (SQRT2 * d_r if d_r and d_c else d_r + d_c)
+            if new_g < best.get(jp, float('inf')):
+                best[jp] = new_g
+                parent[jp] = node
+                hn = h(*jp)
+                heapq.heappush(heap, (new_g + hn, hn, jp))
+
+    return GridResult(None, float('inf'), expanded)
+
+
+def _expand_jumps(parent, node):
+    """Camino celda a celda a partir de la cadena de puntos de salto."""
+    jumps = []
+    while node is not None:
+        jumps.append(node)
+        node = parent[node]
+    jumps.reverse()
+    path = [jumps[0]]
+    for (r0, c0), (r1, c1) in zip(jumps, jumps[1:]):
+        dr = (r1 > r0) - (r1 < r0)
+        dc = (c1 > c0) - (c1 < c0)
+        r, c = r0, c0
+        while (r, c) != (r1, c1):
+            r, c = r + dr, c + dc
+            path.append((r, c))
+    return path
+
+
+def search_grid(maze, start, goal, algorithm="bfs", passable=1, diagonal=False,
+                costs=None, heuristic=None, method="frontier") -> GridResult:
+    """
+    Punto de entrada común: algorithm = 'bfs' | 'astar' | 'jps'.
+    - bfs: 4-conexo y costo uniforme (method = 'queue' | 'frontier').
+    - astar: 4/8-conexo, costos por celda opcionales, heurística manhattan/octile.
+    - jps: 4/8-conexo, costo uniforme.
+    Todos devuelven GridResult con `expanded` para comparar celdas expandidas.
+    """
+    start, goal = _cell(start), _cell(goal)
+    if algorithm == "bfs":
+        if diagonal or costs is not None:
+            raise ValueError("bfs solo admite 4-conexo y costo uniforme (use 'astar')")
+        return bfs_grid(maze, start, goal, method=method, passable=passable)
+    if algorithm == "astar":
+        return astar_grid(maze, start, goal, passable, diagonal, costs, heuristic)
+    if algorithm == "jps":
+        if costs is not None:
+            raise ValueError("jps requiere costo uniforme (use 'astar' con costos)")
+        return jps_grid(maze, start, goal, passable, diagonal, heuristic)
+    raise ValueError(f"algoritmo desconocido: {algorithm!r} (use 'bfs', 'astar' o 'jps')")
@@ -0,0 +1,143 @@
+# packed_maze.py
+"""
+Laberinto empaquetado a 1 bit por celda (np.packbits por fila).
+
+Frente a una lista de listas de ints (8–28 bytes por celda) ocupa 1/8 de
+byte por celda: 64× o más de reducción. Incluye:
+- lectura vectorizada de celdas (bits) para probar vecinos,
+- BFS por niveles con visitados en un bitset y el predecesor codificado en
+  2 bits por celda (dirección de llegada),
+- guardado/carga en disco (con mapeo de memoria) y submuestreo para graficar.
+"""
+import numpy as np
+
+from grid_engine import DIRECTIONS, GridResult
+
+_MAGIC = b"PMAZE1\0\0"
+_HEADER = len(_MAGIC) + 16  # magic + filas y columnas (uint64)
+
+
+class PackedMaze:
+    """Grilla de bits (1 = celda con valor 1), filas empaquetadas con bitorder 'big'."""
+
+    def __init__(self, bits, shape):
+        self.bits = bits  # uint8 (filas, ceil(cols/8)); puede ser np.memmap
+        self.shape = (int(shape[0]), int(shape[1]))
+        self.row_bytes = bits.shape[1]
+        self._flat = bits.reshape(-1)
+
+    @classmethod
+    def from_array(cls, maze):
+        """Empaqueta una grilla 0/1 (lista de listas o arreglo)."""
+        grid = np.asarray(maze)
+        return cls(np.packbits(grid != 0, axis=1), grid.shape)
+
+    @property
+    def nbytes(self) -> int:
+        return self.bits.nbytes
+
+    def __getitem__(self, rc):
+        r, c = rc
+        return (int(self.bits[r, c >> 3]) >> (7 - (c & 7))) & 1
+
+    def cells(self, flat_idx):
+        """Valores (0/1) de varias celdas a la vez, dados índices planos fila*cols+col."""
+        r, c = np.divmod(flat_idx, self.shape[1])
+        byte = self._flat[r * self.row_bytes + (c >> 3)]
+        return (byte >> (7 - (c & 7)).astype(np.uint8)) & 1
+
+    def unpack(self, r0=0, r1=None) -> np.ndarray:
+        """Filas [r0, r1) como uint8 0/1 (solo ese bloque se desempaqueta)."""
+        return np.unpackbits(self.bits[r0:r1], axis=1, count=self.shape[1])
+
+    def downsample(self, max_side=2000):
+        """
+        Vista reducida para graficar: toma una de cada `step` filas y columnas,
+        desempaquetando solo las filas elegidas. Devuelve (arreglo, step).
+        """
+        step = max(1, -(-max(self.shape) // max_side))
+        rows = np.unpackbits(self.bits[::step], axis=1, count=self.shape[1])
+        return rows[:, ::step], step
+
+    # --- disco ---
+
+    def save(self, path):
+        """Guarda encabezado (filas, cols) + bytes empaquetados."""
+        with open(path, "wb") as fh:
+            fh.write(_MAGIC)
+            fh.write(np.array(self.shape, dtype=np.uint64).tobytes())
+            fh.write(np.ascontiguousarray(self.bits).tobytes())
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Carga un laberinto guardado con save(); por defecto con mapeo de memoria."""
+        with open(path, "rb") as fh:
+            head = fh.read(_HEADER)
+        if head[:len(_MAGIC)] != _MAGIC:
+            raise ValueError(f"{path}: no es un laberinto empaquetado")
+        rows, cols = (int(x) for x in np.frombuffer(head[len(_MAGIC):], dtype=np.uint64))
+        shape = (rows, (cols + 7) // 8)
+        if mmap:
+            bits = np.memmap(path, dtype=np.uint8, mode="r", offset=_HEADER, shape=shape)
+        else:
+            bits = np.fromfile(path, dtype=np.uint8, offset=_HEADER).reshape(shape)
+        return cls(bits, (rows, cols))
+
+
+def _set_bits(bitset, idx):
+    np.bitwise_or.at(bitset, idx >> 3, (1 << (idx & 7)).astype(np.uint8))
+
+
+def _get_bits(bitset, idx):
+    return (bitset[idx >> 3] >> (idx & 7).astype(np.uint8)) & 1
+
+
+def bfs_packed(maze: PackedMaze, start, goal, passable=1) -> GridResult:
+    """
+    BFS por niveles sobre un PackedMaze, con el mismo orden de descubrimiento
+    que grid_engine.bfs_frontier (mismo camino que solve_maze). Memoria de
+    trabajo: 1 bit de visitado + 2 bits de dirección por celda.
+    """
+    rows, cols = maze.shape
+    n = rows * cols
+    s = start[0] * cols + start[1]
+    g = goal[0] * cols + goal[1]
+    seen = np.zeros((n + 7) // 8, dtype=np.uint8)
+    came = np.zeros((n + 3) // 4, dtype=np.uint8)  # 2 bits: dirección de llegada
+    _set_bits(seen, np.array([s], dtype=np.int64))
+    frontier = np.array([s], dtype=np.int64)
+    expanded = 0
+
+    while frontier.size and not _get_bits(seen, np.array([g]))[0]:
+        expanded += frontier.size
+        r, c = np.divmod(frontier, cols)
+        cand = np.empty((frontier.size, 4), dtype=np.int64)
+        valid = np.empty((frontier.size, 4), dtype=np.bool_)
+        for k, (dr, dc) in enumerate(DIRECTIONS):
+            rr, cc = r + dr, c + dc
+            valid[:, k] = (rr >= 0) & (rr < rows) & (cc >= 0) & (cc < cols)
+            cand[:, k] = rr * cols + cc
+        codes = np.broadcast_to(np.arange(4, dtype=np.uint8), (frontier.size, 4)).reshape(-1)
+        cand = cand.reshape(-1)
+        idx = np.flatnonzero(valid.reshape(-1))
+        keep = (maze.cells(cand[idx]) == passable) & (_get_bits(seen, cand[idx]) == 0)
+        idx = idx[keep]
+        cand, codes = cand[idx], codes[idx]
+        _, first = np.unique(cand, return_index=True)
+        first.sort()
+        frontier = cand[first]
+        _set_bits(seen, frontier)
+        np.bitwise_or.at(came, frontier >> 2, (codes[first] << ((frontier & 3) * 2)).astype(np.uint8))
+
+    if not _get_bits(seen, np.array([g]))[0]:
+        return GridResult(None, float('inf'), expanded)
+
+    path = [divmod(g, cols)]
+    i = g
+    while i != s:
+        k = (int(came[i >> 2]) >> ((i & 3) * 2)) & 3
+        dr, dc = DIRECTIONS[k]
+        i -= dr * cols + dc
+        path.append(divmod(i, cols))
+    path.reverse()
+    return GridResult(path, len(path) - 1, expanded)
@@ -0,0 +1,122 @@
+# search_batch.py
+"""
+API de búsqueda por lotes: muchas consultas (inicio, objetivo) sobre el mismo grafo.
+
+- El grafo se convierte a CSR una sola vez.
+- Las consultas que comparten inicio se resuelven con UNA búsqueda desde ese
+  origen (search_core.single_source), que se detiene al cerrar todos sus
+  objetivos. Cada consulta obtiene el mismo camino/costo/expandidos que la
+  búsqueda individual.
+- Con workers > 1 los grupos se reparten en un pool de procesos; los arreglos
+  CSR viven en memoria compartida (multiprocessing.shared_memory), así los
+  procesos no copian ni re-serializan el grafo.
+"""
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+import time
+
+import numpy as np
+
+from graph_csr import CSRGraph
+from search_core import single_source
+
+
+@dataclass
+class QueryResult:
+    """Resultado y estadísticas de una consulta del lote."""
+    start: object
+    goal: object
+    path: list | None
+    cost: float
+    expanded: int       # nodos que expandiría la búsqueda individual
+    seconds: float      # tiempo de la búsqueda compartida por el grupo
+    group_size: int     # consultas resueltas con esa misma búsqueda
+
+    @property
+    def found(self) -> bool:
+        return self.path is not None
+
+
+def _solve_group(graph, start, goals, algorithm):
+    """Una búsqueda desde `start` para todos sus objetivos."""
+    t0 = time.perf_counter()
+    tree = single_source(graph, start, goals, algorithm)
+    seconds = time.perf_counter() - t0
+    return [(tree.path_to(g), tree.cost_to(g), tree.expanded_until(g), seconds) for g in goals]
+
+
+# --- Memoria compartida para el pool ---
+
+_WORKER_GRAPH = None
+_WORKER_SHM = []
+
+
+def _share_array(arr, blocks):
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+    blocks.append(shm)
+    return shm.name, arr.shape, arr.dtype.str
+
+
+def _attach_array(spec):
+    name, shape, dtype = spec
+    shm = shared_memory.SharedMemory(name=name)
+    _WORKER_SHM.append(shm)  # mantener viva la referencia mientras viva el proceso
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+
+def _init_worker(specs):
+    global _WORKER_GRAPH
+    offsets, targets, weights = (_attach_array(s) for s in specs)
+    _WORKER_GRAPH = CSRGraph(offsets, targets, weights)
+
+
+def _worker_task(task):
+    start, goals, algorithm = task
+    return _solve_group(_WORKER_GRAPH, start, goals, algorithm)
+
+
+def batch_search(graph, queries, algorithm="ucs", workers=None) -> list[QueryResult]:
+    """
+    Resuelve una lista de pares (inicio, objetivo) y devuelve los resultados
+    en el mismo orden de entrada.
+    - graph: dict estilo tree_with_costs / tree, o un CSRGraph ya construido.
+    - algorithm: 'bfs', 'dfs' o 'ucs'.
+    - workers: None/1 = en el proceso actual; >1 = pool de procesos.
+    """
+    queries = list(queries)
+    csr = CSRGraph.from_adjacency(graph) if isinstance(graph, Mapping) else graph
+    to_id = csr.id_of if csr.names is not None else (lambda x: x)
+
+    # Agrupar por inicio conservando el orden de aparición
+    groups = {}
+    for i, (start, goal) in enumerate(queries):
+        goals, positions = groups.setdefault(to_id(start), ([], []))
+        goals.append(to_id(goal))
+        positions.append(i)
+    tasks = [(start, goals, algorithm) for start, (goals, _) in groups.items()]
+
+    if workers is None or workers <= 1 or len(tasks) <= 1:
+        outputs = [_solve_group(csr, *task) for task in tasks]
+    else:
+        blocks = []
+        try:
+            specs = [_share_array(a, blocks) for a in (csr.offsets, csr.targets, csr.weights)]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(specs,)) as pool:
+                chunksize = max(1, len(tasks) // (workers * 4))
+                outputs = list(pool.map(_worker_task, tasks, chunksize=chunksize))
+        finally:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+
+    results = [None] * len(queries)
+    for (goals, positions), output in zip(groups.values(), outputs):
+        for pos, (path, cost, expanded, seconds) in zip(positions, output):
+            start, goal = queries[pos]
+            results[pos] = QueryResult(start, goal, csr.to_names(path), cost, expanded,
+                                       seconds, len(goals))
+    return results
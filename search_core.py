@@ -0,0 +1,679 @@
+# search_core.py
+"""
+Núcleo de búsqueda sin visualización (BFS, DFS, UCS).
+
+No depende de matplotlib ni de networkx: sirve para lotes, servidores o
+benchmarks. La visualización se conecta opcionalmente como observador
+(ver `SearchObserver`), que recibe cada paso y el resultado final.
+"""
+from array import array
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+import heapq
+
+
+@dataclass
+class SearchResult:
+    """Resultado de una búsqueda: camino, costo y orden de visita."""
+    path: list | None
+    cost: float
+    visited: list = field(default_factory=list)
+
+    @property
+    def found(self) -> bool:
+        return self.path is not None
+
+    @property
+    def expanded(self) -> int:
+        """Cantidad de nodos expandidos (visitados)."""
+        return len(self.visited)
+
+
+class SearchObserver:
+    """
+    Observador nulo. Las capas de visualización heredan y sobreescriben.
+    - on_step: después de expandir un nodo (frontera ya actualizada).
+    - on_goal: al encontrar el objetivo.
+    La frontera se entrega tal cual (deque, lista o heap): no modificarla.
+    """
+    def on_step(self, step, current, visited, frontier, cost=None):
+        pass
+
+    def on_goal(self, path, visited, cost):
+        pass
+
+
+class _Marks(dict):
+    """Tabla hash con valor por defecto que NO inserta la clave al consultar."""
+    __slots__ = ("default",)
+
+    def __init__(self, default=0):
+        super().__init__()
+        self.default = default
+
+    def __missing__(self, key):
+        return self.default
+
+
+def _storage(graph, weighted=False):
+    """
+    Prepara el estado de búsqueda según el tipo de grafo.
+    Devuelve (vecinos, seen, parent, nil):
+    - Mapping {nodo: [hijos]}: tablas hash, nodos con cualquier nombre.
+    - Grafo CSR (graph_csr.CSRGraph, con successors/edges) o secuencia de
+      listas (ids enteros 0..n-1): bytearray como bitset de marcas y
+      array('i') de padres, unos pocos bytes por nodo.
+    seen[x] es 0/1 y parent[x] vale nil para la raíz.
+    """
+    if isinstance(graph, Mapping):
+        return (lambda node: graph.get(node, ())), _Marks(0), _Marks(None), None
+    n = len(graph)
+    typecode = 'i' if n < 2**31 else 'q'
+    if hasattr(graph, "successors"):
+        neighbors = graph.edges if weighted else graph.successors
+    else:
+        neighbors = graph.__getitem__
+    return neighbors, bytearray(n), array(typecode, [-1]) * n, -1
+
+
+def _build_path(parent, node, nil=None):
+    path = []
+    while node != nil:
+        path.append(node)
+        node = parent[node]
+    path.reverse()
+    return path
+
+
+def bfs(tree, start, goal, observer: SearchObserver | None = None) -> SearchResult:
+    """
+    BFS con objetivo (sin pesos). El costo es la longitud en pasos.
+    Cada nodo entra a la cola una sola vez (marca al encolar): O(V+E).
+    """
+    neighbors, seen, parent, nil = _storage(tree)
+    visited = []
+    queue = deque([start])
+    seen[start] = 1
+    parent[start] = nil
+    step = 0
+
+    while queue:
+        current_node = queue.popleft()
+        visited.append(current_node)
+
+        if current_node == goal:
+            path = _build_path(parent, current_node, nil)
+            if observer is not None:
+                observer.on_goal(path, visited, len(path) - 1)
+            return SearchResult(path, len(path) - 1, visited)
+
+        for child in neighbors(current_node):
+            if not seen[child]:
+                seen[child] = 1
+                parent[child] = current_node
+                queue.append(child)
+
+        if observer is not None:
+            observer.on_step(step, current_node, visited, queue)
+        step += 1
+
+    return SearchResult(None, float('inf'), visited)
+
+
+def dfs(tree, start, goal, observer: SearchObserver | None = None) -> SearchResult:
+    """
+    DFS con objetivo (sin pesos). El costo es la longitud en pasos.
+    Igual que BFS, un nodo ya visitado o en la pila no se vuelve a apilar: O(V+E).
+    """
+    neighbors, seen, parent, nil = _storage(tree)
+    visited = []
+    stack = [start]
+    seen[start] = 1
+    parent[start] = nil
+    step = 0
+
+    while stack:
+        current_node = stack.pop()
+        visited.append(current_node)
+
+        if current_node == goal:
+            path = _build_path(parent, current_node, nil)
+            if observer is not None:
+                observer.on_goal(path, visited, len(path) - 1)
+            return SearchResult(path, len(path) - 1, visited)
+
+        for child in reversed(neighbors(current_node)):
+            if not seen[child]:
+                seen[child] = 1
+                parent[child] = current_node
+                stack.append(child)
+
+        if observer is not None:
+            observer.on_step(step, current_node, visited, stack)
+        step += 1
+
+    return SearchResult(None, float('inf'), visited)
+
+
+class IndexedHeap:
+    """
+    Heap binario indexado: una sola entrada (costo, nodo) por nodo y
+    decrease-key real. `positions` es la tabla nodo -> índice (-1 = ausente);
+    por defecto un dict, o un array para grafos con ids enteros.
+    """
+    def __init__(self, positions=None):
+        self._items = []
+        self._pos = positions if positions is not None else _Marks(-1)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, i):
+        return self._items[i]
+
+    def push_or_decrease(self, key, node) -> bool:
+        """Inserta el nodo o baja su costo. Devuelve False si no mejora."""
+        i = self._pos[node]
+        if i < 0:
+            self._items.append((key, node))
+            i = len(self._items) - 1
+        elif (key, node) < self._items[i]:
+            self._items[i] = (key, node)
+        else:
+            return False
+        self._sift_up(i)
+        return True
+
+    def pop(self):
+        items, pos = self._items, self._pos
+        top = items[0]
+        last = items.pop()
+        pos[top[1]] = -1
+        if items:
+            items[0] = last
+            pos[last[1]] = 0
+            self._sift_down(0)
+        return top
+
+    def _sift_up(self, i):
+        items, pos = self._items, self._pos
+        item = items[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if item < items[parent]:
+                items[i] = items[parent]
+                pos[items[i][1]] = i
+                i = parent
+            else:
+                break
+        items[i] = item
+        pos[item[1]] = i
+
+    def _sift_down(self, i):
+        items, pos = self._items, self._pos
+        n = len(items)
+        item = items[i]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and items[child + 1] < items[child]:
+                child += 1
+            if items[child] < item:
+                items[i] = items[child]
+                pos[items[i][1]] = i
+                i = child
+            else:
+                break
+        items[i] = item
+        pos[item[1]] = i
+
+
+def _cost_table(graph, fill):
+    """Tabla nodo -> valor (costos, posiciones) acorde a _storage."""
+    if isinstance(graph, Mapping):
+        return _Marks(fill)
+    if isinstance(fill, float):
+        return array('d', [fill]) * len(graph)
+    return array('i' if len(graph) < 2**31 else 'q', [fill]) * len(graph)
+
+
+def _integral_weights(graph) -> bool:
+    """
+    True si los costos de un grafo CSR / lista de listas son todos enteros.
+    Las tablas array('d') devuelven float; con esto el costo vuelve a ser int,
+    como en la ruta con dicts (que guarda los costos tal cual).
+    """
+    if isinstance(graph, Mapping):
+        return False
+    weights = getattr(graph, "weights", None)
+    if weights is not None:
+        return weights.dtype.kind in "iu"
+    return all(isinstance(cost, int) for children in graph for _, cost in children)
+
+
+def ucs(tree_with_costs, start, goal, observer: SearchObserver | None = None,
+        heap: str = "lazy") -> SearchResult:
+    """
+    UCS con objetivo sobre un árbol/grafo con costos: {nodo: [(hijo, costo), ...]}
+    (o lista de listas de (id, costo) con ids enteros, o un CSRGraph).
+    Guarda punteros al padre y el mejor costo conocido por nodo; nunca copia caminos.
+    - heap="lazy": heapq; solo se empuja si mejora el mejor costo y las entradas
+      obsoletas se descartan al salir.
+    - heap="indexed": IndexedHeap con decrease-key (una entrada por nodo).
+    Desempates: entre caminos de igual costo queda el padre que alcanzó
+    primero ese costo (el que se cerró antes). La versión original, que
+    guardaba el camino completo en el heap, se quedaba con el camino
+    lexicográficamente menor; en árboles es el mismo, pero en grafos con
+    varios caminos óptimos el camino devuelto puede diferir. El costo y el
+    orden de expansión no cambian.
+    """
+    if heap not in ("lazy", "indexed"):
+        raise ValueError(f"heap desconocido: {heap!r} (use 'lazy' o 'indexed')")
+
+    neighbors, settled, parent, nil = _storage(tree_with_costs, weighted=True)
+    best = _cost_table(tree_with_costs, float('inf'))
+    order = []
+    best[start] = 0
+    parent[start] = nil
+    step = 0
+
+    if heap == "indexed":
+        priority_queue = IndexedHeap(_cost_table(tree_with_costs, -1))
+        priority_queue.push_or_decrease(0, start)
+        pop = priority_queue.pop
+    else:
+        priority_queue = [(0, start)]
+        pop = lambda: heapq.heappop(priority_queue)
+
+    while priority_queue:
+        current_cost, current_node = pop()
+        if settled[current_node]:
+            continue  # entrada obsoleta (ya se cerró con un costo menor)
+        settled[current_node] = 1
+        order.append(current_node)
+
+        if current_node == goal:
+            path = _build_path(parent, current_node, nil)
+            if observer is not None:
+                observer.on_goal(path, order, current_cost)
+            return SearchResult(path, current_cost, order)
+
+        for child, cost in neighbors(current_node):
+            new_cost = current_cost + cost
+            if not settled[child] and new_cost < best[child]:
+                best[child] = new_cost
+                parent[child] = current_node
+                if heap == "indexed":
+                    priority_queue.push_or_decrease(new_cost, child)
+                else:
+                    heapq.heappush(priority_queue, (new_cost, child))
+
+        if observer is not None:
+            observer.on_step(step, current_node, order, priority_queue, current_cost)
+        step += 1
+
+    return SearchResult(None, float('inf'), order)
+
+
+# --- Búsqueda informada (A*) ---
+
+def zero_heuristic(node):
+    """Heurística nula: A* se comporta como UCS."""
+    return 0
+
+
+def min_edge_heuristic(graph, goal):
+    """
+    Heurística admisible y consistente para cualquier grafo con costos >= 0:
+    0 en el objetivo, el costo mínimo de salida en los demás nodos e inf en
+    nodos sin salida (callejones: A* los poda).
+    """
+    neighbors = _storage(graph, weighted=True)[0]
+
+    def h(node):
+        if node == goal:
+            return 0
+        return min((cost for _, cost in neighbors(node)), default=float('inf'))
+    return h
+
+
+def euclidean_heuristic(coords, goal, scale=1.0):
+    """
+    Distancia en línea recta a partir de coordenadas {nodo: (x, y)}.
+    Admisible si cada arista cuesta al menos `scale` por unidad de distancia.
+    """
+    gx, gy = coords[goal]
+
+    def h(node):
+        x, y = coords[node]
+        return scale * ((x - gx) ** 2 + (y - gy) ** 2) ** 0.5
+    return h
+
+
+def astar(graph, start, goal, heuristic=None, observer: SearchObserver | None = None) -> SearchResult:
+    """
+    A* con heurística enchufable h(nodo) -> costo estimado al objetivo.
+    Heap de (f, nodo, g) con punteros al padre; una entrada se descarta si su g
+    ya no es el mejor conocido, así una heurística admisible pero no
+    consistente reabre nodos y el camino sigue siendo óptimo.
+    """
+    h = heuristic or zero_heuristic
+    neighbors, _, parent, nil = _storage(graph, weighted=True)
+    best = _cost_table(graph, float('inf'))
+    order = []
+    best[start] = 0
+    parent[start] = nil
+    priority_queue = [(h(start), start, 0)]
+    step = 0
+    inf = float('inf')
+
+    while priority_queue:
+        _, current_node, current_cost = heapq.heappop(priority_queue)
+        if current_cost > best[current_node]:
+            continue  # entrada obsoleta
+        order.append(current_node)
+
+        if current_node == goal:
+            path = _build_path(parent, current_node, nil)
+            if observer is not None:
+                observer.on_goal(path, order, current_cost)
+            return SearchResult(path, current_cost, order)
+
+        for child, cost in neighbors(current_node):
+            new_cost = current_cost + cost
+            if new_cost < best[child]:
+                estimate = h(child)
+                if estimate == inf:
+                    continue  # sin camino posible al objetivo
+                best[child] = new_cost
+                parent[child] = current_node
+                heapq.heappush(priority_queue, (new_cost + estimate, child, new_cost))
+
+        if observer is not None:
+            observer.on_step(step, current_node, order, priority_queue, current_cost)
+        step += 1
+
+    return SearchResult(None, float('inf'), order)
+
+
+# --- Búsquedas bidireccionales ---
+
+# id(grafo) -> (grafo, firma, invertido); LRU acotado a unos pocos grafos
+_REVERSE_CACHE = OrderedDict()
+_REVERSE_CACHE_SIZE = 4
+
+
+def _signature(graph):
+    """(nodos, aristas): detecta un grafo que cambió de tamaño después de cachearlo."""
+    children = graph.values() if isinstance(graph, Mapping) else graph
+    return len(graph), sum(map(len, children))
+
+
+def reverse_graph(graph):
+    """
+    Grafo con las aristas invertidas, construido una vez y cacheado.
+    - CSRGraph: delega en graph.reverse() (cache en la instancia).
+    - dict / lista de listas: cache LRU de los últimos _REVERSE_CACHE_SIZE
+      grafos, por identidad y validada con la cantidad de nodos y aristas.
+      Una modificación que no cambia esos tamaños (reemplazar una arista)
+      no se detecta: llamar a clear_reverse_cache(), o construir el
+      invertido una vez y pasarlo como `reverse=` a las búsquedas.
+    Conserva la forma de los hijos: (hijo, costo) o solo hijo.
+    """
+    if hasattr(graph, "successors"):
+        return graph.reverse()
+    signature = _signature(graph)
+    cached = _REVERSE_CACHE.get(id(graph))
+    if cached is not None and cached[0] is graph and cached[1] == signature:
+        _REVERSE_CACHE.move_to_end(id(graph))
+        return cached[2]
+
+    if isinstance(graph, Mapping):
+        rev = {node: [] for node in graph}
+        items = graph.items()
+    else:
+        rev = [[] for _ in range(len(graph))]
+        items = enumerate(graph)
+    for parent, children in items:
+        for child in children:
+            if isinstance(child, tuple):
+                child, cost = child
+                entry = (parent, cost)
+            else:
+                entry = parent
+            if isinstance(rev, dict):
+                rev.setdefault(child, []).append(entry)
+            else:
+                rev[child].append(entry)
+    _REVERSE_CACHE[id(graph)] = (graph, signature, rev)
+    _REVERSE_CACHE.move_to_end(id(graph))
+    while len(_REVERSE_CACHE) > _REVERSE_CACHE_SIZE:
+        _REVERSE_CACHE.popitem(last=False)
+    return rev
+
+
+def clear_reverse_cache():
+    """Olvida los grafos invertidos cacheados para dicts/listas."""
+    _REVERSE_CACHE.clear()
+
+
+def _join_paths(parent_f, parent_b, meet, nil):
+    """Camino inicio->meet (padres hacia atrás) + meet->objetivo (padres del lado inverso)."""
+    path = _build_path(parent_f, meet, nil)
+    node = parent_b[meet]
+    while node != nil:
+        path.append(node)
+        node = parent_b[node]
+    return path
+
+
+def bidirectional_bfs(graph, start, goal, observer: SearchObserver | None = None,
+                      reverse=None) -> SearchResult:
+    """
+    BFS bidireccional (sin pesos): expande por niveles completos el lado con
+    la frontera más chica, usando el grafo invertido hacia atrás (`reverse`,
+    o reverse_graph(graph) si no se pasa).
+    Al terminar el primer nivel donde ambos lados se tocan, el mejor punto
+    de encuentro da el camino más corto en pasos.
+    """
+    if start == goal:
+        return SearchResult([start], 0, [start])
+    rev = reverse if reverse is not None else reverse_graph(graph)
+    neighbors_f, _, parent_f, nil = _storage(graph)
+    neighbors_b, _, parent_b, _ = _storage(rev)
+    dist_f = _cost_table(graph, -1)
+    dist_b = _cost_table(rev, -1)
+    dist_f[start], dist_b[goal] = 0, 0
+    parent_f[start], parent_b[goal] = nil, nil
+    frontier_f, frontier_b = [start], [goal]
+    depth_f = depth_b = 0
+    best, meet = float('inf'), None
+    visited = []
+    step = 0
+
+    while frontier_f and frontier_b and meet is None:
+        forward = len(frontier_f) <= len(frontier_b)
+        if forward:
+            frontier, neighbors, dist, parent, other, depth = frontier_f, neighbors_f, dist_f, parent_f, dist_b, depth_f
+        else:
+            frontier, neighbors, dist, parent, other, depth = frontier_b, neighbors_b, dist_b, parent_b, dist_f, depth_b
+        next_level = []
+        for node in frontier:
+            visited.append(node)
+            for child in neighbors(node):
+                if dist[child] < 0:
+                    dist[child] = depth + 1
+                    parent[child] = node
+                    next_level.append(child)
+                    if other[child] >= 0 and depth + 1 + other[child] < best:
+                        best, meet = depth + 1 + other[child], child
+            if observer is not None:
+                observer.on_step(step, node, visited, next_level)
+            step += 1
+        if forward:
+            frontier_f, depth_f = next_level, depth_f + 1
+        else:
+            frontier_b, depth_b = next_level, depth_b + 1
+
+    if meet is None:
+        return SearchResult(None, float('inf'), visited)
+    path = _join_paths(parent_f, parent_b, meet, nil)
+    if observer is not None:
+        observer.on_goal(path, visited, best)
+    return SearchResult(path, best, visited)
+
+
+def bidirectional_dijkstra(graph, start, goal, observer: SearchObserver | None = None,
+                           reverse=None) -> SearchResult:
+    """
+    Dijkstra bidireccional (costos >= 0): avanza el lado cuyo tope de heap es
+    menor y termina cuando tope_adelante + tope_atrás >= mejor costo conocido.
+    `reverse`: grafo invertido ya construido (ver bidirectional_bfs).
+    """
+    if start == goal:
+        return SearchResult([start], 0, [start])
+    rev = reverse if reverse is not None else reverse_graph(graph)
+    neighbors_f, settled_f, parent_f, nil = _storage(graph, weighted=True)
+    neighbors_b, settled_b, parent_b, _ = _storage(rev, weighted=True)
+    dist_f = _cost_table(graph, float('inf'))
+    dist_b = _cost_table(rev, float('inf'))
+    dist_f[start], dist_b[goal] = 0, 0
+    parent_f[start], parent_b[goal] = nil, nil
+    heap_f, heap_b = [(0, start)], [(0, goal)]
+    best, meet = float('inf'), None
+    visited = []
+    step = 0
+
+    while heap_f and heap_b:
+        if heap_f[0][0] + heap_b[0][0] >= best:
+            break
+        if heap_f[0][0] <= heap_b[0][0]:
+            heap, neighbors, settled, dist, parent, other = heap_f, neighbors_f, settled_f, dist_f, parent_f, dist_b
+        else:
+            heap, neighbors, settled, dist, parent, other = heap_b, neighbors_b, settled_b, dist_b, parent_b, dist_f
+        current_cost, node = heapq.heappop(heap)
+        if settled[node]:
+            continue  # entrada obsoleta
+        settled[node] = 1
+        visited.append(node)
+
+        for child, cost in neighbors(node):
+            new_cost = current_cost + cost
+            if not settled[child] and new_cost < dist[child]:
+                dist[child] = new_cost
+                parent[child] = node
+                heapq.heappush(heap, (new_cost, child))
+            if new_cost + other[child] < best:
+                best, meet = new_cost + other[child], child
+
+        if observer is not None:
+            observer.on_step(step, node, visited, heap, current_cost)
+        step += 1
+
+    if meet is None:
+        return SearchResult(None, float('inf'), visited)
+    if _integral_weights(graph):
+        best = int(best)  # dist_f/dist_b son array('d') en grafos CSR
+    path = _join_paths(parent_f, parent_b, meet, nil)
+    if observer is not None:
+        observer.on_goal(path, visited, best)
+    return SearchResult(path, best, visited)
+
+
+# --- Un origen, varios objetivos ---
+
+@dataclass
+class SearchTree:
+    """
+    Árbol de búsqueda desde un origen: punteros al padre, costo y orden de
+    expansión de cada nodo cerrado. Responde caminos a cualquier objetivo
+    alcanzado sin repetir la búsqueda.
+    """
+    start: object
+    parent: object
+    cost: object
+    rank: object
+    nil: object
+    expanded: int
+    integral: bool = False  # costos enteros guardados en una tabla array('d')
+
+    def reached(self, goal) -> bool:
+        return self.rank[goal] >= 0
+
+    def path_to(self, goal):
+        return _build_path(self.parent, goal, self.nil) if self.reached(goal) else None
+
+    def cost_to(self, goal):
+        if not self.reached(goal):
+            return float('inf')
+        return int(self.cost[goal]) if self.integral else self.cost[goal]
+
+    def expanded_until(self, goal) -> int:
+        """Nodos que habría expandido la búsqueda con ese único objetivo."""
+        return self.rank[goal] + 1 if self.reached(goal) else self.expanded
+
+
+def single_source(graph, start, goals=None, algorithm="ucs") -> SearchTree:
+    """
+    Ejecuta bfs/dfs/ucs desde `start` hasta cerrar todos los `goals` (o todo el
+    grafo si goals es None). El orden de expansión es idéntico al de la
+    búsqueda con un solo objetivo, así que cada objetivo obtiene el mismo
+    camino, costo y número de expandidos que con bfs()/dfs()/ucs().
+    """
+    if algorithm not in ("bfs", "dfs", "ucs"):
+        raise ValueError(f"algoritmo desconocido: {algorithm!r} (use 'bfs', 'dfs' o 'ucs')")
+    weighted = algorithm == "ucs"
+    neighbors, seen, parent, nil = _storage(graph, weighted=weighted)
+    cost = _cost_table(graph, float('inf'))
+    rank = _cost_table(graph, -1)
+    pending = set(goals) if goals is not None else None
+    parent[start] = nil
+    cost[start] = 0
+    expanded = 0
+
+    if weighted:
+        heap = [(0, start)]
+        while heap:
+            current_cost, node = heapq.heappop(heap)
+            if seen[node]:
+                continue
+            seen[node] = 1
+            rank[node] = expanded
+            expanded += 1
+            if pending is not None:
+                pending.discard(node)
+                if not pending:
+                    break
+            for child, w in neighbors(node):
+                new_cost = current_cost + w
+                if not seen[child] and new_cost < cost[child]:
+                    cost[child] = new_cost
+                    parent[child] = node
+                    heapq.heappush(heap, (new_cost, child))
+    else:
+        frontier = deque([start])
+        take = frontier.popleft if algorithm == "bfs" else frontier.pop
+        seen[start] = 1
+        while frontier:
+            node = take()
+            rank[node] = expanded
+            expanded += 1
+            if pending is not None:
+                pending.discard(node)
+                if not pending:
+                    break
+            children = neighbors(node)
+            if algorithm == "dfs":
+                children = reversed(children)
+            depth = cost[node] + 1
+            for child in children:
+                if not seen[child]:
+                    seen[child] = 1
+                    parent[child] = node
+                    cost[child] = depth
+                    frontier.append(child)
+
+    integral = not isinstance(graph, Mapping) and (not weighted or _integral_weights(graph))
+    return SearchTree(start, parent, cost, rank, nil, expanded, integral)
@@ -0,0 +1,287 @@
+# search_render.py
+"""
+Render de animaciones de búsqueda sin redibujar el grafo completo en cada paso.
+
+- GraphRenderer dibuja UNA vez el fondo estático (aristas y costos) y deja los
+  nodos en una sola colección; cada paso solo cambia colores/tamaños de los
+  nodos y el texto del título. En pantalla usa blitting: restaura el fondo
+  guardado y redibuja solo esos artistas, así el costo por paso no crece con
+  las aristas del grafo.
+- TraceRecorder es un SearchObserver que guarda la traza (nodo actual,
+  visitados, frontera) sin dibujar nada; render_trace la exporta después a
+  GIF, MP4 (con ffmpeg) o una secuencia de PNG, componiendo cada frame con
+  el mismo blitting sobre un lienzo Agg (sin ventana).
+"""
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import islice
+import os
+import shutil
+import subprocess
+
+import numpy as np
+import matplotlib.colors as mcolors
+import networkx as nx
+
+from search_core import SearchObserver
+
+# Colores de la animación original de Taller_Punto_1
+BASE, VISITED, CURRENT, FRONTIER, GOAL, PATH = (
+    mcolors.to_rgba(c) for c in ("lightblue", "red", "orange", "yellow", "purple", "green")
+)
+
+
+def frontier_view(frontier, head=5, limit=None):
+    """
+    (nodos a resaltar, primeras entradas (costo, nodo)) de una frontera.
+    Con costos (heap de tuplas) se resaltan solo las primeras `head` entradas,
+    como en la animación original; sin costos, toda la frontera o sus primeros
+    `limit` nodos. Solo se recorre ese prefijo, no la frontera entera.
+    """
+    it = iter(frontier)
+    first = list(islice(it, 1))
+    if first and isinstance(first[0], tuple):
+        entries = first + list(islice(it, max(head, 3) - 1))
+        return [e[1] for e in entries[:head]], [(e[0], e[1]) for e in entries[:3]]
+    rest = it if limit is None else islice(it, max(limit - 1, 0))
+    return (first + list(rest))[:limit], []
+
+
+def step_title(name, step, current, n_visited, frontier_label, frontier_len, preview=(), cost=None,
+               show_costs=False) -> str:
+    if show_costs:
+        queue_info = [f"{node}({c})" for c, node in preview]
+        return (f"{name} - Paso {step}\nVisitando: '{current}' (Costo: {cost})\n"
+                f"Visitados: {n_visited}, {frontier_label}: {frontier_len}\n"
+                f"Próximos: {', '.join(queue_info)}")
+    return (f"{name} - Paso {step}\nVisitando: '{current}'\n"
+            f"Visitados: {n_visited}, {frontier_label}: {frontier_len}")
+
+
+def goal_title(name, goal, path, cost, n_visited, show_costs=False) -> str:
+    cost_line = f"Costo total: {cost}\n" if show_costs else ""
+    return (f"{name} - ¡OBJETIVO '{goal}' ENCONTRADO!\n"
+            f"Camino: {' → '.join(map(str, path))}\n{cost_line}Longitud: {len(path) - 1} pasos\n"
+            f"Nodos visitados: {n_visited}")
+
+
+def layered_pos(G, root, width=1.0, vert_gap=0.3) -> dict:
+    """Posición jerárquica iterativa por niveles de BFS (sirve para grafos grandes y DAGs)."""
+    depth = {root: 0}
+    queue = deque([root])
+    while queue:
+        node = queue.popleft()
+        for child in G.successors(node) if G.is_directed() else G.neighbors(node):
+            if child not in depth:
+                depth[child] = depth[node] + 1
+                queue.append(child)
+    levels = {}
+    for node, d in depth.items():
+        levels.setdefault(d, []).append(node)
+    pos = {}
+    for d, nodes in levels.items():
+        for i, node in enumerate(nodes):
+            pos[node] = ((i + 1) / (len(nodes) + 1) * width, -d * vert_gap)
+    return pos
+
+
+class GraphRenderer:
+    """
+    Grafo dibujado una vez; update() cambia solo los artistas animados y draw()
+    los pasa a pantalla con blitting. Todos los nodos quedan en el fondo en
+    celeste; encima hay una capa por estado (visitados, actual, frontera,
+    camino, objetivo), cada una de un solo color y tamaño, así Agg la dibuja
+    con la vía rápida de marcadores. Los nodos sin posición no se dibujan.
+    """
+
+    def __init__(self, G, pos, goal, show_costs=False, ax=None, figsize=(20, 14), node_size=1000,
+                 goal_size=1200, font_size=7, labels=None, arrows=None):
+        if ax is None:
+            import matplotlib.pyplot as plt
+            _, ax = plt.subplots(figsize=figsize)
+        self.ax, self.fig = ax, ax.figure
+        self.goal = goal
+        nodelist = [n for n in G.nodes if n in pos]
+        self.index = {n: i for i, n in enumerate(nodelist)}
+        self.xy = np.array([pos[n] for n in nodelist], dtype=float).reshape(-1, 2)
+        small = len(nodelist) <= 500
+        labels = small if labels is None else labels
+        arrows = small if arrows is None else arrows
+
+        # Fondo estático: se dibuja una vez (el lienzo lo guarda para blitting)
+        ax.set_axis_off()
+        nx.draw_networkx_edges(G, pos, ax=ax, arrows=arrows, node_size=node_size)
+        if show_costs:
+            nx.draw_networkx_edge_labels(G, pos, ax=ax, edge_labels=nx.get_edge_attributes(G, "weight"),
+                                         font_size=max(font_size - 1, 1))
+        nx.draw_networkx_nodes(G, pos, ax=ax, nodelist=nodelist, node_color=[BASE], node_size=node_size)
+
+        # Artistas animados: excluidos del fondo y redibujados en cada paso
+        empty = np.empty((0, 2))
+        layer = lambda color, size: ax.scatter(empty[:, 0], empty[:, 1], s=size, c=[color], zorder=2)
+        self.layers = {
+            "visited": layer(VISITED, node_size),
+            "current": layer(CURRENT, node_size),
+            "frontier": layer(FRONTIER, node_size),
+            "path": layer(PATH, node_size),
+            "goal": layer(GOAL, goal_size),
+        }
+        texts = nx.draw_networkx_labels(G, pos, ax=ax, labels={n: n for n in nodelist},
+                                        font_size=font_size, font_weight="bold") if labels else {}
+        self.title = ax.set_title("", fontsize=11, pad=20)
+        self.animated = [*self.layers.values(), *texts.values(), self.title]
+        for artist in self.animated:
+            artist.set_animated(True)
+
+        self._visited = np.zeros(len(nodelist), dtype=bool)
+        self._seen = 0  # visitados ya marcados (la lista de visitados solo crece)
+        self._background = None
+        self.fig.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _idx(self, nodes):
+        index = self.index
+        return np.fromiter((index[n] for n in nodes if n in index), dtype=np.int64)
+
+    def update(self, current=None, visited=(), frontier=(), path=None, title="", n_visited=None):
+        """
+        Capas del paso: visitados (rojo), actual (naranja), frontera (amarillo),
+        o el camino final (verde); el objetivo siempre en morado. n_visited
+        permite pasar la lista completa de visitados y usar solo su prefijo
+        (para reproducir una traza grabada). Devuelve los artistas animados.
+        """
+        n_visited = len(visited) if n_visited is None else n_visited
+        if n_visited < self._seen:  # traza nueva o rebobinada
+            self._visited[:] = False
+            self._seen = 0
+        self._visited[self._idx(visited[self._seen:n_visited])] = True
+        self._seen = n_visited
+
+        none = np.empty(0, dtype=np.int64)
+        show = {
+            "visited": np.flatnonzero(self._visited) if path is None else none,
+            "current": self._idx([current]) if path is None and current is not None else none,
+            "frontier": self._idx(frontier) if path is None else none,
+            "path": self._idx(path) if path is not None else none,
+            "goal": self._idx([self.goal]),
+        }
+        for key, idx in show.items():
+            self.layers[key].set_offsets(self.xy[idx])
+        self.title.set_text(title)
+        return self.animated
+
+    def _on_draw(self, event):
+        self._background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+
+    def compose(self):
+        """Fondo guardado + artistas animados, sobre el lienzo (sin dibujar el grafo de nuevo)."""
+        canvas = self.fig.canvas
+        if self._background is None:
+            canvas.draw()  # dispara _on_draw: guarda el fondo sin los artistas animados
+        canvas.restore_region(self._background)
+        for artist in self.animated:
+            self.fig.draw_artist(artist)
+
+    def draw(self):
+        """Muestra el paso actual en pantalla con blitting."""
+        self.compose()
+        self.fig.canvas.blit(self.fig.bbox)
+        self.fig.canvas.flush_events()
+
+
+@dataclass
+class TraceStep:
+    step: int
+    current: object
+    n_visited: int
+    frontier: tuple
+    frontier_len: int
+    preview: tuple = ()
+    cost: float | None = None
+
+
+@dataclass
+class TraceRecorder(SearchObserver):
+    """Observador que graba la traza de una búsqueda sin dibujar (para exportarla después)."""
+    max_frontier: int | None = 1000  # nodos de frontera guardados por paso (None = todos)
+    steps: list = field(default_factory=list)
+    visited: list = field(default_factory=list)
+    path: list | None = None
+    cost: float | None = None
+
+    def on_step(self, step, current, visited, frontier, cost=None):
+        nodes, preview = frontier_view(frontier, limit=self.max_frontier)
+        self.visited = visited  # la misma lista crece: cada paso guarda solo su largo
+        self.steps.append(TraceStep(step, current, len(visited), tuple(nodes),
+                                    len(frontier), tuple(preview), cost))
+
+    def on_goal(self, path, visited, cost):
+        self.visited, self.path, self.cost = visited, list(path), cost
+
+    def frames(self, name="", goal=None, frontier_label="Frontera", show_costs=False, every=1, hold=10):
+        """Argumentos de GraphRenderer.update por frame: uno cada `every` pasos y el final `hold` veces."""
+        visited = list(self.visited)
+        for st in self.steps[::every]:
+            title = step_title(name, st.step, st.current, st.n_visited, frontier_label, st.frontier_len,
+                               st.preview, st.cost, show_costs)
+            yield dict(current=st.current, visited=visited, n_visited=st.n_visited,
+                       frontier=st.frontier, title=title)
+        if self.path is not None:
+            title = goal_title(name, goal, self.path, self.cost, len(visited), show_costs)
+            for _ in range(hold):
+                yield dict(path=self.path, visited=visited, title=title)
+
+
+def _ffmpeg_writer(out, size, fps):
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("exportar MP4 requiere ffmpeg en el PATH; use .gif o un directorio de PNG")
+    w, h = size
+    return subprocess.Popen(
+        [ffmpeg, "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{w}x{h}",
+         "-r", str(fps), "-i", "-", "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p",
+         "-vcodec", "libx264", out],
+        stdin=subprocess.PIPE,
+    )
+
+
+def render_trace(trace: TraceRecorder, G, goal, out, pos=None, root=None, name="", frontier_label="Frontera",
+                 show_costs=False, fps=5, every=1, hold=None, figsize=(12, 8), dpi=80, **renderer) -> str:
+    """
+    Exporta una traza grabada sin ventana: out termina en .gif, .mp4 (ffmpeg) o
+    es un directorio (frame_00000.png, ...). pos por defecto: layered_pos desde
+    root (o el primer nodo visitado). Cada frame es fondo + artistas animados.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from PIL import Image
+
+    if pos is None:
+        pos = layered_pos(G, root if root is not None else trace.visited[0])
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    fig.subplots_adjust(left=0.01, right=0.99, bottom=0.01, top=0.8)
+    view = GraphRenderer(G, pos, goal, show_costs=show_costs, ax=fig.add_subplot(), **renderer)
+    frames = trace.frames(name, goal, frontier_label, show_costs, every, fps * 2 if hold is None else hold)
+
+    kind = os.path.splitext(out)[1].lower()
+    gif, proc = [], None
+    if kind not in (".gif", ".mp4"):
+        os.makedirs(out, exist_ok=True)
+    for i, kwargs in enumerate(frames):
+        view.update(**kwargs)
+        view.compose()
+        rgba = np.asarray(fig.canvas.buffer_rgba())
+        if kind == ".gif":
+            gif.append(Image.fromarray(rgba).convert("RGB").quantize())
+        elif kind == ".mp4":
+            proc = proc or _ffmpeg_writer(out, rgba.shape[1::-1], fps)
+            proc.stdin.write(rgba.tobytes())
+        else:
+            Image.fromarray(rgba).save(os.path.join(out, f"frame_{i:05d}.png"))
+    if gif:
+        gif[0].save(out, save_all=True, append_images=gif[1:], duration=int(1000 / fps), loop=0)
+    if proc is not None:
+        proc.stdin.close()
+        if proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg terminó con código {proc.returncode}")
+    return out
@@ -0,0 +1,82 @@
+# conftest.py
+"""
+Pruebas de equivalencia: cada ruta optimizada contra su versión de referencia
+(búsquedas contra BFS/DFS/UCS originales, motores de grilla contra el
+solucionador en Python y las variantes del ETL contra run_etl_excel).
+Las entradas son aleatorias pero deterministas (semilla fija).
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "Punto2_Taller"), os.path.join(ROOT, "benchmarks")]
+
+
+def random_graph(n: int, seed: int = 0, dag: bool = False, max_cost: int = 5) -> dict:
+    """
+    Grafo {'N0': [('N3', 2), ...]} con costos enteros 1..max_cost: árbol (cada
+    nodo cuelga de uno anterior) o DAG (hasta tres padres entre los 50 anteriores).
+    """
+    rng = np.random.default_rng(seed)
+    graph = {f"N{i}": [] for i in range(n)}
+    for i in range(1, n):
+        pool = np.arange(max(0, i - 50), i)
+        parents = sorted(rng.choice(pool, size=min(3, i), replace=False)) if dag else [rng.integers(0, i)]
+        for p in parents:
+            graph[f"N{p}"].append((f"N{i}", int(rng.integers(1, max_cost + 1))))
+    return graph
+
+
+def unweighted(graph: dict) -> dict:
+    """Misma estructura sin costos (como `tree` en Taller_Punto_1)."""
+    return {node: [child for child, _ in children] for node, children in graph.items()}
+
+
+def random_maze(rows: int, cols: int, density: float = 0.3, seed: int = 0) -> np.ndarray:
+    """Laberinto uint8 (0 = camino, 1 = obstáculo) con obstáculos al azar y esquinas libres."""
+    grid = (np.random.default_rng(seed).random((rows, cols)) < density).astype(np.uint8)
+    grid[0, 0] = grid[-1, -1] = 0
+    return grid
+
+
+def write_workbook(path, sheets: dict, units=()) -> str:
+    """
+    Libro con una hoja por entrada {nombre: matriz (filas × canales)}; NaN = celda
+    vacía. Los canales en `units` (índices desde 0) se guardan como texto con
+    unidad, alternando '12.50 V' y '12,50 mV' como en BD_SENSORES.xlsx.
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    for name, values in sheets.items():
+        ws = wb.create_sheet(name)
+        ws.append(["Usuario"] + list(range(1, values.shape[1] + 1)))
+        for row in values:
+            cells = [None]
+            for j, v in enumerate(row):
+                if np.isnan(v):
+                    cells.append(None)
+                elif j in units:
+                    cells.append(f"{v:.2f}".replace(".", ",") + " mV" if j % 2 else f"{v:.2f} V")
+                else:
+                    cells.append(float(v))
+            ws.append(cells)
+    wb.save(path)
+    return str(path)
+
+
+@pytest.fixture
+def write_sheets(tmp_path):
+    """write_sheets({hoja: matriz}, nombre='libro.xlsx', units=()) -> ruta del .xlsx en tmp_path."""
+    return lambda sheets, name="libro.xlsx", units=(): write_workbook(tmp_path / name, sheets, units)
+
+
+def noisy(rows, channels, seed=0, null_frac=0.02):
+    """Señal de colas pesadas (t de Student) con huecos: hay outliers que entran y salen del filtro z."""
+    rng = np.random.default_rng(seed)
+    values = np.round(rng.standard_t(2, size=(rows, channels)) * 10 + 100, 3)
+    values[rng.random((rows, channels)) < null_frac] = np.nan
+    return values
@@ -0,0 +1,39 @@
+import numpy as np
+import polars as pl
+
+from etl_polars import run_etl_excel
+from generators import perfect_maze, random_dag, random_tree, write_sensor_workbook
+from grid_engine import bfs_field
+from run_benchmarks import compare
+
+
+def test_generators_are_deterministic():
+    assert random_tree(200, seed=4) == random_tree(200, seed=4) != random_tree(200, seed=5)
+    dag = random_dag(200, seed=4)
+    assert all(int(c[1:]) > int(p[1:]) for p, children in dag.items() for c, _ in children)
+    assert np.array_equal(perfect_maze(21, 31, seed=1), perfect_maze(21, 31, seed=1))
+
+
+def test_perfect_maze_is_a_spanning_tree():
+    grid = perfect_maze(31, 41, seed=2)
+    free = int((grid == 0).sum())
+    passages = int(((grid[1:] == 0) & (grid[:-1] == 0)).sum() + ((grid[:, 1:] == 0) & (grid[:, :-1] == 0)).sum())
+    field = bfs_field(grid, (0, 0), passable=0)
+    assert passages == free - 1 and int((field.dist >= 0).sum()) == free
+    assert field.distance((30, 40)) is not None
+
+
+def test_sensor_workbook_goes_through_the_etl(tmp_path):
+    path = write_sensor_workbook(str(tmp_path / "s.xlsx"), sheets=2, channels=5, samples=120,
+                                 unit_frac=0.5, seed=1)
+    out = run_etl_excel(path)
+    assert out["__sheet__"].unique().sort().to_list() == ["SEN_1", "SEN_2"]
+    assert out.group_by("__sheet__").agg(pl.col("canal").n_unique())["canal"].to_list() == [5, 5]
+    assert out["valor"].dtype == pl.Float64 and out["valor"].null_count() == 0
+
+
+def test_compare_flags_only_slower_cases():
+    row = {"suite": "graph", "size_name": "small", "input": "tree"}
+    baseline = {"results": [{**row, "case": "bfs", "median_s": 1.0}, {**row, "case": "ucs", "median_s": 1.0}]}
+    results = [{**row, "case": "bfs", "median_s": 1.05}, {**row, "case": "ucs", "median_s": 1.5}]
+    assert [r["case"] for r, _ in compare(results, baseline, tolerance=0.1)] == ["ucs"]
@@ -0,0 +1,57 @@
+import math
+
+import numpy as np
+import polars as pl
+import pytest
+
+from decimation import decimate, lttb_indices
+
+
+def reference_lttb(x, y, n_out):
+    """LTTB de Steinarsson tal cual (Python puro, un punto por cubeta)."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return list(range(n))
+    every = (n - 2) / (n_out - 2)
+    out, a = [0], 0
+    for i in range(n_out - 2):
+        lo, hi = math.floor(i * every) + 1, math.floor((i + 1) * every) + 1
+        nlo, nhi = hi, min(math.floor((i + 2) * every) + 1, n)
+        avg_x = sum(x[nlo:nhi]) / (nhi - nlo)
+        avg_y = sum(y[nlo:nhi]) / (nhi - nlo)
+        areas = [abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a])) for j in range(lo, hi)]
+        a = lo + areas.index(max(areas))
+        out.append(a)
+    return out + [n - 1]
+
+
+@pytest.mark.parametrize("n, n_out", [(1000, 50), (1001, 3), (5000, 777), (10, 20)])
+def test_lttb_matches_reference(n, n_out):
+    rng = np.random.default_rng(n)
+    x = np.sort(rng.uniform(0, 100, n))
+    y = np.cumsum(rng.normal(size=n))
+    assert lttb_indices(x, y, n_out).tolist() == reference_lttb(x.tolist(), y.tolist(), n_out)
+
+
+def _channels(n=3000):
+    rng = np.random.default_rng(1)
+    return pl.DataFrame({
+        "canal": np.repeat(["1", "2", "3"], [n, n, 40]).tolist(),
+        "t_s": np.concatenate([np.arange(n), np.arange(n), np.arange(40)]).astype(float),
+        "valor": rng.standard_t(2, 2 * n + 40),
+    })
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_decimate_keeps_ends_extremes_and_short_channels(method):
+    df = _channels()
+    out = decimate(df, n_out=200, method=method)
+    for (canal,), full in df.group_by("canal"):
+        part = out.filter(pl.col("canal") == canal)
+        if full.height <= 200:
+            assert part.equals(full.sort("t_s"))
+            continue
+        assert part.height <= 202 and part["t_s"].is_sorted()
+        assert (part["t_s"][0], part["t_s"][-1]) == (full["t_s"].min(), full["t_s"].max())
+        if method == "minmax":  # los picos nunca desaparecen
+            assert (part["valor"].min(), part["valor"].max()) == (full["valor"].min(), full["valor"].max())
@@ -0,0 +1,35 @@
+from conftest import noisy
+from etl_cache import ETLCache
+from etl_polars import run_etl_cached, run_etl_excel
+
+
+def test_cache_hit_returns_same_frame(tmp_path, write_sheets):
+    path = write_sheets({"A": noisy(80, 3)})
+    cache = ETLCache(str(tmp_path / "cache"))
+    first = run_etl_cached(path, cache=cache)
+    again = run_etl_cached(path, cache=cache)
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert again.equals(first) and first.equals(run_etl_excel(path))
+
+
+def test_content_and_params_are_part_of_the_key(tmp_path, write_sheets):
+    path = write_sheets({"A": noisy(80, 3)})
+    cache = ETLCache(str(tmp_path / "cache"))
+    run_etl_cached(path, cache=cache)
+    run_etl_cached(path, cache=cache, z_thresh=2.0)
+    write_sheets({"A": noisy(80, 3, seed=1)})  # mismo nombre, otro contenido
+    changed = run_etl_cached(path, cache=cache)
+    assert (cache.misses, cache.hits) == (3, 0)
+    assert changed.equals(run_etl_excel(path))
+
+
+def test_engine_and_layout_are_part_of_the_key(tmp_path, write_sheets):
+    path = write_sheets({"A": noisy(80, 3)})
+    cache = ETLCache(str(tmp_path / "cache"))
+    run_etl_cached(path, cache=cache, engine="pandas")
+    run_etl_cached(path, cache=cache, engine="calamine")
+    wide = run_etl_cached(path, cache=cache, engine="calamine", layout="wide")
+    assert (cache.misses, cache.hits) == (3, 0)
+    assert wide.equals(run_etl_excel(path, engine="calamine", layout="wide"))
+    run_etl_cached(path, cache=cache, workers=2)  # workers no cambia la salida: acierto
+    assert cache.hits == 1
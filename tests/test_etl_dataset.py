@@ -0,0 +1,37 @@
+import polars as pl
+
+from conftest import noisy
+from etl_polars import dataset_partitions, run_etl_excel, scan_dataset, write_dataset
+
+
+def test_dataset_roundtrip_and_pushdown(tmp_path, write_sheets):
+    path = write_sheets({"A": noisy(60, 3), "B": noisy(60, 3, seed=1)})
+    out = str(tmp_path / "data")
+    df = run_etl_excel(path)
+    write_dataset(df, out)
+
+    assert dataset_partitions(out) == {"A": ["1", "2", "3"], "B": ["1", "2", "3"]}
+    got = scan_dataset(out).collect().select(df.columns).sort(["__sheet__", "canal", "muestra"])
+    assert got.equals(df.sort(["__sheet__", "canal", "muestra"]))
+    query = (pl.col("__sheet__") == "B") & (pl.col("canal") == "2") & (pl.col("muestra") < 20)
+    assert scan_dataset(out).filter(query).collect().select(df.columns).sort("muestra").equals(
+        df.filter(query).sort("muestra"))
+
+
+def test_rewrite_keeps_foreign_files(tmp_path, write_sheets):
+    path = write_sheets({"A": noisy(60, 3), "B": noisy(60, 3, seed=1)})
+    out = tmp_path / "data"
+    out.mkdir()
+    (out / "BD_SENSORES.xlsx").write_bytes(b"libro")
+    (out / ".etl_cache").mkdir()
+
+    df = run_etl_excel(path)
+    write_dataset(df.filter(pl.col("__sheet__") == "B"), str(out))
+    write_dataset(df, str(out))  # reescribir reemplaza las particiones anteriores
+
+    assert (out / "BD_SENSORES.xlsx").read_bytes() == b"libro"
+    assert (out / ".etl_cache").is_dir()
+    assert not [p for p in tmp_path.iterdir() if p.name.startswith(".dataset-")]
+    assert dataset_partitions(str(out)) == {"A": ["1", "2", "3"], "B": ["1", "2", "3"]}
+    got = scan_dataset(str(out)).collect().select(df.columns).sort(["__sheet__", "canal", "muestra"])
+    assert got.equals(df.sort(["__sheet__", "canal", "muestra"]))
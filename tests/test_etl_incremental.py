@@ -0,0 +1,91 @@
+import numpy as np
+import polars as pl
+import pytest
+
+from conftest import noisy
+from etl_incremental import read_partitioned, run_etl_incremental
+from etl_polars import run_etl_excel
+
+COLS = ["muestra", "canal", "valor", "valor_sm", "valor_mm", "t_s"]
+
+
+def assert_same(got: pl.DataFrame, want: pl.DataFrame):
+    got, want = (df.select(COLS).sort(["canal", "muestra"]) for df in (got, want))
+    assert got.select("muestra", "canal", "t_s").equals(want.select("muestra", "canal", "t_s"))
+    for c in ("valor", "valor_sm", "valor_mm"):
+        np.testing.assert_allclose(got[c].to_numpy(), want[c].to_numpy(), rtol=1e-9, atol=1e-12)
+
+
+def test_full_run_matches_batch_etl(tmp_path, write_sheets):
+    out = str(tmp_path / "out")
+    path = write_sheets({"A": noisy(120, 4), "B": noisy(90, 4, seed=1)})
+    assert run_etl_incremental(path, out) == {"A": "full", "B": "full"}
+    got = read_partitioned(out).collect()
+    for sheet in ("A", "B"):
+        assert_same(got.filter(pl.col("__sheet__") == sheet), run_etl_excel(path, sheet=sheet))
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_append_matches_full_run(tmp_path, write_sheets, seed):
+    values = noisy(400, 6, seed=seed)
+    out = str(tmp_path / "out")
+    head = write_sheets({"S1": values[:300]})
+    assert run_etl_incremental(head, out) == {"S1": "full"}
+
+    path = write_sheets({"S1": values})
+    assert run_etl_incremental(path, out) == {"S1": "append"}
+    assert_same(read_partitioned(out).collect(), run_etl_excel(path, sheet="S1"))
+
+
+def test_unchanged_and_removed_sheets(tmp_path, write_sheets):
+    out = str(tmp_path / "out")
+    run_etl_incremental(write_sheets({"A": noisy(50, 3), "B": noisy(50, 3, seed=1)}), out)
+    path = write_sheets({"A": noisy(50, 3)})
+    assert run_etl_incremental(path, out) == {"A": "unchanged", "B": "removed"}
+    assert read_partitioned(out).select("__sheet__").unique().collect()["__sheet__"].to_list() == ["A"]
+
+
+def test_foreign_directory_is_not_deleted(tmp_path, write_sheets):
+    out = tmp_path / "out"
+    out.mkdir()
+    (out / "notas.txt").write_text("no borrar")
+    with pytest.raises(FileExistsError):
+        run_etl_incremental(write_sheets({"A": noisy(20, 2)}), str(out))
+    assert (out / "notas.txt").read_text() == "no borrar"
+
+
+def test_param_change_only_clears_own_files(tmp_path, write_sheets):
+    out = tmp_path / "out"
+    path = write_sheets({"A": noisy(50, 3)})
+    run_etl_incremental(path, str(out))
+    (out / "notas.txt").write_text("no borrar")
+    assert run_etl_incremental(path, str(out), z_thresh=2.0) == {"A": "full"}
+    assert (out / "notas.txt").exists()
+    assert_same(read_partitioned(str(out)).collect(), run_etl_excel(path, sheet="A", z_thresh=2.0))
+
+
+@pytest.mark.parametrize("crash_at", range(1, 7))
+def test_interrupted_append_is_recovered(tmp_path, write_sheets, monkeypatch, crash_at):
+    # Dos hojas x (partición, agregados, outliers): el corte cae en cada una de las 6 escrituras
+    a, b = noisy(200, 3, seed=1), noisy(200, 3, seed=2)
+    out = str(tmp_path / "out")
+    run_etl_incremental(write_sheets({"A": a[:150], "B": b[:150]}), out)
+    path = write_sheets({"A": a, "B": b})
+
+    write_parquet, calls = pl.DataFrame.write_parquet, []
+
+    def flaky(df, *args, **kwargs):
+        calls.append(1)
+        if len(calls) == crash_at:
+            raise KeyboardInterrupt
+        return write_parquet(df, *args, **kwargs)
+
+    monkeypatch.setattr(pl.DataFrame, "write_parquet", flaky)
+    with pytest.raises(KeyboardInterrupt):
+        run_etl_incremental(path, out)
+    monkeypatch.undo()
+
+    run_etl_incremental(path, out)
+    got = read_partitioned(out).collect()
+    for sheet in ("A", "B"):
+        assert_same(got.filter(pl.col("__sheet__") == sheet), run_etl_excel(path, sheet=sheet))
@@ -0,0 +1,100 @@
+import logging
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+
+from conftest import noisy, write_workbook
+from etl_polars import ETLProfile, _coerce_numeric_columns, _excel_to_polars, etl_plan, run_etl_excel, with_time
+
+GRP = ["__sheet__", "canal"]
+
+
+def baseline_etl(path, z=3.0, smooth=5, fs=1.0):
+    """run_etl_excel original: pandas hoja por hoja y limpieza en pasos materializados."""
+    frames = []
+    for sh in pd.ExcelFile(path).sheet_names:
+        df = pd.read_excel(path, sheet_name=sh, header=0)
+        df["__sheet__"] = sh
+        frames.append(pl.from_pandas(df))
+    df = _coerce_numeric_columns(pl.concat(frames, how="vertical_relaxed"))
+    ids = [c for c in ("__sheet__", "Usuario") if c in df.columns]
+    df = df.with_row_index("muestra")
+    long = df.unpivot(index=["muestra"] + ids, on=[c for c in df.columns if c not in ids + ["muestra"]],
+                      variable_name="canal", value_name="valor").with_columns(pl.col("canal").cast(pl.Utf8))
+    out = long.drop_nulls(subset=["valor"])
+    v = pl.col("valor")
+    out = out.with_columns(((v - v.mean().over(GRP)) / v.std().over(GRP)).alias("z"))
+    out = out.filter((pl.col("z").abs() <= z) | pl.col("z").is_null()).drop("z")
+    out = out.sort([*GRP, "muestra"]).with_columns(v.rolling_mean(window_size=smooth, center=True).over(GRP)
+                                                   .alias("valor_sm"))
+    out = out.with_columns(((v - v.min().over(GRP)) / (v.max().over(GRP) - v.min().over(GRP))).alias("valor_mm"))
+    return out.with_columns((pl.col("muestra").cast(pl.Float64) / fs).alias("t_s"))
+
+
+@pytest.fixture(scope="module")
+def workbook(tmp_path_factory):
+    # Tres hojas; los canales 2 y 5 como texto con unidades ('12.50 V' / '12,50 mV')
+    sheets = {f"SEN_{s}": noisy(300, 6, seed=s) for s in (1, 2, 3)}
+    return write_workbook(tmp_path_factory.mktemp("etl") / "sensores.xlsx", sheets, units=(1, 4))
+
+
+@pytest.fixture(scope="module")
+def reference(workbook):
+    return baseline_etl(workbook, fs=2.0).drop("Usuario")
+
+
+@pytest.mark.parametrize("options", [
+    {}, {"engine": "pandas"}, {"engine": "calamine"}, {"streaming": True},
+    {"workers": 2, "pool": "process"}, {"workers": 2, "pool": "thread"},
+], ids=lambda o: "-".join(f"{k}={v}" for k, v in o.items()) or "default")
+def test_run_etl_excel_matches_baseline(workbook, reference, options):
+    got = run_etl_excel(workbook, fs=2.0, **options).drop("Usuario")
+    assert got.equals(reference)
+
+
+@pytest.mark.parametrize("engine", ["pandas", "calamine"])
+def test_column_and_row_selection_in_the_reader(workbook, engine):
+    full = _excel_to_polars(workbook, sheet="SEN_2", engine=engine)
+    got = _excel_to_polars(workbook, sheet="SEN_2", columns=["Usuario", "2", "3"], n_rows=50, skip_rows=10,
+                           engine=engine)
+    assert got.columns == ["Usuario", "2", "3", "__sheet__"]
+    assert got.drop("Usuario").equals(full.select("2", "3", "__sheet__").slice(10, 50))
+
+
+def test_empty_columns_read_quietly(workbook, caplog):
+    # 'Usuario' viene vacío: calamine no puede inferir su tipo y fastexcel lo avisa por logging
+    with caplog.at_level(logging.WARNING):
+        df = _excel_to_polars(workbook, sheet="SEN_1", engine="calamine")
+    assert df.schema["Usuario"] == pl.Float64
+    assert not [r for r in caplog.records if r.name.startswith("fastexcel")]
+
+
+def test_lazy_plan_matches_baseline(workbook, reference):
+    plan = etl_plan(_excel_to_polars(workbook), fs=2.0)
+    assert isinstance(plan, pl.LazyFrame)
+    assert plan.collect().drop("Usuario").equals(reference)
+
+
+def test_compact_schema_matches_default(workbook, reference):
+    compact = run_etl_excel(workbook, compact=True)
+    assert compact["canal"].dtype == pl.Enum and compact["valor"].dtype == pl.Float32
+    assert "t_s" not in compact.columns and compact.estimated_size() < reference.estimated_size()
+    restored = with_time(compact, 2.0).drop("Usuario").with_columns(pl.col(GRP).cast(pl.Utf8))
+    restored = restored.select(reference.columns)
+    assert restored.select("muestra", *GRP, "t_s").equals(reference.select("muestra", *GRP, "t_s"))
+    for c in ("valor", "valor_sm", "valor_mm"):
+        np.testing.assert_allclose(restored[c].to_numpy(), reference[c].to_numpy(), rtol=1e-6)
+
+
+def test_profiled_run_matches_and_reports_stages(workbook, reference):
+    seen = []
+    profile = ETLProfile(hook=lambda name, fn: seen.append(name) or fn())
+    got = run_etl_excel(workbook, fs=2.0, profile=profile)
+    assert got.drop("Usuario").equals(reference)
+    stages = [s["etapa"] for s in profile.to_dict()["etapas"]]
+    assert stages == seen == ["leer", "unidades", "largo", "limpiar", "tiempo"]
+    dropped = profile.z_dropped
+    assert dropped["conservadas"].sum() == got.height
+    assert (dropped["filas"] - dropped["nulos"] - dropped["z_descartadas"]).equals(dropped["conservadas"])
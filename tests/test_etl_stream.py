@@ -0,0 +1,60 @@
+import numpy as np
+import polars as pl
+import pytest
+
+from conftest import noisy
+from etl_polars import _excel_to_polars, melt_wide, run_etl_excel
+from etl_stream import stream_etl
+
+KEYS = ["__sheet__", "canal", "muestra"]
+
+
+def _collect(batches) -> pl.DataFrame:
+    return pl.concat(list(batches)).with_columns(pl.col("muestra").cast(pl.UInt32)).sort(KEYS)
+
+
+@pytest.mark.parametrize("win", [3, 5, 6])
+def test_single_batch_matches_batch_etl(write_sheets, win):
+    path = write_sheets({"A": noisy(200, 4)})
+    got = _collect(stream_etl([("A", _excel_to_polars(path, sheet="A"))], smooth=win))
+    want = run_etl_excel(path, sheet="A", smooth_window=win).sort(KEYS)
+    assert got.select(*KEYS, "t_s").equals(want.select(*KEYS, "t_s"))
+    for c in ("valor", "valor_sm", "valor_mm"):
+        np.testing.assert_allclose(got[c].to_numpy(), want[c].to_numpy(), rtol=1e-12)
+
+
+def test_chunked_smoothing_matches_batch_etl(write_sheets):
+    # Sin filtro z (z = inf) el único estado que cruza lotes es el búfer de la media móvil
+    path = write_sheets({"A": noisy(230, 3, seed=2)})
+    df = _excel_to_polars(path, sheet="A")
+    chunks = [("A", df.slice(lo, 37)) for lo in range(0, df.height, 37)]
+    got = _collect(stream_etl(chunks, z=np.inf, smooth=5))
+    want = run_etl_excel(path, sheet="A", z_thresh=np.inf).sort(KEYS)
+    assert got.select(KEYS).equals(want.select(KEYS))
+    np.testing.assert_allclose(got["valor_sm"].to_numpy(), want["valor_sm"].to_numpy(), rtol=1e-12)
+
+
+def test_directory_feed_matches_in_memory_chunks(tmp_path, write_sheets):
+    path = write_sheets({"A": noisy(120, 3, seed=4)})
+    df = _excel_to_polars(path, sheet="A").drop("__sheet__")
+    chunks = [df.slice(lo, 40) for lo in range(0, df.height, 40)]
+    feed = tmp_path / "feed" / "A"  # la subcarpeta da el nombre de la hoja
+    feed.mkdir(parents=True)
+    for i, chunk in enumerate(chunks):
+        if i % 2:
+            chunk.write_csv(feed / f"{i:04d}.csv")
+        else:
+            chunk.write_parquet(feed / f"{i:04d}.parquet")
+    got = _collect(stream_etl(str(tmp_path / "feed")))
+    assert got.equals(_collect(stream_etl([("A", c) for c in chunks])))
+
+
+def test_long_chunks_number_samples_per_channel(write_sheets):
+    # Lotes largos sin 'muestra': canales intercalados fila a fila y cortes a mitad de fila
+    path = write_sheets({"A": noisy(90, 4, seed=6)})
+    long = melt_wide(_excel_to_polars(path, sheet="A").drop("__sheet__"), id_cols=()).sort("muestra")
+    chunks = [("A", long.drop("muestra").slice(lo, 50)) for lo in range(0, long.height, 50)]
+    got = _collect(stream_etl(chunks, z=np.inf, smooth=3))
+    want = run_etl_excel(path, sheet="A", z_thresh=np.inf, smooth_window=3).sort(KEYS)
+    assert got.select(*KEYS, "valor").equals(want.select(*KEYS, "valor"))
+    np.testing.assert_allclose(got["valor_sm"].to_numpy(), want["valor_sm"].to_numpy(), rtol=1e-12)
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from conftest import noisy
+from etl_polars import run_etl_excel
+from etl_wide import check_wide_equivalence, run_etl_wide
+
+
+@pytest.fixture
+def workbook(write_sheets):
+    constant = np.full((90, 2), 5.0)  # max == min: valor_mm NaN en ambas rutas
+    return write_sheets({"B": noisy(150, 12, seed=1), "A": noisy(90, 12, seed=2),
+                         "C": np.hstack([noisy(90, 10, seed=3), constant])})
+
+
+@pytest.mark.parametrize("z, win", [(3.0, 5), (2.0, 3), (1.5, 8), (np.inf, 1)])
+def test_wide_matches_long(workbook, z, win):
+    report = check_wide_equivalence(workbook, z_thresh=z, smooth_window=win, fs=2.0)
+    assert report["filas"] > 0
+
+
+def test_wide_layout_through_run_etl_excel(workbook):
+    wide = run_etl_excel(workbook, sheet="B", layout="wide")
+    long = run_etl_excel(workbook, sheet="B")
+    assert wide.select("muestra", "canal").equals(long.select("muestra", "canal"))
+    np.testing.assert_allclose(wide["valor_sm"].to_numpy(), long["valor_sm"].to_numpy(), rtol=1e-9)
+
+
+def test_blocks_are_sorted_by_sheet(workbook):
+    blocks = run_etl_wide(workbook)
+    assert [b.sheet for b in blocks] == ["A", "B", "C"]
+    frame = blocks[1].frame("valor")
+    assert frame.columns[0] == "muestra" and frame.height == 150
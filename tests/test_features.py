@@ -0,0 +1,47 @@
+import numpy as np
+import polars as pl
+import pytest
+
+from features import feature_table, read_features, welch_batch, write_features
+
+
+def reference_welch(x, fs, nperseg):
+    """Welch de una serie, segmento por segmento (como scipy.signal.welch, densidad, una cara)."""
+    step = nperseg - nperseg // 2
+    window = np.hanning(nperseg + 1)[:-1]
+    psd = []
+    for lo in range(0, len(x) - nperseg + 1, step):
+        seg = x[lo:lo + nperseg]
+        psd.append(np.abs(np.fft.rfft((seg - seg.mean()) * window)) ** 2 / (fs * (window ** 2).sum()))
+    psd = np.mean(psd, axis=0)
+    psd[1:(None if nperseg % 2 else -1)] *= 2
+    return psd
+
+
+@pytest.mark.parametrize("nperseg", [64, 65])
+def test_welch_batch_matches_per_series(nperseg):
+    rng = np.random.default_rng(0)
+    lengths = np.array([65, 300, 1000, 129])  # todas >= nperseg
+    values = rng.normal(size=lengths.sum())
+    freqs, psd = welch_batch(values, lengths, fs=10.0, nperseg=nperseg, batch=7)
+    assert np.allclose(freqs, np.fft.rfftfreq(nperseg, 0.1))
+    for i, series in enumerate(np.split(values, np.cumsum(lengths)[:-1])):
+        np.testing.assert_allclose(psd[i], reference_welch(series, 10.0, nperseg), rtol=1e-10)
+
+
+def test_feature_table_peak_frequency_and_roundtrip(tmp_path):
+    fs, n = 50.0, 2048
+    t = np.arange(n) / fs
+    long = pl.DataFrame({
+        "__sheet__": ["A"] * (2 * n) + ["B"] * 5,
+        "canal": ["1"] * n + ["2"] * n + ["1"] * 5,
+        "muestra": np.concatenate([np.arange(n), np.arange(n), np.arange(5)]),
+        "valor": np.concatenate([np.sin(2 * np.pi * 5 * t), np.sin(2 * np.pi * 12 * t), np.ones(5)]),
+    })
+    table = feature_table(long, fs=fs, nperseg=256)
+    peaks = dict(zip(table["canal"].to_list()[:2], table["f_pico"].to_list()[:2]))
+    assert peaks == pytest.approx({"1": 5.0, "2": 12.0}, abs=fs / 256)
+    assert table.filter(pl.col("__sheet__") == "B")["f_pico"].is_null().all()  # < 8 muestras
+    out = str(tmp_path / "etl.parquet")
+    write_features(table, out)
+    assert read_features(out).equals(table)
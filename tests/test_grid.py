@@ -0,0 +1,146 @@
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from conftest import random_maze
+from grid_engine import (DIAGONALS, DIRECTIONS, SQRT2, FieldCache, as_grid, bfs_field, load_maze,
+                         search_grid)
+from packed_maze import PackedMaze
+from search_core import ucs
+from Taller_Punto_3 import plot_maze, solve_maze
+
+
+@pytest.fixture(params=[0.2, 0.35], ids=["sparse", "dense"])
+def grid(request):
+    return 1 - random_maze(41, 37, density=request.param, seed=2)  # 1 = camino, como solve_maze
+
+
+def _goals(grid):
+    free = np.argwhere(grid == 1)
+    return [tuple(int(v) for v in free[i]) for i in np.linspace(0, len(free) - 1, 12).astype(int)]
+
+
+@pytest.mark.parametrize("engine", ["queue", "frontier"])
+def test_numpy_bfs_matches_python(grid, engine):
+    as_lists = grid.tolist()
+    for goal in _goals(grid):
+        want = solve_maze(as_lists, (0, 0), goal, engine="python")
+        assert solve_maze(grid, (0, 0), goal, engine=engine) == want
+
+
+def test_distance_field_matches_python(grid):
+    cache = FieldCache()
+    as_lists = grid.tolist()
+    for goal in _goals(grid):
+        want = solve_maze(as_lists, (0, 0), goal, engine="python")
+        assert cache.path(grid, (0, 0), goal) == want
+        assert cache.field(grid, (0, 0)).distance(goal) == (None if want is None else len(want) - 1)
+    assert cache.misses == 1 and cache.hits == 2 * len(_goals(grid)) - 1
+
+
+def test_field_cache_evicts_least_recently_used(grid):
+    a, b, c = _goals(grid)[-3:]
+    cache = FieldCache(max_bytes=int(2.5 * bfs_field(grid, a).nbytes))  # caben dos campos
+    cache.field(grid, a)
+    cache.field(grid, b)
+    cache.field(grid, a)  # a pasa a ser el más reciente
+    cache.field(grid, c)  # desaloja b
+    assert (len(cache), cache.hits, cache.misses) == (2, 1, 3)
+    assert cache.nbytes <= cache.max_bytes
+    cache.field(grid, a)
+    cache.field(grid, b)
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
+@pytest.mark.parametrize("raw", [False, True], ids=["npy", "raw"])
+def test_memmapped_maze_is_read_in_place(tmp_path, grid, raw):
+    original = 1 - grid  # 0 = camino, como en disco
+    if raw:
+        path = tmp_path / "laberinto.bin"
+        original.tofile(path)
+        maze = load_maze(str(path), shape=original.shape)
+    else:
+        path = tmp_path / "laberinto.npy"
+        np.save(path, original)
+        maze = load_maze(str(path))
+    assert isinstance(maze, np.memmap) and np.shares_memory(as_grid(maze), maze)
+    cache, as_lists = FieldCache(), grid.tolist()
+    for goal in _goals(grid):
+        want = solve_maze(as_lists, (0, 0), goal, engine="python")
+        assert solve_maze(maze, (0, 0), goal, engine="frontier", passable=0) == want
+        assert cache.path(maze, (0, 0), goal, passable=0) == want
+
+
+def test_packed_bfs_matches_python(tmp_path, grid):
+    packed = PackedMaze.from_array(1 - grid)
+    assert packed.nbytes == grid.shape[0] * -(-grid.shape[1] // 8)  # 1 bit por celda
+    assert np.array_equal(packed.unpack(), 1 - grid)
+    path = str(tmp_path / "laberinto.bits")
+    packed.save(path)
+    as_lists = grid.tolist()
+    for goal in _goals(grid):
+        want = solve_maze(as_lists, (0, 0), goal, engine="python")
+        assert solve_maze(packed, (0, 0), goal, passable=0) == want
+        assert solve_maze(PackedMaze.load(path), (0, 0), goal, passable=0) == want
+
+
+def _grid_graph(grid, costs=None, diagonal=False):
+    """La grilla como grafo {celda: [(vecina, costo de entrar), ...]} para search_core.ucs."""
+    rows, cols = grid.shape
+    moves = [(dr, dc, 1.0) for dr, dc in DIRECTIONS]
+    if diagonal:
+        moves += [(dr, dc, SQRT2) for dr, dc in DIAGONALS]
+    free = grid == 1
+    graph = {}
+    for r, c in zip(*np.nonzero(free)):
+        out = []
+        for dr, dc, length in moves:
+            rr, cc = r + dr, c + dc
+            if not (0 <= rr < rows and 0 <= cc < cols and free[rr, cc]):
+                continue
+            if dr and dc and not (free[r, cc] and free[rr, c]):
+                continue
+            out.append(((int(rr), int(cc)), length * (1.0 if costs is None else float(costs[rr, cc]))))
+        graph[(int(r), int(c))] = out
+    return graph
+
+
+@pytest.mark.parametrize("diagonal", [False, True], ids=["4", "8"])
+def test_astar_and_jps_are_optimal(grid, diagonal):
+    costs = np.random.default_rng(0).uniform(1, 5, grid.shape)
+    uniform, weighted = _grid_graph(grid, diagonal=diagonal), _grid_graph(grid, costs, diagonal)
+    for goal in _goals(grid):
+        want = ucs(uniform, (0, 0), goal).cost
+        for algorithm in ("astar", "jps"):
+            got = search_grid(grid, (0, 0), goal, algorithm, diagonal=diagonal)
+            assert got.cost == pytest.approx(want)
+        got = search_grid(grid, (0, 0), goal, "astar", diagonal=diagonal, costs=costs)
+        assert got.cost == pytest.approx(ucs(weighted, (0, 0), goal).cost)
+
+
+@pytest.mark.parametrize("algorithm", ["bfs", "astar", "jps"])
+def test_numpy_coordinates(grid, algorithm):
+    # Celdas tal como salen de np.argwhere (np.int64), sin convertir
+    free = np.argwhere(grid == 1)
+    for goal in free[:: len(free) // 8]:
+        want = search_grid(grid, (0, 0), tuple(int(v) for v in goal), algorithm)
+        got = search_grid(grid, free[0], goal, algorithm)
+        assert (got.path, got.cost) == (want.path, want.cost)
+        assert got.path is None or all(type(v) is int for cell in got.path for v in cell)
+
+
+@pytest.mark.parametrize("shape", [(4001, 2003), (2001, 4100), (300, 200)])
+def test_downsampled_plot_covers_the_maze(monkeypatch, shape):
+    monkeypatch.setattr(plt, "show", lambda: None)
+    maze = PackedMaze.from_array(random_maze(*shape, seed=1))
+    view, step = maze.downsample()
+    plot_maze(maze, None, "", (0, 0), (shape[0] - 1, shape[1] - 1))
+    left, right, bottom, top = plt.gca().get_images()[0].get_extent()
+    plt.close("all")
+    # Un píxel por bloque de step × step celdas, desde la celda muestreada
+    assert (left, top) == (-0.5, -0.5)
+    assert right == view.shape[1] * step - 0.5 >= shape[1] - 0.5
+    assert bottom == view.shape[0] * step - 0.5 >= shape[0] - 0.5
@@ -0,0 +1,31 @@
+import numpy as np
+import polars as pl
+
+from online_stats import group_stats, keep_mask, merge_stats
+
+
+def _frame(n=999, seed=0):
+    rng = np.random.default_rng(seed)
+    return pl.DataFrame({"canal": rng.choice(["a", "b", "c"], n).tolist(), "valor": rng.standard_t(2, n)})
+
+
+def test_merged_stats_equal_one_pass():
+    df = _frame()
+    merged = group_stats(df[:100])
+    for lo in range(100, 999, 233):  # bloques desparejos; 'c' puede faltar en alguno
+        merged = merge_stats(merged, group_stats(df[lo:lo + 233]))
+    want = df.group_by("canal").agg(pl.len().alias("n"), pl.col("valor").mean().alias("mean"),
+                                    (pl.col("valor").var() * (pl.len() - 1)).alias("m2")).sort("canal")
+    got = merged.sort("canal")
+    assert got["n"].to_list() == want["n"].to_list()
+    np.testing.assert_allclose(got.select("mean", "m2").to_numpy(), want.select("mean", "m2").to_numpy(),
+                               rtol=1e-12)
+
+
+def test_keep_mask_matches_z_filter():
+    df = _frame(seed=1)
+    v = pl.col("valor")
+    z = (v - v.mean().over("canal")) / v.std().over("canal")
+    want = df.with_columns((z.abs() <= 2.0).alias("__keep__"))
+    got = keep_mask(df, group_stats(df), 2.0)
+    assert got.sort("canal", "valor")["__keep__"].equals(want.sort("canal", "valor")["__keep__"])
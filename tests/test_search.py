@@ -0,0 +1,243 @@
+import heapq
+
+import numpy as np
+import pytest
+
+from conftest import random_graph, unweighted
+from graph_csr import CSRGraph
+from search_batch import batch_search
+from search_core import (IndexedHeap, astar, bfs, bidirectional_bfs, bidirectional_dijkstra, dfs,
+                         min_edge_heuristic, reverse_graph, single_source, ucs)
+from Taller_Punto_1 import bfs_with_goal, tree, tree_with_costs, ucs_with_goal
+
+
+def _queries(graph, k=20):
+    names = sorted(graph)
+    return [(names[0], names[(i * 7919) % len(names)]) for i in range(k)]
+
+
+def _path_cost(graph, path):
+    weights = {(p, c): w for p, children in graph.items() for c, w in children}
+    return sum(weights[e] for e in zip(path, path[1:]))
+
+
+def baseline_walk(tree, start, goal, depth_first=False):
+    """BFS/DFS originales de Taller_Punto_1 (padres al encolar), sin la animación."""
+    visited, frontier, parent = [], [start], {start: None}
+    while frontier:
+        node = frontier.pop() if depth_first else frontier.pop(0)
+        if node in visited:
+            continue
+        visited.append(node)
+        if node == goal:
+            path = []
+            while node is not None:
+                path.append(node)
+                node = parent[node]
+            return path[::-1], visited
+        children = reversed(tree[node]) if depth_first else tree[node]
+        for child in children:
+            if child not in visited and child not in frontier:
+                frontier.append(child)
+                parent[child] = node
+    return None, visited
+
+
+def baseline_ucs(graph, start, goal):
+    """UCS original de Taller_Punto_1 (camino completo en el heap), sin la animación."""
+    visited = set()
+    queue = [(0, start, [start])]
+    while queue:
+        cost, node, path = heapq.heappop(queue)
+        if node in visited:
+            continue
+        visited.add(node)
+        if node == goal:
+            return path, visited, cost
+        for child, w in graph.get(node, []):
+            if child not in visited:
+                heapq.heappush(queue, (cost + w, child, path + [child]))
+    return None, visited, float("inf")
+
+
+@pytest.fixture(params=[False, True], ids=["tree", "dag"])
+def weighted(request):
+    return random_graph(300, seed=7, dag=request.param)
+
+
+@pytest.mark.parametrize("depth_first", [False, True], ids=["bfs", "dfs"])
+def test_walks_match_baseline(weighted, depth_first):
+    tree = unweighted(weighted)
+    csr = CSRGraph.from_adjacency(tree)
+    search = dfs if depth_first else bfs
+    for start, goal in _queries(tree):
+        path, visited = baseline_walk(tree, start, goal, depth_first)
+        got = search(tree, start, goal)
+        assert (got.path, got.visited) == (path, visited)
+        on_csr = search(csr, csr.id_of(start), csr.id_of(goal))
+        assert csr.to_names(on_csr.path) == path and csr.to_names(on_csr.visited) == visited
+
+
+@pytest.mark.parametrize("heap", ["lazy", "indexed"])
+@pytest.mark.parametrize("dag", [False, True], ids=["tree", "dag"])
+def test_ucs_matches_baseline(dag, heap):
+    graph = random_graph(400, seed=5, dag=dag)
+    for start, goal in _queries(graph, 40):
+        path, visited, cost = baseline_ucs(graph, start, goal)
+        got = ucs(graph, start, goal, heap=heap)
+        assert got.cost == cost and set(got.visited) == visited
+        if not dag or path is None:
+            assert got.path == path
+        else:  # empates: otro camino óptimo es válido (ver docstring de ucs)
+            assert got.path[0] == start and got.path[-1] == goal
+            assert _path_cost(graph, got.path) == cost
+
+
+def test_headless_entry_points():
+    assert bfs_with_goal(tree, "S", "W", visualize=False) == baseline_walk(tree, "S", "W")
+    path, visited, cost = ucs_with_goal(tree_with_costs, "S", "W", visualize=False)
+    assert (path, set(visited), cost) == baseline_ucs(tree_with_costs, "S", "W")
+
+
+@pytest.mark.parametrize("search", [bfs, dfs])
+def test_int_ids_match_named_graph(weighted, search):
+    # Modo de ids enteros: lista de listas con bitset y array('i'), mismo recorrido
+    tree = unweighted(weighted)
+    as_lists = [[int(c[1:]) for c in tree[f"N{i}"]] for i in range(len(tree))]
+    for start, goal in _queries(tree):
+        want = search(tree, start, goal)
+        got = search(as_lists, int(start[1:]), int(goal[1:]))
+        assert [f"N{i}" for i in got.visited] == want.visited
+        assert got.path == (None if want.path is None else [int(n[1:]) for n in want.path])
+
+
+def test_indexed_heap_pops_in_order():
+    import random
+    rng = random.Random(0)
+    heap, best = IndexedHeap(), {}
+    for _ in range(2000):
+        node, key = rng.randrange(300), rng.randrange(1000)
+        improved = heap.push_or_decrease(key, node)
+        assert improved == (node not in best or (key, node) < (best[node], node))
+        if improved:
+            best[node] = key
+    out = [heap.pop() for _ in range(len(heap))]
+    assert out == sorted((k, n) for n, k in best.items())
+
+
+def test_csr_ucs_matches_dict(weighted):
+    csr = CSRGraph.from_adjacency(weighted)
+    for start, goal in _queries(weighted):
+        want = ucs(weighted, start, goal)
+        for heap in ("lazy", "indexed"):
+            got = ucs(csr, csr.id_of(start), csr.id_of(goal), heap=heap)
+            assert (csr.to_names(got.path), got.cost) == (want.path, want.cost)
+            assert csr.to_names(got.visited) == want.visited
+
+
+@pytest.mark.parametrize("integer_ids", [True, False], ids=["ids", "names"])
+def test_edge_list_file_matches_adjacency(tmp_path, weighted, integer_ids):
+    label = (lambda n: int(n[1:])) if integer_ids else (lambda n: n)
+    path = tmp_path / "aristas.txt"
+    path.write_text("# origen destino costo\n" + "".join(
+        f"{label(p)} {label(c)} {w}\n" for p, children in weighted.items() for c, w in children))
+    csr = CSRGraph.from_edge_list(str(path), integer_ids=integer_ids)
+    assert (csr.num_nodes, csr.num_edges) == (len(weighted), sum(map(len, weighted.values())))
+    for start, goal in _queries(weighted):
+        want = ucs(weighted, start, goal)
+        got = ucs(csr, csr.id_of(label(start)), csr.id_of(label(goal)))
+        names = got.path if integer_ids else csr.to_names(got.path)
+        assert got.cost == want.cost
+        assert names == (None if want.path is None else [label(n) for n in want.path])
+
+
+def test_informed_and_bidirectional_costs(weighted):
+    tree = unweighted(weighted)
+    for start, goal in _queries(weighted):
+        want = ucs(weighted, start, goal)
+        for got in (astar(weighted, start, goal, min_edge_heuristic(weighted, goal)),
+                    bidirectional_dijkstra(weighted, start, goal)):
+            assert got.cost == want.cost
+            if got.found:
+                assert _path_cost(weighted, got.path) == want.cost
+        steps = bfs(tree, start, goal)
+        got = bidirectional_bfs(tree, start, goal)
+        assert got.cost == steps.cost and (not got.found or len(got.path) == len(steps.path))
+
+
+@pytest.mark.parametrize("algorithm", ["bfs", "dfs", "ucs"])
+def test_batch_matches_single_queries(weighted, algorithm):
+    graph = unweighted(weighted) if algorithm != "ucs" else weighted
+    search = {"bfs": bfs, "dfs": dfs, "ucs": ucs}[algorithm]
+    queries = _queries(graph, 30) + [(b, a) for a, b in _queries(graph, 5)]
+    for r in batch_search(graph, queries, algorithm=algorithm):
+        want = search(graph, r.start, r.goal)
+        assert (r.path, r.cost, r.expanded) == (want.path, want.cost, want.expanded)
+
+
+def test_batch_workers_match_serial(weighted):
+    # Varios orígenes => varios grupos repartidos en el pool (CSR en memoria compartida)
+    csr = CSRGraph.from_adjacency(weighted)
+    names = sorted(weighted)
+    queries = [(names[i % 7], names[(i * 7919) % len(names)]) for i in range(40)]
+    key = lambda r: (r.start, r.goal, r.path, r.cost, r.expanded, r.group_size)  # sin los tiempos
+    serial = batch_search(csr, queries)
+    assert list(map(key, batch_search(csr, queries, workers=2))) == list(map(key, serial))
+    assert [r.path for r in serial] == [ucs(weighted, a, b).path for a, b in queries]
+
+
+@pytest.mark.parametrize("dag", [False, True], ids=["tree", "dag"])
+def test_csr_costs_keep_the_weight_type(dag):
+    graph = random_graph(300, seed=3, dag=dag)
+    csr = CSRGraph.from_adjacency(graph)
+    for start, goal in _queries(graph):
+        want = ucs(graph, start, goal).cost
+        if want == float("inf"):
+            continue
+        got = bidirectional_dijkstra(csr, csr.id_of(start), csr.id_of(goal)).cost
+        assert type(got) is type(want) is int and got == want
+        tree = single_source(csr, csr.id_of(start), [csr.id_of(goal)], "bfs")
+        assert type(tree.cost_to(csr.id_of(goal))) is int
+    for r in batch_search(csr, _queries(graph)):
+        assert r.cost == float("inf") or type(r.cost) is int
+
+
+@pytest.mark.parametrize("step", [0.1, 0.2])
+def test_float_weights_keep_their_value(step):
+    # 0.1/0.2 no son exactos en float32: los costos deben salir iguales a los del dict
+    graph = {k: [(c, w * step) for c, w in v] for k, v in tree_with_costs.items()}
+    csr = CSRGraph.from_adjacency(graph)
+    assert csr.weights.dtype == np.float64
+    for goal in ("W", "GG", "FF", "BB"):
+        want = ucs(graph, "S", goal)
+        got = ucs(csr, csr.id_of("S"), csr.id_of(goal))
+        assert (csr.to_names(got.path), got.cost) == (want.path, want.cost)
+        # suma en otro orden (ida + vuelta): igual salvo el último bit
+        got = bidirectional_dijkstra(csr, csr.id_of("S"), csr.id_of(goal))
+        assert csr.to_names(got.path) == want.path and isinstance(got.cost, float)
+        assert got.cost == pytest.approx(want.cost, rel=1e-15)
+
+
+def test_integer_names_round_trip():
+    graph = {0: [(1, 2), (2, 5)], 1: [(3, 1)], 2: [(3, 1)], 3: []}
+    csr = CSRGraph.from_adjacency(graph)
+    start, goal = csr.id_of(0), csr.id_of(3)
+    for result in (ucs(csr, start, goal), astar(csr, start, goal)):
+        path = csr.to_names(result.path)
+        assert path == [0, 1, 3] and all(type(n) is int for n in path)
+    assert csr.to_names(csr.successors(start)) == [1, 2]
+    (r,) = batch_search(graph, [(0, 3)])
+    assert (r.path, r.cost) == ([0, 1, 3], 3)
+
+
+def test_reverse_cache_is_bounded_and_sees_new_edges():
+    import search_core
+    graph = random_graph(200, seed=9)
+    start, goal = "N0", "N150"
+    assert bidirectional_dijkstra(graph, start, goal).cost > 1
+    graph[start].append((goal, 1))  # el invertido cacheado ya no sirve
+    assert bidirectional_dijkstra(graph, start, goal).path == [start, goal]
+    assert bidirectional_dijkstra(graph, start, goal, reverse=reverse_graph(graph)).cost == 1
+    for seed in range(10):
+        reverse_graph(random_graph(50, seed=seed))
+    assert len(search_core._REVERSE_CACHE) <= search_core._REVERSE_CACHE_SIZE
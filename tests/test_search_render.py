@@ -0,0 +1,79 @@
+import matplotlib
+
+matplotlib.use("Agg")
+import networkx as nx
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import Image
+
+from conftest import random_graph, unweighted
+from graph_csr import CSRGraph
+from search_core import ucs
+from search_render import GraphRenderer, TraceRecorder, frontier_view, layered_pos, render_trace
+from Taller_Punto_1 import _NamedObserver, bfs_with_goal, tree_with_costs, ucs_with_goal
+
+
+def _graph():
+    G = nx.DiGraph()
+    for parent, children in tree_with_costs.items():
+        for child, cost in children:
+            G.add_edge(parent, child, weight=cost)
+    return G
+
+
+def _renderer(G):
+    fig = Figure(figsize=(6, 4), dpi=40)
+    FigureCanvasAgg(fig)
+    return GraphRenderer(G, layered_pos(G, "S"), "W", show_costs=True, ax=fig.add_subplot())
+
+
+def test_blitted_frame_equals_full_redraw():
+    G = _graph()
+    trace = TraceRecorder()
+    ucs(tree_with_costs, "S", "W", observer=trace)
+    view = _renderer(G)
+    for kwargs in list(trace.frames("UCS", "W", show_costs=True))[::5]:
+        view.update(**kwargs)
+        view.compose()
+        # Referencia: otro renderer con los mismos artistas dibujados de forma normal
+        full = _renderer(G)
+        full.update(**kwargs)
+        for artist in full.animated:
+            artist.set_animated(False)
+        full.fig.canvas.draw()
+        assert np.array_equal(np.asarray(view.fig.canvas.buffer_rgba()),
+                              np.asarray(full.fig.canvas.buffer_rgba()))
+
+
+def test_render_trace_writes_one_frame_per_step(tmp_path):
+    trace = TraceRecorder()
+    result = ucs(tree_with_costs, "S", "W", observer=trace)
+    assert trace.path == result.path and len(trace.steps) == len(result.visited) - 1
+    out = render_trace(trace, _graph(), "W", str(tmp_path / "png"), root="S", hold=2, figsize=(4, 3))
+    frames = sorted((tmp_path / "png").iterdir())
+    assert len(frames) == len(trace.steps) + 2
+    gif = render_trace(trace, _graph(), "W", str(tmp_path / "ucs.gif"), root="S", hold=2, figsize=(4, 3))
+    assert Image.open(gif).n_frames > 1 and out
+
+
+def test_frontier_view_reads_only_a_prefix():
+    endless = (f"N{i}" for i in range(10**9))
+    assert frontier_view(endless, limit=3) == (["N0", "N1", "N2"], [])
+    heap = iter([(1, "A"), (2, "B")] + [(9, "Z")] * 10**6)
+    assert frontier_view(heap, head=2) == (["A", "B"], [(1, "A"), (2, "B"), (9, "Z")])
+
+
+def test_csr_trace_names_each_node_once(monkeypatch):
+    # Con un CSRGraph la traza es la misma que con el dict, y cada paso traduce solo lo nuevo
+    calls = []
+    name = _NamedObserver._name
+    monkeypatch.setattr(_NamedObserver, "_name", lambda self, n: calls.append(n) or name(self, n))
+    graph = random_graph(3000, seed=1)
+    for search, tree in ((ucs_with_goal, graph), (bfs_with_goal, unweighted(graph))):
+        want, got = TraceRecorder(max_frontier=10), TraceRecorder(max_frontier=10)
+        search(tree, "N0", "N2999", visualize=False, trace=want)
+        calls.clear()
+        search(CSRGraph.from_adjacency(tree), "N0", "N2999", visualize=False, trace=got)
+        assert (got.steps, got.visited, got.path) == (want.steps, want.visited, want.path)
+        assert len(calls) < 20 * len(got.visited)